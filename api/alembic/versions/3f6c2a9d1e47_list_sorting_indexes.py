@@ -0,0 +1,63 @@
+"""List sorting indexes
+
+Revision ID: 3f6c2a9d1e47
+Revises: b5e3ecea04e4
+Create Date: 2026-10-19 10:12:41.318522
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3f6c2a9d1e47"
+down_revision: Union[str, None] = "b5e3ecea04e4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_product_category_id_price_id",
+        "product",
+        ["category_id", "price", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_product_price_id", "product", ["price", "id"], unique=False
+    )
+    op.create_index(
+        "ix_product_created_at_id",
+        "product",
+        ["created_at", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_product_name_id", "product", ["name", "id"], unique=False
+    )
+    # the composite index serves lookups by user_id alone as well
+    op.drop_index("ix_order_user_id", table_name="order")
+    op.create_index(
+        "ix_order_user_id_created_at_id",
+        "order",
+        ["user_id", "created_at", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_order_created_at_id",
+        "order",
+        ["created_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_order_created_at_id", table_name="order")
+    op.drop_index("ix_order_user_id_created_at_id", table_name="order")
+    op.create_index("ix_order_user_id", "order", ["user_id"], unique=False)
+    op.drop_index("ix_product_name_id", table_name="product")
+    op.drop_index("ix_product_created_at_id", table_name="product")
+    op.drop_index("ix_product_price_id", table_name="product")
+    op.drop_index("ix_product_category_id_price_id", table_name="product")
@@ -0,0 +1,48 @@
+"""Product sort indexes partial on active
+
+Revision ID: f2a6d8c4b1e3
+Revises: e4b8c1f6a2d9
+Create Date: 2026-10-19 21:04:52.316870
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f2a6d8c4b1e3"
+down_revision: Union[str, None] = "e4b8c1f6a2d9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# sort indexes of the product lists, which show active products only
+SORT_INDEXES = {
+    "ix_product_category_id_price_id": ["category_id", "price", "id"],
+    "ix_product_price_id": ["price", "id"],
+    "ix_product_created_at_id": ["created_at", "id"],
+    "ix_product_name_id": ["name", "id"],
+}
+
+
+def upgrade() -> None:
+    for name, columns in SORT_INDEXES.items():
+        op.drop_index(name, table_name="product")
+        op.create_index(
+            name,
+            "product",
+            columns,
+            unique=False,
+            postgresql_where=sa.text("active"),
+        )
+
+
+def downgrade() -> None:
+    for name, columns in SORT_INDEXES.items():
+        op.drop_index(
+            name, table_name="product", postgresql_where=sa.text("active")
+        )
+        op.create_index(name, "product", columns, unique=False)
@@ -1,14 +1,24 @@
+import argparse
 import asyncio
+import hashlib
+import json
+import multiprocessing
+import os
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 # Додаємо шлях до кореня проекту
 sys.path.insert(0, str(Path(__file__).parent))
 
-from sqlalchemy import select
+from sqlalchemy import delete, func, insert, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
-from src.product.models import Product, Category, ProductPhoto
+from src.product.models import Product, Category, ProductPhoto, CatalogImportFolder
+from src.product.caching import ProductJSONCache
+from src.product.images import build_placeholder
 from src.core.config import settings
 
 try:
@@ -82,305 +92,539 @@ def extract_docx_content(file_path):
         traceback.print_exc()
         return "Помилка читання файлу", [], None, False, False
 
-async def import_doors(session, category_id):
-    """Імпорт дверей з файлової системи до БД"""
-    catalog_path = Path("static/catalog/door")
-    if not catalog_path.exists():
-        print("❌ Каталог дверей не знайдено")
-        return 0
-    
-    count = 0
+# Продуктів в одній транзакції
+CHUNK_SIZE = 200
+
+PHOTO_EXTENSIONS = {".webp", ".png", ".jpg", ".jpeg"}
+
+DOORS = {
+    "title": "дверей",
+    "path": Path("static/catalog/door"),
+    "web_path": "/static/catalog/door",
+    "sku_prefix": "DOOR",
+    "price": 50000,
+    # Скло та орієнтація беруться з опису
+    "use_flags": True,
+}
+MOULDINGS = {
+    "title": "лиштв",
+    "path": Path("static/catalog/mouldings"),
+    "web_path": "/static/catalog/moulding",
+    "sku_prefix": "MOULDING",
+    "price": 5000,
+    "use_flags": False,
+}
+
+
+def scan_catalog(catalog_path):
+    """
+    Один прохід по каталогу: (клас, папка продукту, фото) для кожної
+    папки з фото. Фото без дублікатів за назвою, у стабільному порядку.
+    """
+    folders = []
     for class_dir in sorted(catalog_path.iterdir()):
         if not class_dir.is_dir():
             continue
-        
-        class_name = class_dir.name
-        print(f"\n📂 Обробка класу: {class_name}")
-        
         for product_dir in sorted(class_dir.iterdir()):
             if not product_dir.is_dir():
                 continue
-            
-            product_folder_name = product_dir.name
-            print(f"\n  📁 Папка: {product_folder_name}")
-            
-            # 1. ЗБІР ВСІХ ФОТО З ПАПКИ
-            photo_extensions = ['*.webp', '*.png', '*.jpg', '*.jpeg', '*.WEBP', '*.PNG', '*.JPG', '*.JPEG']
-            all_photos = []
-            for ext in photo_extensions:
-                all_photos.extend(list(product_dir.glob(ext)))
-            
-            # Видаляємо дублікати за назвою файлу
-            all_photos = list({f.name.lower(): f for f in all_photos}.values())
-            # Сортуємо для стабільного порядку
-            all_photos = sorted(all_photos, key=lambda x: x.name)
-
+            photos = {
+                f.name.lower(): f
+                for f in product_dir.iterdir()
+                if f.suffix.lower() in PHOTO_EXTENSIONS
+            }
+            all_photos = sorted(photos.values(), key=lambda x: x.name)
             if not all_photos:
-                print(f"  ⚠️  Фото не знайдено, пропускаємо")
+                print(f"  ⚠️  {class_dir.name}/{product_dir.name}: фото не знайдено, пропускаємо")
                 continue
+            folders.append((class_dir.name, product_dir, all_photos))
+    return folders
+
+
+def folder_checksums(product_dir, all_photos):
+    """
+    Контрольні суми папки: опису (DOCX) та опису разом зі списком фото
+    (назва і розмір). Папка з тими ж сумами пропускається.
+    """
+    desc_file = product_dir / "description.docx"
+    description_checksum = None
+    if desc_file.exists():
+        description_checksum = hashlib.sha256(desc_file.read_bytes()).hexdigest()
+    photos = [[photo.name, photo.stat().st_size] for photo in all_photos]
+    checksum = hashlib.sha256(
+        json.dumps([description_checksum, photos]).encode()
+    ).hexdigest()
+    return checksum, description_checksum
+
+
+def parse_product(product_dir, new_photos):
+    """
+    Виконується в окремому процесі: розбір DOCX (якщо product_dir
+    переданий) та плейсхолдери для нових фото.
+    """
+    placeholders = [build_placeholder(str(photo)) for photo in new_photos]
+    if product_dir is None:
+        return None, None, None, placeholders
+
+    desc_file = product_dir / "description.docx"
+    summary, details, cover, glass, orient = extract_docx_content(desc_file)
 
-            print(f"  📸 Знайдено фото: {len(all_photos)}")
+    # ✅ ФОРМУЄМО JSON ОПИСУ - ПЕРЕВІРЯЄМО details!
+    if not details:
+        print(f"  ⚠️ УВАГА: details порожні! Перевірте файл {desc_file}")
+        details = [{"value": "Опис відсутній"}]  # Fallback
 
-            # 2. ОБРОБКА DOCX
-            desc_file = product_dir / "description.docx"
-            summary, details, cover, glass, orient = extract_docx_content(desc_file)
+    description_json = {
+        "text": summary,
+        "details": details  # ✅ Завжди масив об'єктів
+    }
 
-            # ✅ ФОРМУЄМО JSON ОПИСУ - ПЕРЕВІРЯЄМО details!
-            if not details or len(details) == 0:
-                print(f"  ⚠️ УВАГА: details порожні! Перевірте файл {desc_file}")
-                details = [{"value": "Опис відсутній"}]  # Fallback
-            
-            description_json = {
-                "text": summary,
-                "details": details  # ✅ Завжди масив об'єктів
+    # Додаємо finishing тільки якщо є покриття
+    if cover:
+        description_json["finishing"] = {
+            "covering": {
+                "text": cover
             }
-            
-            # Додаємо finishing тільки якщо є покриття
-            if cover:
-                description_json["finishing"] = {
-                    "covering": {
-                        "text": cover
+        }
+
+    return description_json, glass, orient, placeholders
+
+
+async def preload_existing(session, skus):
+    """Наявні продукти та їх фото (шлях -> is_main), по одному запиту"""
+    result = await session.execute(
+        select(Product.sku, Product.id).where(Product.sku.in_(skus))
+    )
+    product_ids = dict(result.all())
+
+    photo_paths = {product_id: {} for product_id in product_ids.values()}
+    if product_ids:
+        result = await session.execute(
+            select(
+                ProductPhoto.product_id, ProductPhoto.photo, ProductPhoto.is_main
+            ).where(ProductPhoto.product_id.in_(product_ids.values()))
+        )
+        for product_id, photo, is_main in result:
+            photo_paths[product_id][photo] = is_main
+    return product_ids, photo_paths
+
+
+async def preload_manifest(session, section):
+    """Записи маніфесту розділу каталогу, папка -> запис"""
+    result = await session.execute(
+        select(CatalogImportFolder).where(
+            CatalogImportFolder.folder.startswith(f"{section}/")
+        )
+    )
+    return {row.folder: row for row in result.scalars()}
+
+
+async def save_chunk(session, catalog, category_id, items):
+    """
+    Записує частину продуктів: нові - одним INSERT, наявні - одним
+    UPDATE за id, нові фото - одним INSERT, видалені - одним DELETE,
+    маніфест - одним upsert.
+    """
+    new_products = [item for item in items if item["product_id"] is None]
+    existing_products = [item for item in items if item["product_id"] is not None]
+    if new_products:
+        result = await session.execute(
+            insert(Product)
+            .values(
+                [
+                    {
+                        "sku": item["sku"],
+                        "category_id": category_id,
+                        "price": catalog["price"],
+                        "name": item["name"],
+                        "description": item["description"],
+                        "have_glass": item["glass"],
+                        "orientation_choice": item["orient"],
                     }
-                }
-            
-            print(f"  📋 Details в JSON: {len(details)} елементів")
-
-            # Генеруємо SKU
-            sku = f"DOOR-{class_name.replace(' ', '-')}-{product_folder_name}".upper()
-            
-            # 3. РОБОТА З БД - Продукт
-            result = await session.execute(select(Product).where(Product.sku == sku))
-            product = result.scalar_one_or_none()
-            
-            if not product:
-                # Створюємо новий продукт
-                product = Product(
-                    sku=sku,
-                    category_id=category_id,
-                    price=50000,
-                    name=f"{class_name} {product_folder_name}",
-                    description=description_json,
-                    have_glass=glass,
-                    orientation_choice=orient
+                    for item in new_products
+                ]
+            )
+            .returning(Product.id, Product.sku)
+        )
+        new_ids = dict((sku, product_id) for product_id, sku in result)
+        for item in new_products:
+            item["product_id"] = new_ids[item["sku"]]
+
+    if existing_products:
+        # ✅ ПРИМУСОВЕ ОНОВЛЕННЯ існуючих продуктів
+        values = []
+        for item in existing_products:
+            value = {"id": item["product_id"]}
+            # Повертаємо лише продукти, які деактивував сам імпорт
+            # (--deactivate-missing); деактивацію адміном не чіпаємо
+            if item["reactivate"]:
+                value["active"] = True
+            if item["description"] is not None:
+                value["name"] = item["name"]
+                value["description"] = item["description"]  # ← Перезаписуємо опис!
+                if catalog["use_flags"]:
+                    value["have_glass"] = item["glass"]
+                    value["orientation_choice"] = item["orient"]
+            if len(value) > 1:
+                values.append(value)
+        if values:
+            await session.execute(update(Product), values)
+
+    photos = [
+        {
+            "product_id": item["product_id"],
+            "photo": web_path,
+            "is_main": is_main,
+            "placeholder": placeholder,
+        }
+        for item in items
+        for web_path, is_main, placeholder in item["photos"]
+    ]
+    if photos:
+        await session.execute(insert(ProductPhoto).values(photos))
+
+    removed_photos = [
+        (item["product_id"], web_path)
+        for item in items
+        for web_path in item["removed_photos"]
+    ]
+    if removed_photos:
+        await session.execute(
+            delete(ProductPhoto).where(
+                tuple_(ProductPhoto.product_id, ProductPhoto.photo).in_(
+                    removed_photos
                 )
-                session.add(product)
-                await session.flush()
-                print(f"  ➕ Створено новий продукт: {sku}")
-            else:
-                # ✅ ПРИМУСОВЕ ОНОВЛЕННЯ існуючого продукту
-                product.name = f"{class_name} {product_folder_name}"
-                product.description = description_json  # ← Перезаписуємо опис!
-                product.have_glass = glass
-                product.orientation_choice = orient
-                print(f"  🔄 Оновлено продукт: {sku}")
-            
-            # Зберігаємо зміни перед роботою з фото
-            await session.flush()
-
-            # 4. СИНХРОНІЗАЦІЯ ФОТО
-            res_photos = await session.execute(
-                select(ProductPhoto).where(ProductPhoto.product_id == product.id)
             )
-            existing_photos = res_photos.scalars().all()
-            existing_web_paths = {p.photo for p in existing_photos}
-            
-            # Додаємо нові фото
-            new_photos_count = 0
-            for idx, photo_file in enumerate(all_photos):
-                web_path = f"/static/catalog/door/{class_name}/{product_folder_name}/{photo_file.name}"
-                
-                if web_path not in existing_web_paths:
-                    # Головне фото - перше по порядку, якщо немає інших фото
-                    is_main = (idx == 0 and len(existing_photos) == 0)
-                    
-                    session.add(ProductPhoto(
-                        product_id=product.id,
-                        photo=web_path,
-                        is_main=is_main
-                    ))
-                    new_photos_count += 1
-            
-            if new_photos_count > 0:
-                print(f"  📸 Додано нових фото: {new_photos_count}")
-            
-            total_photos = len(existing_photos) + new_photos_count
-            print(f"  ✅ {sku}: Всього фото: {total_photos}, Опис: {len(details)} рядків")
-            
-            count += 1
-            
-    return count
-
-async def import_mouldings(session, category_id):
-    """Імпорт лиштв з файлової системи до БД"""
-    catalog_path = Path("static/catalog/mouldings")
-    if not catalog_path.exists():
-        print("❌ Каталог лиштв не знайдено")
-        return 0
-    
-    count = 0
-    for class_dir in sorted(catalog_path.iterdir()):
-        if not class_dir.is_dir():
-            continue
-        
-        class_name = class_dir.name
-        print(f"\n📂 Обробка класу лиштв: {class_name}")
-        
-        for product_dir in sorted(class_dir.iterdir()):
-            if not product_dir.is_dir():
-                continue
-            
-            product_folder_name = product_dir.name
-            print(f"\n  📁 Папка: {product_folder_name}")
-            
-            # Збір фото
-            photo_extensions = ['*.webp', '*.png', '*.jpg', '*.jpeg', '*.WEBP', '*.PNG', '*.JPG', '*.JPEG']
-            all_photos = []
-            for ext in photo_extensions:
-                all_photos.extend(list(product_dir.glob(ext)))
-            
-            all_photos = list({f.name.lower(): f for f in all_photos}.values())
-            all_photos = sorted(all_photos, key=lambda x: x.name)
+        )
 
-            if not all_photos:
-                print(f"  ⚠️  Фото не знайдено, пропускаємо")
-                continue
-            
-            print(f"  📸 Знайдено фото: {len(all_photos)}")
-
-            # Обробка DOCX
-            desc_file = product_dir / "description.docx"
-            summary, details, cover, glass, orient = extract_docx_content(desc_file)
-
-            if not details or len(details) == 0:
-                print(f"  ⚠️ УВАГА: details порожні! Перевірте файл {desc_file}")
-                details = [{"value": "Опис відсутній"}]
-            
-            description_json = {
-                "text": summary,
-                "details": details
-            }
-            
-            if cover:
-                description_json["finishing"] = {
-                    "covering": {
-                        "text": cover
-                    }
-                }
-            
-            print(f"  📋 Details в JSON: {len(details)} елементів")
-
-            sku = f"MOULDING-{class_name.replace(' ', '-')}-{product_folder_name}".upper()
-            
-            # Робота з БД
-            result = await session.execute(select(Product).where(Product.sku == sku))
-            product = result.scalar_one_or_none()
-            
-            if not product:
-                product = Product(
-                    sku=sku,
-                    category_id=category_id,
-                    price=5000,
-                    name=f"{class_name} {product_folder_name}",
-                    description=description_json,
-                    have_glass=False,
-                    orientation_choice=False
+    # Головне фото видалено: головним стає одне з тих, що лишились
+    promoted_photos = [
+        (item["product_id"], item["main_photo"])
+        for item in items
+        if item["promote_main_photo"]
+    ]
+    if promoted_photos:
+        await session.execute(
+            update(ProductPhoto)
+            .where(
+                tuple_(ProductPhoto.product_id, ProductPhoto.photo).in_(
+                    promoted_photos
                 )
-                session.add(product)
-                await session.flush()
-                print(f"  ➕ Створено нову лиштву: {sku}")
-            else:
-                product.name = f"{class_name} {product_folder_name}"
-                product.description = description_json
-                print(f"  🔄 Оновлено лиштву: {sku}")
-            
-            await session.flush()
-
-            # Синхронізація фото
-            res_photos = await session.execute(
-                select(ProductPhoto).where(ProductPhoto.product_id == product.id)
             )
-            existing_photos = res_photos.scalars().all()
-            existing_web_paths = {p.photo for p in existing_photos}
-            
-            new_photos_count = 0
-            for idx, photo_file in enumerate(all_photos):
-                web_path = f"/static/catalog/moulding/{class_name}/{product_folder_name}/{photo_file.name}"
-                
-                if web_path not in existing_web_paths:
-                    is_main = (idx == 0 and len(existing_photos) == 0)
-                    
-                    session.add(ProductPhoto(
-                        product_id=product.id,
-                        photo=web_path,
-                        is_main=is_main
-                    ))
-                    new_photos_count += 1
-            
-            if new_photos_count > 0:
-                print(f"  📸 Додано нових фото: {new_photos_count}")
-            
-            total_photos = len(existing_photos) + new_photos_count
-            print(f"  ✅ {sku}: Всього фото: {total_photos}, Опис: {len(details)} рядків")
-            
-            count += 1
-            
-    return count
-
-async def main():
+            .values(is_main=True)
+        )
+
+    stmt = pg_insert(CatalogImportFolder).values(
+        [
+            {
+                "folder": item["folder"],
+                "checksum": item["checksum"],
+                "description_checksum": item["description_checksum"],
+                "photos": item["web_paths"],
+                "product_id": item["product_id"],
+                "deactivated": False,
+            }
+            for item in items
+        ]
+    )
+    await session.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[CatalogImportFolder.folder],
+            set_={
+                "checksum": stmt.excluded.checksum,
+                "description_checksum": stmt.excluded.description_checksum,
+                "photos": stmt.excluded.photos,
+                "product_id": stmt.excluded.product_id,
+                "deactivated": stmt.excluded.deactivated,
+                "updated_at": func.now(),
+            },
+        )
+    )
+
+
+async def import_section(
+    session_maker,
+    executor,
+    catalog,
+    category_id,
+    dry_run=False,
+    deactivate_missing=False,
+):
+    """
+    Інкрементальний імпорт розділу каталогу з файлової системи до БД.
+    Незмінені папки (за маніфестом) пропускаються, змінені - порівнюються:
+    нові та видалені фото, змінений опис. Повертає звіт.
+    """
+    report = {
+        "folders": 0,
+        "unchanged": 0,
+        "created": 0,
+        "updated": 0,
+        "descriptions": 0,
+        "photos_added": 0,
+        "photos_removed": 0,
+        "missing": 0,
+        "deactivated": 0,
+    }
+    if not catalog["path"].exists():
+        print(f"❌ Каталог {catalog['title']} не знайдено")
+        return report
+
+    started = time.time()
+    section = catalog["path"].name
+    folders = scan_catalog(catalog["path"])
+    report["folders"] = len(folders)
+    print(f"📁 Папок з фото: {len(folders)}")
+
+    async with session_maker() as session:
+        manifest = await preload_manifest(session, section)
+
+    # Генеруємо SKU, відкидаємо незмінені папки
+    items = []
+    seen_folders = set()
+    for class_name, product_dir, all_photos in folders:
+        folder = f"{section}/{class_name}/{product_dir.name}"
+        seen_folders.add(folder)
+        checksum, description_checksum = folder_checksums(product_dir, all_photos)
+        entry = manifest.get(folder)
+        if (
+            entry is not None
+            and entry.checksum == checksum
+            and not entry.deactivated
+        ):
+            report["unchanged"] += 1
+            continue
+        items.append({
+            "folder": folder,
+            "checksum": checksum,
+            "description_checksum": description_checksum,
+            "entry": entry,
+            "sku": f"{catalog['sku_prefix']}-{class_name.replace(' ', '-')}-{product_dir.name}".upper(),
+            "name": f"{class_name} {product_dir.name}",
+            "product_dir": product_dir,
+            "web_paths": [
+                f"{catalog['web_path']}/{class_name}/{product_dir.name}/{photo.name}"
+                for photo in all_photos
+            ],
+            "all_photos": all_photos,
+        })
+    missing = [
+        entry
+        for folder, entry in manifest.items()
+        if folder not in seen_folders and not entry.deactivated
+    ]
+    report["missing"] = len(missing)
+
+    product_ids, photo_paths = {}, {}
+    if items:
+        async with session_maker() as session:
+            product_ids, photo_paths = await preload_existing(
+                session, [item["sku"] for item in items]
+            )
+
+    # Різниця з БД для кожної зміненої папки
+    for item in items:
+        entry = item["entry"]
+        item["product_id"] = product_ids.get(item["sku"])
+        existing_paths = photo_paths.get(item["product_id"], {})
+        item["new_photos"] = [
+            (idx, web_path, photo)
+            for idx, (web_path, photo) in enumerate(
+                zip(item["web_paths"], item["all_photos"])
+            )
+            if web_path not in existing_paths
+        ]
+        # Видаляються лише фото, додані імпортом раніше
+        item["removed_photos"] = (
+            sorted((set(entry.photos) - set(item["web_paths"])) & existing_paths)
+            if entry is not None
+            else []
+        )
+        item["reactivate"] = entry is not None and entry.deactivated
+        # Без головного фото (нове, або головне видалено) головним
+        # стає перше за порядком у папці
+        kept_paths = set(existing_paths) - set(item["removed_photos"])
+        item["main_photo"] = None
+        if not any(existing_paths[path] for path in kept_paths):
+            new_paths = {web_path for _, web_path, _ in item["new_photos"]}
+            candidates = [
+                web_path
+                for web_path in item["web_paths"]
+                if web_path in kept_paths or web_path in new_paths
+            ] or sorted(kept_paths)
+            if candidates:
+                item["main_photo"] = candidates[0]
+        item["promote_main_photo"] = item["main_photo"] in kept_paths
+        item["parse_description"] = (
+            item["product_id"] is None
+            or entry is None
+            or entry.description_checksum != item["description_checksum"]
+        )
+        if item["product_id"] is None:
+            report["created"] += 1
+        else:
+            report["updated"] += 1
+        report["descriptions"] += item["parse_description"]
+        report["photos_added"] += len(item["new_photos"])
+        report["photos_removed"] += len(item["removed_photos"])
+
+    if dry_run:
+        for item in items:
+            action = "➕" if item["product_id"] is None else "🔄"
+            print(
+                f"  {action} {item['folder']}: опис {'так' if item['parse_description'] else 'ні'}, "
+                f"+{len(item['new_photos'])} / -{len(item['removed_photos'])} фото"
+            )
+        for entry in missing:
+            print(f"  ❔ Папку видалено: {entry.folder}")
+        return report
+
+    # DOCX та плейсхолдери - паралельно в процесах
+    loop = asyncio.get_running_loop()
+    parsed = await asyncio.gather(*(
+        loop.run_in_executor(
+            executor,
+            parse_product,
+            item["product_dir"] if item["parse_description"] else None,
+            [photo for _, _, photo in item["new_photos"]],
+        )
+        for item in items
+    ))
+    for item, (description, glass, orient, placeholders) in zip(items, parsed):
+        item["description"] = description
+        item["glass"] = glass if catalog["use_flags"] else False
+        item["orient"] = orient if catalog["use_flags"] else False
+        item["photos"] = [
+            (web_path, web_path == item["main_photo"], placeholder)
+            for (_, web_path, _), placeholder in zip(
+                item["new_photos"], placeholders
+            )
+        ]
+
+    for start in range(0, len(items), CHUNK_SIZE):
+        chunk = items[start:start + CHUNK_SIZE]
+        async with session_maker() as session:
+            async with session.begin():
+                await save_chunk(session, catalog, category_id, chunk)
+        print(f"  💾 Збережено: {start + len(chunk)}/{len(items)}")
+
+    if missing and deactivate_missing:
+        async with session_maker() as session:
+            async with session.begin():
+                await session.execute(
+                    update(Product)
+                    .where(Product.id.in_([entry.product_id for entry in missing]))
+                    .values(active=False)
+                )
+                # Запис лишається: якщо папка повернеться, продукт
+                # буде активовано знову
+                await session.execute(
+                    update(CatalogImportFolder)
+                    .where(
+                        CatalogImportFolder.id.in_([entry.id for entry in missing])
+                    )
+                    .values(deactivated=True)
+                )
+        report["deactivated"] = len(missing)
+
+    print(f"  ⏱️ Час: {time.time() - started:.1f}с")
+    return report
+
+
+def print_report(title, report, dry_run):
+    prefix = "🧪 Dry run, буде" if dry_run else "✅"
+    print(f"\n{prefix} {title}:")
+    print(f"   - Папок: {report['folders']}, без змін: {report['unchanged']}")
+    print(f"   - Створено продуктів: {report['created']}, оновлено: {report['updated']}")
+    print(f"   - Оновлено описів: {report['descriptions']}")
+    print(f"   - Фото додано: {report['photos_added']}, видалено: {report['photos_removed']}")
+    print(f"   - Папок видалено: {report['missing']}, деактивовано продуктів: {report['deactivated']}")
+
+
+async def get_or_create_category(session, name, is_glass_available):
+    result = await session.execute(select(Category).where(Category.name == name))
+    category = result.scalar_one_or_none()
+
+    if not category:
+        category = Category(name=name, is_glass_available=is_glass_available)
+        session.add(category)
+        await session.flush()
+        print(f"✅ Створено категорію: {name}")
+    else:
+        print(f"✅ Знайдено категорію: {name}")
+    return category
+
+
+async def main(argv=sys.argv):
     """Головна функція імпорту"""
+    parser = argparse.ArgumentParser(description="Імпорт каталогу з static/catalog")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Кількість процесів для DOCX, за замовчуванням кількість CPU",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Лише показати зміни, нічого не записувати",
+    )
+    parser.add_argument(
+        "--deactivate-missing",
+        action="store_true",
+        help="Деактивувати продукти, папки яких видалено; вони активуються знову, якщо папка повернеться",
+    )
+    args = parser.parse_args(argv[1:])
+
     db_url = str(settings.db.url).replace('postgresql://', 'postgresql+asyncpg://')
     engine = create_async_engine(db_url, echo=False)
     async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
-    
+
+    print("=" * 60)
+    print("🚀 ПОЧАТОК ІМПОРТУ КАТАЛОГУ")
+    print("=" * 60)
+
+    # Створення/отримання категорій
     async with async_session() as session:
-        print("=" * 60)
-        print("🚀 ПОЧАТОК ІМПОРТУ КАТАЛОГУ")
-        print("=" * 60)
-        
-        # Створення/отримання категорій
-        res_door = await session.execute(select(Category).where(Category.name == "Двері"))
-        cat_door = res_door.scalar_one_or_none()
-        
-        if not cat_door:
-            cat_door = Category(name="Двері", is_glass_available=True)
-            session.add(cat_door)
-            await session.flush()
-            print("✅ Створено категорію: Двері")
-        else:
-            print("✅ Знайдено категорію: Двері")
-        
-        res_moulding = await session.execute(select(Category).where(Category.name == "Лиштви"))
-        cat_moulding = res_moulding.scalar_one_or_none()
-        
-        if not cat_moulding:
-            cat_moulding = Category(name="Лиштви", is_glass_available=False)
-            session.add(cat_moulding)
-            await session.flush()
-            print("✅ Створено категорію: Лиштви")
-        else:
-            print("✅ Знайдено категорію: Лиштви")
-        
+        async with session.begin():
+            cat_door = await get_or_create_category(session, "Двері", True)
+            cat_moulding = await get_or_create_category(session, "Лиштви", False)
+
+    with ProcessPoolExecutor(
+        max_workers=args.workers or os.cpu_count(),
+        mp_context=multiprocessing.get_context("spawn"),
+    ) as executor:
         print("\n" + "=" * 60)
         print("📂 ІМПОРТ ДВЕРЕЙ")
         print("=" * 60)
-        door_count = await import_doors(session, cat_door.id)
-        
+        door_report = await import_section(
+            async_session, executor, DOORS, cat_door.id,
+            dry_run=args.dry_run, deactivate_missing=args.deactivate_missing,
+        )
+
         print("\n" + "=" * 60)
         print("📂 ІМПОРТ ЛИШТВ")
         print("=" * 60)
-        moulding_count = await import_mouldings(session, cat_moulding.id)
-        
-        # Збереження змін
-        await session.commit()
-        
-        print("\n" + "=" * 60)
-        print("🎉 ІМПОРТ ЗАВЕРШЕНО!")
-        print("=" * 60)
-        print(f"📊 Статистика:")
-        print(f"   - Дверей оброблено: {door_count}")
-        print(f"   - Лиштв оброблено: {moulding_count}")
-        print(f"   - Всього продуктів: {door_count + moulding_count}")
-        print("=" * 60)
+        moulding_report = await import_section(
+            async_session, executor, MOULDINGS, cat_moulding.id,
+            dry_run=args.dry_run, deactivate_missing=args.deactivate_missing,
+        )
+
+    await engine.dispose()
+    changed = any(
+        report["created"] or report["updated"] or report["deactivated"]
+        for report in (door_report, moulding_report)
+    )
+    if changed and not args.dry_run:
+        # Кешований JSON продуктів застарів
+        await ProductJSONCache().clear()
+
+    print("\n" + "=" * 60)
+    print("🎉 ІМПОРТ ЗАВЕРШЕНО!" if not args.dry_run else "🧪 DRY RUN ЗАВЕРШЕНО")
+    print("=" * 60)
+    print_report("Двері", door_report, args.dry_run)
+    print_report("Лиштви", moulding_report, args.dry_run)
+    print("=" * 60)
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    asyncio.run(main())
@@ -1,100 +1,325 @@
+import argparse
+import hashlib
+import json
 import os
 import time
 from PIL import Image
-from pathlib import Path
 from multiprocessing import Pool
 
-def get_dir_size(directory):
-    """Рахує загальний розмір папки в байтах"""
+MANIFEST_VERSION = 1
+
+# Параметри стиснення. Записуються в маніфест: якщо їх змінити,
+# усі файли будуть перетиснуті заново
+PARAMS = {
+    "max_size": 1600,
+    "webp_quality": 45,
+    "jpeg_quality": 75,
+}
+
+SUPPORTED_EXTENSIONS = {
+    ".webp": "WEBP",
+    ".jpg": "JPEG",
+    ".jpeg": "JPEG",
+    ".png": "PNG",
+}
+
+
+def file_hash(file_path):
+    """SHA-256 вмісту файлу"""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        while chunk := f.read(1024 * 1024):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def scan_directory(directory, excluded=()):
+    """
+    Один прохід по папці: повертає розмір усіх файлів і
+    (відносний шлях, розмір, mtime) для зображень підтримуваних форматів.
+    Приховані файли (тимчасові файли завантажень тощо) пропускаються.
+    Підпапки з excluded (шляхи відносно directory) враховуються лише
+    в загальному розмірі, їхні зображення не перетискаються.
+    """
+    excluded = {os.path.normpath(path) for path in excluded}
     total_size = 0
-    for root, _, files in os.walk(directory):
-        for f in files:
-            fp = os.path.join(root, f)
-            if os.path.exists(fp):
-                total_size += os.path.getsize(fp)
-    return total_size
-
-def recompress_webp(file_path):
-    """Перетискає існуючий WebP файл для макс. економії місця"""
+    images = []
+    stack = [(directory, False)]
+    while stack:
+        current, skipped = stack.pop()
+        with os.scandir(current) as entries:
+            for entry in entries:
+                if entry.name.startswith("."):
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(
+                        (
+                            entry.path,
+                            skipped
+                            or os.path.relpath(entry.path, directory)
+                            in excluded,
+                        )
+                    )
+                    continue
+                if not entry.is_file(follow_symlinks=False):
+                    continue
+                stat = entry.stat(follow_symlinks=False)
+                total_size += stat.st_size
+                ext = os.path.splitext(entry.name)[1].lower()
+                if not skipped and ext in SUPPORTED_EXTENSIONS:
+                    images.append(
+                        (
+                            os.path.relpath(entry.path, directory),
+                            stat.st_size,
+                            stat.st_mtime_ns,
+                        )
+                    )
+    return total_size, images
+
+
+def load_manifest(manifest_path):
+    try:
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        print(f"⚠️ Маніфест '{manifest_path}' не прочитано ({e}), починаю з нуля")
+        return {}
+    if manifest.get("version") != MANIFEST_VERSION:
+        return {}
+    return manifest.get("files", {})
+
+
+def save_manifest(manifest_path, files):
+    temp_path = f"{manifest_path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(
+            {"version": MANIFEST_VERSION, "files": files},
+            f,
+            ensure_ascii=False,
+            sort_keys=True,
+        )
+    os.replace(temp_path, manifest_path)
+
+
+def is_processed(entry, size, mtime_ns):
+    """Файл не змінювався з останнього прогону з тими ж параметрами"""
+    return (
+        entry is not None
+        and entry.get("params") == PARAMS
+        and entry.get("size") == size
+        and entry.get("mtime_ns") == mtime_ns
+    )
+
+
+def save_image(img, path, image_format):
+    if image_format == "WEBP":
+        img.save(path, "WEBP", quality=PARAMS["webp_quality"], method=6)
+    elif image_format == "JPEG":
+        img.save(
+            path,
+            "JPEG",
+            quality=PARAMS["jpeg_quality"],
+            optimize=True,
+            progressive=True,
+        )
+    else:
+        # PNG стискається без втрат, щоб не зіпсувати прозорість
+        img.save(path, "PNG", optimize=True)
+
+
+def recompress_image(task):
+    """
+    Перетискає зображення в тому ж форматі, тож посилання на нього
+    не змінюються. Оригінал замінюється, тільки якщо новий файл менший.
+    Повертає (шлях, розмір до, розмір після, замінено, запис маніфесту).
+    """
+    directory, rel_path, previous_hash = task
+    file_path = os.path.join(directory, rel_path)
+    image_format = SUPPORTED_EXTENSIONS[os.path.splitext(rel_path)[1].lower()]
+    # Прихована назва: маніфест статики, GC і scan_directory її пропускають,
+    # тож файл, що лишився після збою, не сприймається як зображення
+    file_dir, file_name = os.path.split(file_path)
+    root, ext = os.path.splitext(file_name)
+    temp_path = os.path.join(file_dir, f".{root}.temp{ext}")
     try:
-        temp_path = file_path.with_suffix('.temp.webp')
         original_size = os.path.getsize(file_path)
-        
+        content_hash = file_hash(file_path)
+        # Файл торкнули (mtime), але вміст вже оброблений
+        if content_hash == previous_hash:
+            return rel_path, original_size, original_size, False, (
+                manifest_entry(file_path, content_hash)
+            )
+
         with Image.open(file_path) as img:
+            img.load()
             # 1. Зменшення роздільної здатності (Resize)
             # Це дає найбільший приріст в економії ваги
-            max_size = 1600
+            max_size = PARAMS["max_size"]
             if img.width > max_size or img.height > max_size:
                 img.thumbnail((max_size, max_size), Image.Resampling.LANCZOS)
+            if image_format == "JPEG" and img.mode not in ("RGB", "L"):
+                img = img.convert("RGB")
 
             # 2. Агресивне збереження
-            # quality=45 — дуже високе стиснення, ідеально для великих каталогів
-            img.save(temp_path, "WEBP", quality=45, method=6, optimize=True)
-            
+            save_image(img, temp_path, image_format)
+
         new_size = os.path.getsize(temp_path)
-        
+
         # Замінюємо оригінал тільки якщо новий файл дійсно менший
         if new_size < original_size:
             os.replace(temp_path, file_path)
-            return original_size, new_size, True
+            content_hash = file_hash(file_path)
+            replaced = True
         else:
-            if os.path.exists(temp_path):
-                os.remove(temp_path)
-            return original_size, original_size, False
-            
+            os.remove(temp_path)
+            new_size = original_size
+            replaced = False
+        return rel_path, original_size, new_size, replaced, (
+            manifest_entry(file_path, content_hash)
+        )
+
     except Exception as e:
-        return 0, 0, False
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        print(f"❌ {rel_path}: {e}")
+        return rel_path, 0, 0, False, None
 
-def run_recompression(directory):
+
+def manifest_entry(file_path, content_hash):
+    stat = os.stat(file_path)
+    return {
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "hash": content_hash,
+        "params": PARAMS,
+    }
+
+
+def run_recompression(
+    directory, manifest_path, workers=None, dry_run=False, excluded=()
+):
     if not os.path.exists(directory):
         print(f"❌ Папка '{directory}' не знайдена.")
         return
 
-    initial_size_mb = get_dir_size(directory) / (1024 * 1024)
+    start_time = time.time()
+    initial_size, images = scan_directory(directory, excluded)
+    initial_size_mb = initial_size / (1024 * 1024)
     print(f"📊 Початковий розмір папки: {initial_size_mb:.2f} MB")
 
-    # Шукаємо тільки .webp файли
-    queue = []
-    for root, _, files in os.walk(directory):
-        for f in files:
-            path = Path(root) / f
-            if path.suffix.lower() == '.webp':
-                queue.append(path)
-    
+    manifest = load_manifest(manifest_path)
+    # Файли, яких більше немає, прибираємо з маніфесту
+    image_paths = {rel_path for rel_path, _, _ in images}
+    manifest = {
+        path: entry for path, entry in manifest.items() if path in image_paths
+    }
+    queue = [
+        (rel_path, size)
+        for rel_path, size, mtime_ns in images
+        if not is_processed(manifest.get(rel_path), size, mtime_ns)
+    ]
+
     total_files = len(queue)
+    print(
+        f"🔎 Зображень: {len(images)}, вже оброблено: "
+        f"{len(images) - total_files}, в черзі: {total_files}"
+    )
     if total_files == 0:
-        print("✅ Файлів .webp не знайдено.")
+        if not dry_run:
+            save_manifest(manifest_path, manifest)
+        print("✅ Нових або змінених файлів немає.")
         return
 
-    print(f"🚀 Починаю перетискання {total_files} файлів WebP (20 процесів)...")
-    start_time = time.time()
+    if dry_run:
+        queue_size_mb = sum(size for _, size in queue) / (1024 * 1024)
+        for rel_path, size in queue:
+            print(f"   {rel_path} ({size / 1024:.1f} KB)")
+        print(f"🧪 Dry run: буде перетиснуто {total_files} файлів, {queue_size_mb:.2f} MB")
+        return
+
+    workers = workers or os.cpu_count() or 1
+    print(f"🚀 Починаю перетискання {total_files} файлів ({workers} процесів)...")
 
-    with Pool(processes=20) as pool:
-        processed = 0
-        total_old_size = 0
-        total_new_size = 0
-        
-        for old_sz, new_sz, success in pool.imap_unordered(recompress_webp, queue):
-            processed += 1
-            total_old_size += old_sz
-            total_new_size += new_sz
-            
-            if processed % 10 == 0 or processed == total_files:
-                elapsed = time.time() - start_time
-                rem = (elapsed / processed) * (total_files - processed)
-                print(f"📈 Прогрес: [{processed}/{total_files}] | Залишилось: {int(rem//60)}хв {int(rem%60)}с")
-
-    final_size_mb = get_dir_size(directory) / (1024 * 1024)
+    tasks = [
+        (directory, rel_path, manifest.get(rel_path, {}).get("hash"))
+        for rel_path, _ in queue
+    ]
+    processed = 0
+    replaced_count = 0
+    total_old_size = 0
+    total_new_size = 0
+    try:
+        with Pool(processes=workers) as pool:
+            for rel_path, old_sz, new_sz, replaced, entry in pool.imap_unordered(
+                recompress_image, tasks, chunksize=4
+            ):
+                processed += 1
+                total_old_size += old_sz
+                total_new_size += new_sz
+                replaced_count += replaced
+                if entry is not None:
+                    manifest[rel_path] = entry
+
+                if processed % 10 == 0 or processed == total_files:
+                    elapsed = time.time() - start_time
+                    rem = (elapsed / processed) * (total_files - processed)
+                    print(f"📈 Прогрес: [{processed}/{total_files}] | Залишилось: {int(rem//60)}хв {int(rem%60)}с")
+    finally:
+        # Зберігаємо навіть при перериванні, щоб не повторювати роботу
+        save_manifest(manifest_path, manifest)
+
+    final_size_mb = (initial_size - total_old_size + total_new_size) / (1024 * 1024)
     duration = time.time() - start_time
     reduction = 100 - (final_size_mb / initial_size_mb * 100) if initial_size_mb > 0 else 0
 
-    print(f"\n--- ФІНАЛЬНИЙ ЗВІТ ---")
+    print("\n--- ФІНАЛЬНИЙ ЗВІТ ---")
     print(f"⏱️ Час виконання: {int(duration // 60)}хв {int(duration % 60)}с")
+    print(f"🗜️ Замінено файлів: {replaced_count}/{total_files}")
     print(f"📉 Розмір ДО: {initial_size_mb:.2f} MB")
     print(f"✨ Розмір ПІСЛЯ: {final_size_mb:.2f} MB")
     print(f"🔥 Реальне стиснення: {reduction:.1f}%")
-    print(f"----------------------")
+    print("----------------------")
+
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Перетискання WebP/JPEG/PNG у папці зі статикою"
+    )
     # Вкажіть шлях до папки зі статикою
-    run_recompression("static")
\ No newline at end of file
+    parser.add_argument("directory", nargs="?", default="static")
+    parser.add_argument(
+        "--manifest",
+        default="optimize_images.manifest.json",
+        help="Файл з уже обробленими файлами (поза папкою статики)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Кількість процесів, за замовчуванням кількість CPU",
+    )
+    parser.add_argument(
+        "--exclude",
+        action="append",
+        default=None,
+        help=(
+            "Підпапка статики, яку не чіпати (можна кілька разів). "
+            "За замовчуванням папка завантажень: їхні файли названі за "
+            "хешем вмісту і кешуються як незмінні"
+        ),
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Лише показати, що буде перетиснуто",
+    )
+    args = parser.parse_args()
+    run_recompression(
+        args.directory,
+        args.manifest,
+        workers=args.workers,
+        dry_run=args.dry_run,
+        excluded=args.exclude or [os.environ.get("STATIC_UPLOAD_DIR", "uploads")],
+    )
@@ -23,6 +23,17 @@ class RedisCaching:
         if not cls._redis_instance:
             cls._redis_instance = Redis.from_url(settings.cache.redis_url)
 
+    @classmethod
+    async def close(cls) -> None:
+        """
+        Closes and drops the shared client. Its connections belong to
+        the event loop that opened them, code running every job in a
+        loop of its own (Celery tasks) closes it before the loop ends.
+        """
+        if cls._redis_instance is not None:
+            redis, cls._redis_instance = cls._redis_instance, None
+            await redis.aclose()
+
     @classmethod
     def get_cache_key(
         cls,
@@ -13,6 +13,8 @@ app.conf.update(
 app.autodiscover_tasks(["src.user.tasks"])
 app.autodiscover_tasks(["src.letter.tasks"])
 app.autodiscover_tasks(["src.order.tasks"])
+app.autodiscover_tasks(["src.product.tasks"])
+app.autodiscover_tasks(["src.static_img.tasks"])
 
 
 app.conf.timezone = "Europe/Kyiv"
@@ -22,4 +24,19 @@ app.conf.beat_schedule = {
         "schedule": crontab(hour=0, minute=0),  # run once a day at midnight
         "options": {"expires": 3600},  # expire task if not executed in 1 hour
     },
+    "collect_static_garbage": {
+        "task": "collect_static_garbage",
+        "schedule": crontab(hour=3, minute=30),  # run once a day at night
+        "options": {"expires": 3600},
+    },
+    "purge_stale_guest_baskets": {
+        "task": "purge_stale_guest_baskets",
+        "schedule": crontab(hour=4, minute=0),
+        "options": {"expires": 3600},
+    },
+    "purge_expired_auth_tokens": {
+        "task": "purge_expired_auth_tokens",
+        "schedule": crontab(hour=4, minute=15),
+        "options": {"expires": 3600},
+    },
 }
@@ -80,18 +80,54 @@ class CelerySettings(BaseSettings):
 class CacheSettings(BaseSettings):
     use_redis: bool = Field(alias="cache_use_redis", default=True)
     redis_url: str = Field(alias="cache_redis_url", default="redis://localhost:6379")
+    product_json_expire: int = Field(alias="cache_product_json_expire", default=86400)
+    guest_basket_expire: int = Field(alias="cache_guest_basket_expire", default=604800)
 
 
 class StaticFilesSettings(BaseSettings):
     directory: str = Field(alias="static_dir", default="./static")
     max_file_size: int = Field(alias="static_max_file_size", default=10485760)
     allowed_extensions: str = Field(alias="static_upload_allowed_extensions", default=".jpg,.jpeg,.png,.gif,.webp,.pdf,.docx")
+    upload_dir: str = Field(alias="static_upload_dir", default="uploads")
+    upload_concurrency: int = Field(alias="static_upload_concurrency", default=8)
+    variant_widths: str = Field(alias="static_variant_widths", default="320,640,1024,1600")
+    image_cache_dir: str = Field(alias="static_image_cache_dir", default="./cache/images")
+    image_cache_max_size: int = Field(alias="static_image_cache_max_size", default=536870912)
+    image_workers: int = Field(alias="static_image_workers", default=2)
+    image_max_dimension: int = Field(alias="static_image_max_dimension", default=2400)
+    manifest_watch: bool = Field(alias="static_manifest_watch", default=True)
+    manifest_refresh_interval: int = Field(alias="static_manifest_refresh_interval", default=300)
+    gc_trash_dir: str = Field(alias="static_gc_trash_dir", default="./trash/static")
+    gc_grace_period: int = Field(alias="static_gc_grace_period", default=86400)
+    gc_trash_retention: int = Field(alias="static_gc_trash_retention", default=2592000)
 
     @field_validator("allowed_extensions")
     @classmethod
     def assemble_allowed_extensions(cls, v: str) -> list[str]:
         return DotenvListHelper.get_list_from_value(v)
 
+    @field_validator("variant_widths")
+    @classmethod
+    def assemble_variant_widths(cls, v: str) -> list[int]:
+        return sorted(int(w) for w in DotenvListHelper.get_list_from_value(v))
+
+
+class PurgeSettings(BaseSettings):
+    batch_size: int = Field(alias="purge_batch_size", default=1000)
+    guest_basket_inactive_days: int = Field(alias="purge_guest_basket_inactive_days", default=30)
+
+
+class ResponseSettings(BaseSettings):
+    renderer: str = Field(alias="response_renderer", default="orjson")
+
+    @field_validator("renderer")
+    @classmethod
+    def validate_renderer(cls, v: str) -> str:
+        v = v.lower()
+        if v not in ("orjson", "json"):
+            raise ValueError("Response renderer must be orjson or json")
+        return v
+
 
 class PaginationSettings(BaseSettings):
     limit_per_page: int = Field(
@@ -182,6 +218,12 @@ class Settings(BaseSettings):
     # Static files
     static: StaticFilesSettings = Field(default_factory=StaticFilesSettings)
 
+    # Purge jobs
+    purge: PurgeSettings = Field(default_factory=PurgeSettings)
+
+    # Responses
+    response: ResponseSettings = Field(default_factory=ResponseSettings)
+
     # Pagination
     pagination: PaginationSettings = Field(default_factory=PaginationSettings)
 
@@ -0,0 +1,46 @@
+import logging
+import time
+
+from dataclasses import dataclass
+from typing import Awaitable, Callable
+
+from ..config import settings
+
+
+log = logging.getLogger(__name__)
+
+
+@dataclass
+class PurgeReport:
+    table: str
+    purged_rows: int = 0
+    batches: int = 0
+    duration: float = 0.0
+
+
+async def purge_in_batches(
+    uow,
+    table: str,
+    delete_batch: Callable[[int], Awaitable[int]],
+    batch_size: int | None = None,
+) -> PurgeReport:
+    """
+    Calls delete_batch(limit) -> deleted rows in its own transaction
+    until a batch comes back short. Small transactions keep row locks
+    and WAL bursts short, so the purge does not stall regular writes.
+    """
+    if batch_size is None:
+        batch_size = settings.purge.batch_size
+    report = PurgeReport(table=table)
+    started = time.monotonic()
+    while True:
+        async with uow:
+            deleted = await delete_batch(batch_size)
+            await uow.commit()
+        report.batches += 1
+        report.purged_rows += deleted
+        if deleted < batch_size:
+            break
+    report.duration = round(time.monotonic() - started, 3)
+    log.info("Purge: %s", report)
+    return report
@@ -1,10 +1,11 @@
 import uuid
 
-from typing import TypeVar, Optional
+from functools import lru_cache
+from typing import TypeVar, Optional, Sequence
 
 from abc import ABC, abstractmethod
 
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 
 from ...core.dependencies import PaginationParams
 from ...core.schemas import BaseListSchema
@@ -14,12 +15,23 @@ from ...utils.processors.filters.dependencies import FiltersDecoder
 from ...utils.processors.filters.base import FilterProcessor
 from ...utils.exceptions.processors.filters import FilterException
 from ...utils.exceptions.http.filters import FilterProcessException
+from ...utils.exceptions.sort import InvalidSortException
+from ...utils.exceptions.http.sort import SortProcessException
 from ...utils.exceptions.http.base import IdNotFoundException
 
 
 Repo = TypeVar("Repo")
 
 
+@lru_cache
+def get_list_adapter(schema: type[BaseModel]) -> TypeAdapter:
+    """
+    Returns a cached TypeAdapter validating a whole list of
+    ORM objects into the given schema in a single pass.
+    """
+    return TypeAdapter(list[schema])
+
+
 class AbstractService(ABC):
     @abstractmethod
     async def get_show_scheme(self, obj) -> BaseModel:
@@ -42,10 +54,28 @@ class AbstractService(ABC):
 class BaseService(AbstractService):
     filter_processor: FilterProcessor
     list_schema: Optional[BaseListSchema] = None
+    show_schema: Optional[type[BaseModel]] = None
 
     def __init__(self, uow: uowDEP) -> None:
         self.uow = uow
 
+    async def get_show_scheme(self, obj) -> BaseModel:
+        if self.show_schema is None:
+            raise NotImplementedError()
+        return self.show_schema.model_validate(obj, from_attributes=True)
+
+    async def get_show_schemes(self, objs: Sequence) -> list[BaseModel]:
+        """
+        Builds show schemes for a list of objects. Services with
+        a show_schema validate the whole list at once through a
+        cached TypeAdapter, others fall back to get_show_scheme.
+        """
+        if self.show_schema is None:
+            return [await self.get_show_scheme(obj) for obj in objs]
+        return get_list_adapter(self.show_schema).validate_python(
+            objs, from_attributes=True
+        )
+
     async def create_obj(self, repo: Repo, data: BaseModel) -> BaseModel:
         obj_id = await repo.create(obj_in=data)
         await self.uow.commit()
@@ -76,18 +106,17 @@ class BaseService(AbstractService):
             raise IdNotFoundException(model=repo.model, id=obj_id)
         return await self.get_show_scheme(obj)
 
-    async def get_obj_list(
+    async def get_list_filters(
         self,
-        repo: Repo,
-        options: Optional[list] = None,
         filters: Optional[list] = None,
-        pagination_params: Optional[PaginationParams] = None,
         filters_decoder: Optional[FiltersDecoder] = None,
-    ) -> BaseListSchema[BaseModel] | list[BaseModel]:
+    ) -> Optional[list]:
+        """Extends the given filters with the ones from the query string."""
         try:
             if filters_decoder and filters_decoder.decoded_filters:
                 decoded_filters = (
-                    await self.filter_processor().process_filters(
+                    await self.filter_processor().process_encoded_filters(
+                        filters_decoder.encoded_filters,
                         filters_decoder.decoded_filters,
                     )
                 )
@@ -97,44 +126,72 @@ class BaseService(AbstractService):
                     filters = decoded_filters
         except FilterException:
             raise FilterProcessException()
+        return filters
 
-        if pagination_params and pagination_params.page:
-            paginated = True
-            objs = await repo.get_all(
-                with_pagination=True,
-                options=options,
-                filters=filters,
-                pagination=pagination_params,
-            )
-        else:
-            paginated = False
-            objs = await repo.get_all(
-                options=options,
-                filters=filters,
-            )
+    async def get_page_meta(
+        self,
+        repo: Repo,
+        pagination_params: PaginationParams,
+        filters: Optional[list] = None,
+    ) -> dict:
+        """Returns the list schema fields describing the requested page."""
+        objs_total_count = await repo.get_count(filters=filters)
+        total_pages = (
+            objs_total_count + pagination_params.size - 1
+        ) // pagination_params.size
+        next_page = (
+            pagination_params.page + 1
+            if pagination_params.page < total_pages
+            else None
+        )
+        previous_page = (
+            pagination_params.page - 1
+            if pagination_params.page > 1
+            else None
+        )
+        return {
+            "objects_count": objs_total_count,
+            "next_page": next_page,
+            "previous_page": previous_page,
+            "pages_count": total_pages,
+        }
+
+    async def get_obj_list(
+        self,
+        repo: Repo,
+        options: Optional[list] = None,
+        filters: Optional[list] = None,
+        pagination_params: Optional[PaginationParams] = None,
+        filters_decoder: Optional[FiltersDecoder] = None,
+        sort: Optional[str] = None,
+    ) -> BaseListSchema[BaseModel] | list[BaseModel]:
+        filters = await self.get_list_filters(filters, filters_decoder)
+
+        try:
+            if pagination_params and pagination_params.page:
+                paginated = True
+                objs = await repo.get_all(
+                    with_pagination=True,
+                    options=options,
+                    filters=filters,
+                    pagination=pagination_params,
+                    sort=sort,
+                )
+            else:
+                paginated = False
+                objs = await repo.get_all(
+                    options=options,
+                    filters=filters,
+                    sort=sort,
+                )
+        except InvalidSortException as e:
+            raise SortProcessException(e.message)
 
-        objs_list = [await self.get_show_scheme(obj) for obj in objs]
+        objs_list = await self.get_show_schemes(objs)
 
         if paginated:
-            objs_total_count = await repo.get_count()
-            total_pages = (
-                objs_total_count + pagination_params.size - 1
-            ) // pagination_params.size
-            next_page = (
-                pagination_params.page + 1
-                if pagination_params.page < total_pages
-                else None
-            )
-            previous_page = (
-                pagination_params.page - 1
-                if pagination_params.page > 1
-                else None
-            )
             return self.list_schema(
-                objects_count=objs_total_count,
-                next_page=next_page,
-                previous_page=previous_page,
-                pages_count=total_pages,
+                **await self.get_page_meta(repo, pagination_params, filters),
                 results=objs_list,
             )
         return objs_list
@@ -21,6 +21,7 @@ from ...repositories.order import (
     OrderRepository,
     OrderItemRepository,
 )
+from ...repositories.static import StaticFileRepository
 
 
 class AbstractUnitOfWork(ABC):
@@ -37,6 +38,7 @@ class AbstractUnitOfWork(ABC):
     basket_item: BasketItemRepository
     order: OrderRepository
     order_item: OrderItemRepository
+    static_file: StaticFileRepository
 
     @abstractmethod
     async def __aenter__(self):
@@ -97,6 +99,9 @@ class UnitOfWork(AbstractUnitOfWork):
         self.order = OrderRepository(self.session)
         self.order_item = OrderItemRepository(self.session)
 
+        # Uploaded static files
+        self.static_file = StaticFileRepository(self.session)
+
     async def __aexit__(self, *args):
         await self.rollback()
         await self.session.close()
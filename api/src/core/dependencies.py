@@ -26,3 +26,21 @@ def get_pagination_params(params: PaginationParams = Depends()):
 
 
 pagination_params = Annotated[PaginationParams, Depends(get_pagination_params)]
+
+
+class SortParams:
+    def __init__(
+        self,
+        sort: Optional[str] = Query(
+            default=None,
+            description="Sort option name, allowed values depend on the list",
+        ),
+    ):
+        self.sort = sort
+
+
+def get_sort_params(params: SortParams = Depends()):
+    return params
+
+
+sort_params = Annotated[SortParams, Depends(get_sort_params)]
@@ -0,0 +1,55 @@
+from typing import Any
+
+import orjson
+
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel
+from pydantic_core import to_json
+
+from .config import settings
+
+
+def _orjson_default(obj: Any) -> Any:
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+class SchemaResponse(JSONResponse):
+    """
+    JSON response for already built schemas.
+
+    Returning it from an endpoint skips the response_model
+    re-validation and jsonable_encoder pass done by FastAPI,
+    the content is serialized once by pydantic-core.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return to_json(content)
+
+
+class RawJSONResponse(Response):
+    """Response for content that is already serialized JSON."""
+
+    media_type = "application/json"
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSON response serialized by orjson. Enums, datetimes, dates
+    and UUIDs are encoded natively, schemas are dumped first.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_orjson_default)
+
+
+response_classes: dict[str, type[JSONResponse]] = {
+    "json": JSONResponse,
+    "orjson": ORJSONResponse,
+}
+
+
+def get_response_class() -> type[JSONResponse]:
+    """Returns the app-wide response class set by RESPONSE_RENDERER."""
+    return response_classes[settings.response.renderer]
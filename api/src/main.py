@@ -11,17 +11,26 @@ from uvicorn.middleware.proxy_headers import ProxyHeadersMiddleware
 from .middlewares.request_logger import RequestAuditMiddleware
 from .core.config import settings
 from .core.caching import init_caching
+from .core.responses import get_response_class
 from .user.router import router as user_router
 from .product.router import router as product_router
 from .order.router import router as order_router
 from .nova_post.router import router as nova_post_router
 from .letter.router import router as letter_router
+from .static_img.router import router as static_img_router
+from .static_img.manifest import static_manifest
+from .static_img.service import image_resize_service
+from .static_img.staticfiles import ImmutableStaticFiles
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     init_caching()
+    # File index is built in the background, startup does not wait
+    static_manifest.start()
     yield
+    await static_manifest.stop()
+    image_resize_service.shutdown()
 
 
 app = FastAPI(
@@ -29,6 +38,7 @@ app = FastAPI(
     debug=settings.debug,
     version=str(settings.app_version),
     lifespan=lifespan,
+    default_response_class=get_response_class(),
     docs_url="/docs",
     redoc_url="/redoc",
 )
@@ -80,6 +90,9 @@ routers: list[APIRouter] = [
 for router in routers:
     app.include_router(router, prefix=f"/api/v{settings.app_version}")
 
+# Resized static images, next to /static
+app.include_router(static_img_router)
+
 
 # Mount static directory
 # main.py знаходиться в /app/api/src/main.py
@@ -94,12 +107,17 @@ print(f"   Static exists: {STATIC_DIR.exists()}")
 
 if STATIC_DIR.exists() and STATIC_DIR.is_dir():
     try:
+        # Content addressed uploads never change, mounted first so
+        # they get immutable cache headers
+        UPLOADS_DIR = STATIC_DIR / settings.static.upload_dir
+        UPLOADS_DIR.mkdir(exist_ok=True)
+        app.mount(
+            f"/static/{settings.static.upload_dir}",
+            ImmutableStaticFiles(directory=str(UPLOADS_DIR)),
+            name="static_uploads",
+        )
         app.mount("/static", StaticFiles(directory=str(STATIC_DIR)), name="static")
-        
-        # Підрахунок файлів для діагностики
-        files_count = sum(1 for f in STATIC_DIR.rglob("*") if f.is_file())
         print(f"✅ Static files mounted from {STATIC_DIR}")
-        print(f"📁 Total files in static: {files_count}")
     except Exception as e:
         print(f"❌ Error mounting static: {e}")
 else:
@@ -112,8 +130,8 @@ else:
 
 # Діагностичний endpoint (можна видалити після налагодження)
 @app.get("/debug/static-check")
-async def check_static():
-    """Діагностика статичних файлів"""
+async def check_static(prefix: str = "", limit: int = 20, offset: int = 0):
+    """Діагностика статичних файлів, з індексу в пам'яті"""
     result = {
         "main_py_location": str(Path(__file__).resolve()),
         "base_dir": str(BASE_DIR),
@@ -123,13 +141,14 @@ async def check_static():
     }
     
     if STATIC_DIR.exists() and STATIC_DIR.is_dir():
-        try:
-            files = [str(f.relative_to(STATIC_DIR)) for f in STATIC_DIR.rglob("*") if f.is_file()]
-            result["total_files"] = len(files)
-            result["sample_files"] = files[:20]  # Перші 20 файлів
-        except Exception as e:
-            result["error"] = str(e)
-    
+        result["manifest_ready"] = static_manifest.ready
+        result["manifest_built_at"] = static_manifest.built_at
+        result["total_files"] = static_manifest.count
+        result["total_size"] = static_manifest.total_size
+        result["sample_files"] = static_manifest.list_files(
+            prefix=prefix, limit=min(limit, 100), offset=offset
+        )
+
     return result
 
 
@@ -0,0 +1,214 @@
+import json
+
+from typing import Callable, Iterable, Optional
+
+from ..core.caching import RedisCaching
+from ..core.config import settings
+
+from .models import BASKET_ITEM_VARIANT_COLUMNS
+
+
+class GuestBasketStore:
+    """
+    Guest baskets, one Redis hash per basket token.
+
+    The hash maps item ids to item JSON, the "seq" field hands out
+    item ids. Every write renews the expire, so abandoned baskets
+    disappear without a database row ever being created. Writes are
+    WATCH/MULTI transactions, concurrent clicks are retried instead
+    of overwriting each other.
+    """
+
+    key_prefix = "basket:guest"
+    seq_field = "seq"
+
+    def __init__(self) -> None:
+        self.enabled = settings.cache.use_redis
+        self.expire = settings.cache.guest_basket_expire
+        self.redis = RedisCaching().redis if self.enabled else None
+
+    @classmethod
+    def get_key(cls, token: str) -> str:
+        return f"{cls.key_prefix}:{token}"
+
+    @classmethod
+    def _decode(cls, data: dict) -> list[dict]:
+        return sorted(
+            (
+                json.loads(value)
+                for field, value in data.items()
+                if field != cls.seq_field.encode()
+            ),
+            key=lambda item: item["id"],
+        )
+
+    async def get_items(self, token: str) -> Optional[list[dict]]:
+        """Items of the basket, None when there is no such basket."""
+        key = self.get_key(token)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hgetall(key)
+            pipe.expire(key, self.expire)
+            data, _ = await pipe.execute()
+        if not data:
+            return None
+        return self._decode(data)
+
+    async def create(self, token: str, items: Iterable[dict] = ()) -> None:
+        """Stores a new basket, items are given ids in order."""
+        mapping = {self.seq_field: 0}
+        for item_id, item in enumerate(items, start=1):
+            mapping[item_id] = json.dumps({**item, "id": item_id})
+            mapping[self.seq_field] = item_id
+        key = self.get_key(token)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.delete(key)
+            pipe.hset(key, mapping=mapping)
+            pipe.expire(key, self.expire)
+            await pipe.execute()
+
+    async def delete(self, token: str) -> None:
+        await self.redis.unlink(self.get_key(token))
+
+    async def take(self, token: str) -> Optional[list[dict]]:
+        """
+        Reads and deletes the basket in one transaction, so no write
+        can land between the two. None when there is no such basket.
+        """
+        key = self.get_key(token)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hgetall(key)
+            pipe.unlink(key)
+            data, _ = await pipe.execute()
+        if not data:
+            return None
+        return self._decode(data)
+
+    async def restore(self, token: str, items: Iterable[dict]) -> None:
+        """
+        Puts taken items back, adding their quantities to lines of the
+        same variant written since they were taken.
+        """
+        key = self.get_key(token)
+
+        async def transaction(pipe) -> None:
+            data = await pipe.hgetall(key)
+            lines = {
+                self.get_variant(item): item for item in self._decode(data)
+            }
+            next_id = int(data.get(self.seq_field.encode(), 0)) + 1
+            changed = {}
+            for item in items:
+                variant = self.get_variant(item)
+                line = changed.get(variant) or lines.get(variant)
+                if line:
+                    changed[variant] = {
+                        **line,
+                        "quantity": line["quantity"] + item["quantity"],
+                    }
+                else:
+                    changed[variant] = {**item, "id": next_id}
+                    next_id += 1
+            pipe.multi()
+            pipe.hset(
+                key,
+                mapping={
+                    self.seq_field: next_id - 1,
+                    **{
+                        item["id"]: json.dumps(item)
+                        for item in changed.values()
+                    },
+                },
+            )
+            pipe.expire(key, self.expire)
+
+        await self.redis.transaction(transaction, key)
+
+    async def _change(
+        self, token: str, change: Callable[[list[dict], int], tuple]
+    ) -> Optional[list[dict]]:
+        """
+        Applies change(items, next_id) -> (changed items, removed ids)
+        atomically. Returns the items after the change, None when
+        there is no such basket.
+        """
+        key = self.get_key(token)
+
+        async def transaction(pipe) -> Optional[list[dict]]:
+            data = await pipe.hgetall(key)
+            if not data:
+                return None
+            items = {item["id"]: item for item in self._decode(data)}
+            next_id = int(data[self.seq_field.encode()]) + 1
+            changed, removed = change(list(items.values()), next_id)
+            pipe.multi()
+            if changed:
+                pipe.hset(
+                    key,
+                    mapping={
+                        self.seq_field: max(
+                            [next_id - 1, *(item["id"] for item in changed)]
+                        ),
+                        **{item["id"]: json.dumps(item) for item in changed},
+                    },
+                )
+            if removed:
+                pipe.hdel(key, *removed)
+            pipe.expire(key, self.expire)
+            items.update((item["id"], item) for item in changed)
+            for item_id in removed:
+                items.pop(item_id, None)
+            return sorted(items.values(), key=lambda item: item["id"])
+
+        return await self.redis.transaction(
+            transaction, key, value_from_callable=True
+        )
+
+    @staticmethod
+    def get_variant(item: dict) -> tuple:
+        return tuple(
+            item.get(column)
+            for column in BASKET_ITEM_VARIANT_COLUMNS
+            if column != "basket_id"
+        )
+
+    async def add_item(self, token: str, item: dict) -> Optional[list[dict]]:
+        """Adds the item, or its quantity to the line of the same variant."""
+        variant = self.get_variant(item)
+
+        def change(items: list[dict], next_id: int) -> tuple:
+            for existing in items:
+                if self.get_variant(existing) == variant:
+                    return [
+                        {
+                            **existing,
+                            "quantity": existing["quantity"] + item["quantity"],
+                        }
+                    ], []
+            return [{**item, "id": next_id}], []
+
+        return await self._change(token, change)
+
+    async def update_item(
+        self, token: str, item_id: int, values: dict
+    ) -> Optional[list[dict]]:
+        """Raises KeyError when the basket has no such item."""
+
+        def change(items: list[dict], next_id: int) -> tuple:
+            for existing in items:
+                if existing["id"] == item_id:
+                    return [{**existing, **values}], []
+            raise KeyError(item_id)
+
+        return await self._change(token, change)
+
+    async def remove_item(
+        self, token: str, item_id: int
+    ) -> Optional[list[dict]]:
+        """Raises KeyError when the basket has no such item."""
+
+        def change(items: list[dict], next_id: int) -> tuple:
+            if not any(existing["id"] == item_id for existing in items):
+                raise KeyError(item_id)
+            return [], [item_id]
+
+        return await self._change(token, change)
@@ -0,0 +1,23 @@
+import uuid
+
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass
+class ResolvedBasket:
+    """
+    Basket of the request, resolved by the current_basket
+    dependency before the service runs. Guest baskets kept in
+    Redis have only a token.
+    """
+
+    user_id: Optional[uuid.UUID] = None
+    basket_id: Optional[int] = None
+    basket_token: Optional[str] = None
+    # guest basket token sent along with the authorization
+    guest_token: Optional[str] = None
+
+    @property
+    def is_guest(self) -> bool:
+        return self.user_id is None
@@ -0,0 +1,23 @@
+from typing import Annotated
+
+from fastapi import Depends
+
+from ..core.db.dependencies import uowDEP
+from ..user.dependencies import authorization
+
+from .dataclasses import ResolvedBasket
+from .service import BasketService
+
+
+async def get_current_basket(
+    uow: uowDEP,
+    authorization: authorization,
+    basket_token: str = None,
+) -> ResolvedBasket:
+    return await BasketService(uow).resolve_basket(
+        authorization=authorization,
+        basket_token=basket_token,
+    )
+
+
+current_basket = Annotated[ResolvedBasket, Depends(get_current_basket)]
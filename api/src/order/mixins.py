@@ -2,7 +2,7 @@ import uuid
 
 from enum import Enum as PyEnum
 
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, func, select
 from sqlalchemy.orm import Mapped, declared_attr, mapped_column, relationship
 from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.dialects.postgresql import ENUM
@@ -139,6 +139,15 @@ class ItemMixin(BaseModelMixin):
     def total_price(self):
         return self.product.price * self.quantity
 
+    @total_price.expression
+    @classmethod
+    def total_price(cls):
+        return (
+            select(Product.price * cls.quantity)
+            .where(Product.id == cls.product_id)
+            .scalar_subquery()
+        )
+
 
 class BasketAndOrderMixin(BaseModelMixin):
     user_id: Mapped[uuid.UUID] = mapped_column(
@@ -148,10 +157,44 @@ class BasketAndOrderMixin(BaseModelMixin):
         doc="User ID",
     )
 
+    @classmethod
+    def _items_subquery(cls, *columns):
+        """
+        Correlated subquery over the items of the row, the SQL side
+        of the totals, so lists can be filtered and sorted by them
+        without loading the items.
+        """
+        items = cls.items.property
+        return (
+            select(*columns)
+            .select_from(items.mapper.class_)
+            .where(items.primaryjoin)
+        )
+
     @hybrid_property
     def total_value(self):
         return sum(item.total_price for item in self.items)
 
+    @total_value.expression
+    @classmethod
+    def total_value(cls):
+        item = cls.items.property.mapper.class_
+        return (
+            cls._items_subquery(
+                func.coalesce(func.sum(Product.price * item.quantity), 0)
+            )
+            .join(Product, Product.id == item.product_id)
+            .scalar_subquery()
+        )
+
     @hybrid_property
     def total_items(self):
         return sum(item.quantity for item in self.items)
+
+    @total_items.expression
+    @classmethod
+    def total_items(cls):
+        item = cls.items.property.mapper.class_
+        return cls._items_subquery(
+            func.coalesce(func.sum(item.quantity), 0)
+        ).scalar_subquery()
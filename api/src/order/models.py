@@ -1,9 +1,11 @@
 import datetime
+import uuid
 
 from enum import Enum as PyEnum
 
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, Index, func, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.dialects.postgresql import ENUM
 
 from ..core.db.base import Base
@@ -13,6 +15,15 @@ from .enums import OrderStatusEnum
 
 
 class Basket(BasketAndOrderMixin, Base):
+    __table_args__ = (
+        # the purge job looks up inactive guest baskets only
+        Index(
+            "ix_basket_guest_updated_at",
+            "updated_at",
+            postgresql_where=text("user_id IS NULL"),
+        ),
+    )
+
     basket_token: Mapped[str] = mapped_column(
         nullable=True,
         index=True,
@@ -30,8 +41,31 @@ class Basket(BasketAndOrderMixin, Base):
         return f"Basket {self.id}. Total items: {self.total_items}. Total value: {self.total_value}"
 
 
+# columns telling apart two lines of the same product in a basket
+BASKET_ITEM_VARIANT_COLUMNS = (
+    "basket_id",
+    "product_id",
+    "color_id",
+    "size_id",
+    "covering_id",
+    "glass_color_id",
+    "material",
+    "orientation",
+    "type_of_platband",
+    "with_glass",
+)
+
+
 class BasketItem(ItemMixin, Base):
     __tablename__ = "basket_item"
+    __table_args__ = (
+        Index(
+            "uq_basket_item_variant",
+            *BASKET_ITEM_VARIANT_COLUMNS,
+            unique=True,
+            postgresql_nulls_not_distinct=True,
+        ),
+    )
 
     basket_id: Mapped[int] = mapped_column(
         ForeignKey(
@@ -49,6 +83,18 @@ class BasketItem(ItemMixin, Base):
 
 
 class Order(BasketAndOrderMixin, Base):
+    __table_args__ = (
+        Index("ix_order_user_id_created_at_id", "user_id", "created_at", "id"),
+        Index("ix_order_created_at_id", "created_at", "id"),
+    )
+
+    # no index of its own, ix_order_user_id_created_at_id leads with it
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("user.id", ondelete="CASCADE", onupdate="CASCADE"),
+        nullable=True,
+        doc="User ID",
+    )
+
     full_name: Mapped[str] = mapped_column(
         nullable=False,
         doc="Full name",
@@ -105,6 +151,19 @@ class Order(BasketAndOrderMixin, Base):
         cascade="all, delete-orphan",
     )
 
+    @hybrid_property
+    def total_value(self):
+        return sum(item.total_price for item in self.items)
+
+    @total_value.expression
+    @classmethod
+    def total_value(cls):
+        return cls._items_subquery(
+            func.coalesce(
+                func.sum(OrderItem.unit_price * OrderItem.quantity), 0
+            )
+        ).scalar_subquery()
+
     def __str__(self) -> str:
         return f"Order {self.id}"
 
@@ -122,6 +181,35 @@ class OrderItem(ItemMixin, Base):
         index=True,
         doc="Order ID",
     )
+    # the line outlives the product, its snapshot below keeps it readable
+    product_id: Mapped[int | None] = mapped_column(
+        ForeignKey("product.id", ondelete="SET NULL", onupdate="CASCADE"),
+        nullable=True,
+        index=True,
+        doc="Product ID",
+    )
+    # product as it was when the order was placed, so orders are
+    # read without the product and keep their value on price changes
+    unit_price: Mapped[int] = mapped_column(
+        nullable=False,
+        doc="Unit price",
+    )
+    product_name: Mapped[str] = mapped_column(
+        nullable=True,
+        doc="Product name",
+    )
+    product_sku: Mapped[str] = mapped_column(
+        nullable=True,
+        doc="Product SKU",
+    )
+    main_photo: Mapped[str] = mapped_column(
+        nullable=True,
+        doc="Main photo",
+    )
+
+    @hybrid_property
+    def total_price(self):
+        return self.unit_price * self.quantity
 
     def __str__(self) -> str:
-        return f"{self.product.sku} - {self.quantity} шт."
+        return f"{self.product_sku} - {self.quantity} шт."
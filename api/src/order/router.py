@@ -3,7 +3,8 @@ from fastapi import APIRouter
 from fastapi.responses import StreamingResponse
 
 from ..core.db.dependencies import uowDEP
-from ..core.dependencies import pagination_params
+from ..core.dependencies import pagination_params, sort_params
+from ..core.responses import SchemaResponse
 from ..user.dependencies import authorization
 from ..utils.processors.filters.dependencies import filters_decoder
 
@@ -16,6 +17,7 @@ from .schemas import (
     OrderUpdate,
     OrderListSchema,
 )
+from .dependencies import current_basket
 from .service import BasketService, OrderService
 
 
@@ -26,24 +28,29 @@ router = APIRouter(
 
 @router.get("/basket/", response_model=BasketShow, tags=["Basket"])
 async def get_basket(
-    authorization: authorization,
     uow: uowDEP,
-    basket_token: str = None,
+    basket: current_basket,
 ) -> BasketShow:
-    return await BasketService(uow).get_basket(authorization, basket_token)
+    return await BasketService(uow).get_basket(basket)
+
+
+@router.post("/basket/merge/", response_model=BasketShow, tags=["Basket"])
+async def merge_guest_basket(
+    uow: uowDEP,
+    basket: current_basket,
+) -> BasketShow:
+    return await BasketService(uow).merge_basket(basket)
 
 
 @router.post("/basket/add_item/", response_model=BasketShow, tags=["Basket"])
 async def add_item_to_basket(
     basket_item: BasketItemCreate,
-    authorization: authorization,
     uow: uowDEP,
-    basket_token: str = None,
+    basket: current_basket,
 ) -> BasketShow:
     return await BasketService(uow).add_item(
         item_data=basket_item,
-        authorization=authorization,
-        basket_token=basket_token,
+        basket=basket,
     )
 
 
@@ -55,15 +62,13 @@ async def add_item_to_basket(
 async def update_item_in_basket(
     basket_item: BasketItemUpdate,
     item_id: int,
-    authorization: authorization,
     uow: uowDEP,
-    basket_token: str = None,
+    basket: current_basket,
 ) -> BasketShow:
     return await BasketService(uow).update_item(
         item_data=basket_item,
         item_id=item_id,
-        authorization=authorization,
-        basket_token=basket_token,
+        basket=basket,
     )
 
 
@@ -75,52 +80,65 @@ async def update_item_in_basket(
 async def remove_item_from_basket(
     uow: uowDEP,
     item_id: int,
+    basket: current_basket,
 ) -> bool:
     return await BasketService(uow).remove_item(
         item_id=item_id,
+        basket=basket,
     )
 
 
 @router.post("/create/", response_model=OrderShow, tags=["Order"])
 async def create_order(
     order_data: OrderCreate,
-    authorization: authorization,
     uow: uowDEP,
-    basket_token: str = None,
+    basket: current_basket,
 ) -> int:
     return await OrderService(uow).create_order(
         data=order_data,
-        authorization=authorization,
-        basket_token=basket_token,
+        basket=basket,
     )
 
 
 @router.get(
     "/list/",
+    response_model=OrderListSchema | list[OrderShow],
     tags=["Order"],
 )
 async def get_order_list(
     pagination: pagination_params,
+    sort: sort_params,
     filters_decoder: filters_decoder = None,
     uow: uowDEP = uowDEP,
-) -> OrderListSchema | list[OrderShow]:
-    return await OrderService(uow).get_order_list(
-        pagination=pagination,
-        filters_decoder=filters_decoder,
+) -> SchemaResponse:
+    return SchemaResponse(
+        await OrderService(uow).get_order_list(
+            pagination=pagination,
+            filters_decoder=filters_decoder,
+            sort=sort.sort,
+        )
     )
 
 
-@router.get("/for_user/", tags=["Order"])
+@router.get(
+    "/for_user/",
+    response_model=OrderListSchema | list[OrderShow],
+    tags=["Order"],
+)
 async def get_orders_for_user(
     authorization: authorization,
     pagination: pagination_params,
+    sort: sort_params,
     filters_decoder: filters_decoder = None,
     uow: uowDEP = uowDEP,
-) -> OrderListSchema | list[OrderShow]:
-    return await OrderService(uow).get_orders_for_user(
-        authorization=authorization,
-        pagination=pagination,
-        filters_decoder=filters_decoder,
+) -> SchemaResponse:
+    return SchemaResponse(
+        await OrderService(uow).get_orders_for_user(
+            authorization=authorization,
+            pagination=pagination,
+            filters_decoder=filters_decoder,
+            sort=sort.sort,
+        )
     )
 
 
@@ -128,9 +146,11 @@ async def get_orders_for_user(
 async def get_order(
     order_id: int,
     uow: uowDEP,
-) -> OrderShow:
-    return await OrderService(uow).get_order(
-        order_id=order_id,
+) -> SchemaResponse:
+    return SchemaResponse(
+        await OrderService(uow).get_order(
+            order_id=order_id,
+        )
     )
 
 
@@ -3,7 +3,7 @@ import datetime
 
 from typing import Optional
 
-from pydantic import EmailStr
+from pydantic import EmailStr, field_validator
 
 from ..core.schemas import MainSchema, BaseListSchema
 from ..product.schemas import ProductShow
@@ -12,6 +12,19 @@ from ..product.enums import ProductTypeOfPlatbandEnum, ProductOrientationEnum
 from .enums import ItemMaterialEnum, OrderStatusEnum
 
 
+def items_to_list_schema(items):
+    """
+    Wraps loaded basket or order items into the list schema
+    shape, so the show schemes can be built from ORM objects.
+    """
+    if isinstance(items, list):
+        return {
+            "objects_count": sum(item.quantity for item in items),
+            "results": items,
+        }
+    return items
+
+
 class BasketItemShow(MainSchema):
     id: int
     product_id: int
@@ -53,13 +66,18 @@ BasketItemList = BaseListSchema[BasketItemShow]
 
 
 class BasketShow(MainSchema):
-    id: int
+    # guest baskets have no database row
+    id: Optional[int] = None
     user_id: Optional[uuid.UUID] = None
     basket_token: Optional[str] = None
     total_value: int
     total_items: int
     items: Optional[BasketItemList] = None
 
+    _items_to_list_schema = field_validator("items", mode="before")(
+        items_to_list_schema
+    )
+
 
 class BasketCreate(MainSchema):
     user_id: Optional[uuid.UUID] = None
@@ -72,7 +90,7 @@ class BasketUpdate(BasketCreate):
 
 class OrderItemShow(MainSchema):
     id: int
-    product_id: int
+    product_id: Optional[int] = None
     color_id: Optional[int] = None
     size_id: Optional[int] = None
     covering_id: Optional[int] = None
@@ -82,8 +100,11 @@ class OrderItemShow(MainSchema):
     orientation: Optional[ProductOrientationEnum] = None
     with_glass: Optional[bool] = None
     quantity: int
+    unit_price: int
+    product_name: Optional[str] = None
+    product_sku: Optional[str] = None
+    main_photo: Optional[str] = None
     total_price: int
-    product: ProductShow
 
 
 OrderItemList = BaseListSchema[OrderItemShow]
@@ -109,6 +130,10 @@ class OrderShow(MainSchema):
     created_at: datetime.datetime
     updated_at: datetime.datetime
 
+    _items_to_list_schema = field_validator("items", mode="before")(
+        items_to_list_schema
+    )
+
 
 class OrderItemCreate(MainSchema):
     product_id: int
@@ -4,20 +4,25 @@ import datetime
 
 from io import StringIO
 
+from redis.exceptions import RedisError
 from sqlalchemy.exc import SQLAlchemyError
 
 from typing import Optional
 
+from ..core.config import settings
 from ..core.dependencies import PaginationParams
+from ..core.db.purge import PurgeReport, purge_in_batches
 from ..core.db.service import BaseService
-from ..user.service import UserService
+from ..product.schemas import ProductShow
 from ..product.service import ProductService
+from ..user.service import UserService
 
 from ..utils.processors.filters.decoder import FiltersDecoder
 from ..utils.processors.filters.order import OrderFilterProcessor
 
 from ..utils.exceptions.http.user import (
     InvalidCredentialsException,
+    UserInactiveException,
     UserNotFoundByIdException,
 )
 from ..utils.exceptions.http.order import (
@@ -26,26 +31,27 @@ from ..utils.exceptions.http.order import (
     BasketItemUpdateException,
     BasketItemRemoveException,
     OrderCreateException,
+    OrderItemReferenceException,
     OrderUpdateException,
     OrderGetException,
     OrderDeleteException,
 )
 
-from .models import Basket, Order
 from .schemas import (
     BasketShow,
     BasketCreate,
-    BasketItemList,
     BasketItemShow,
+    BasketItemList,
     BasketItemCreate,
     BasketItemUpdate,
     OrderCreate,
+    OrderItemCreate,
     OrderShow,
-    OrderItemShow,
-    OrderItemList,
     OrderUpdate,
     OrderListSchema,
 )
+from .caching import GuestBasketStore
+from .dataclasses import ResolvedBasket
 from .enums import OrderStatusEnum
 from .utils import generate_basket_token
 
@@ -54,134 +60,279 @@ log = logging.getLogger(__name__)
 
 
 class BasketService(BaseService):
-    async def get_show_scheme(self, obj: Basket) -> BasketShow:
-        return BasketShow(
-            id=obj.id,
-            user_id=obj.user_id,
-            basket_token=obj.basket_token,
-            total_value=obj.total_value,
-            total_items=obj.total_items,
-            items=BasketItemList(
-                objects_count=obj.total_items,
-                results=[
-                    BasketItemShow(
-                        id=item.id,
-                        product_id=item.product_id,
-                        color_id=item.color_id,
-                        size_id=item.size_id,
-                        covering_id=item.covering_id,
-                        glass_color_id=item.glass_color_id,
-                        material=item.material,
-                        type_of_platband=item.type_of_platband,
-                        orientation=item.orientation,
-                        with_glass=item.with_glass,
-                        quantity=item.quantity,
-                        total_price=item.total_price,
-                        product=await ProductService(self.uow).get_show_scheme(
-                            item.product,
+    show_schema = BasketShow
+
+    def __init__(self, uow) -> None:
+        super().__init__(uow)
+        self.guest_store = GuestBasketStore()
+
+    async def resolve_basket(
+        self,
+        authorization: str | None = None,
+        basket_token: str | None = None,
+    ) -> ResolvedBasket:
+        """
+        Finds the basket of the request with at most one query: the
+        user joined with their basket, or the basket by its token.
+        Guest baskets kept in Redis need no query at all.
+        """
+        if not authorization and self.guest_store.enabled:
+            return ResolvedBasket(basket_token=basket_token)
+        try:
+            async with self.uow:
+                if not authorization:
+                    return ResolvedBasket(
+                        basket_id=(
+                            await self.uow.basket.get_id_by_token(basket_token)
+                            if basket_token
+                            else None
                         ),
+                        basket_token=basket_token,
                     )
-                    for item in obj.items
-                ],
-            ),
+                user_id = await UserService(self.uow)._user_id_from_jwt(
+                    authorization
+                )
+                if not user_id:
+                    raise InvalidCredentialsException()
+                ref = await self.uow.basket.get_user_basket_ref(user_id)
+        except SQLAlchemyError as e:
+            log.exception(e)
+            raise BasketGetException()
+        if not ref:
+            raise UserNotFoundByIdException()
+        if not ref.is_active:
+            raise UserInactiveException(email=ref.email)
+        return ResolvedBasket(
+            user_id=ref.user_id,
+            basket_id=ref.basket_id,
+            basket_token=ref.basket_token,
+            guest_token=basket_token,
         )
 
-    async def get_basket(
-        self,
-        authorization: str | None = None,
-        basket_token: str = None,
+    def _uses_guest_store(self, basket: ResolvedBasket) -> bool:
+        return basket.is_guest and self.guest_store.enabled
+
+    async def _add_db_items(
+        self, basket_id: int, items: list[BasketItemCreate]
+    ) -> None:
+        await self.uow.basket_item.upsert(
+            [
+                {
+                    **item.model_dump(),
+                    "basket_id": basket_id,
+                    "quantity": item.quantity or 1,
+                }
+                for item in items
+            ]
+        )
+
+    @staticmethod
+    def _guest_item_data(item_data: BasketItemCreate) -> dict:
+        data = item_data.model_dump(mode="json", exclude={"basket_id"})
+        data["quantity"] = item_data.quantity or 1
+        return data
+
+    async def _get_guest_items(self, basket_token: str) -> list[dict] | None:
+        """
+        Items of the guest basket, None when there is none. Guest
+        baskets created before Redis was used are moved there from
+        the database on first access.
+        """
+        items = await self.guest_store.get_items(basket_token)
+        if items is not None:
+            return items
+        basket = await self.uow.basket.get_by_token(token=basket_token)
+        if not basket or basket.user_id is not None:
+            return None
+        await self.guest_store.create(
+            basket_token,
+            [
+                self._guest_item_data(BasketItemCreate.model_validate(item))
+                for item in basket.items
+            ],
+        )
+        await self.uow.basket.delete_by_id(obj_id=basket.id)
+        await self.uow.commit()
+        return await self.guest_store.get_items(basket_token)
+
+    async def _get_db_items(self, basket_id: int) -> list[dict]:
+        return [
+            {
+                **BasketItemCreate.model_validate(item).model_dump(
+                    exclude={"basket_id"}
+                ),
+                "id": item.id,
+            }
+            for item in await self.uow.basket_item.get_by_basket_id(basket_id)
+        ]
+
+    async def _get_basket_show_scheme(
+        self, basket: ResolvedBasket, items: list[dict]
     ) -> BasketShow:
+        """
+        Renders the basket from its item rows and cached product
+        JSON, so the product graph is never loaded for it.
+        """
+        product_ids = list(dict.fromkeys(item["product_id"] for item in items))
+        products = {
+            product.id: product
+            for product in map(
+                ProductShow.model_validate_json,
+                await ProductService(self.uow).get_products_json(product_ids),
+            )
+        }
+        # products deleted since they were added are left out
+        items_show = [
+            BasketItemShow(
+                **item,
+                total_price=products[item["product_id"]].price
+                * item["quantity"],
+                product=products[item["product_id"]],
+            )
+            for item in items
+            if item["product_id"] in products
+        ]
+        total_items = sum(item.quantity for item in items_show)
+        return BasketShow(
+            id=basket.basket_id,
+            user_id=basket.user_id,
+            basket_token=basket.basket_token,
+            total_value=sum(item.total_price for item in items_show),
+            total_items=total_items,
+            items=BasketItemList(
+                objects_count=total_items,
+                results=items_show,
+            ),
+        )
+
+    async def _merge_guest_basket(self, basket_id: int, basket_token: str):
+        """
+        Moves the guest basket into the user basket in one
+        transaction. Redis items are taken atomically, so guest
+        writes after that start a new guest basket instead of being
+        lost, and upserted with one INSERT ... ON CONFLICT. A guest
+        basket row is moved with one INSERT ... SELECT ... ON
+        CONFLICT, after which the row is deleted. The taken items
+        are put back when the transaction fails.
+        """
+        items = (
+            await self.guest_store.take(basket_token)
+            if self.guest_store.enabled
+            else None
+        )
+        try:
+            if items:
+                await self._add_db_items(
+                    basket_id,
+                    [BasketItemCreate.model_validate(item) for item in items],
+                )
+            guest_basket_id = await self.uow.basket.get_guest_id_by_token(
+                basket_token
+            )
+            if guest_basket_id and guest_basket_id != basket_id:
+                await self.uow.basket_item.move_to_basket(
+                    guest_basket_id, basket_id
+                )
+                await self.uow.basket.delete_by_id(obj_id=guest_basket_id)
+            await self.uow.commit()
+        except BaseException:
+            if items:
+                await self.guest_store.restore(basket_token, items)
+            raise
+
+    async def _ensure_basket(self, basket: ResolvedBasket) -> None:
+        """Creates the database basket when the user has none yet."""
+        if basket.basket_id is None:
+            basket.basket_token = generate_basket_token()
+            basket.basket_id = await self.uow.basket.create(
+                obj_in=BasketCreate(
+                    user_id=basket.user_id,
+                    basket_token=basket.basket_token,
+                )
+            )
+            await self.uow.commit()
+
+    async def merge_basket(self, basket: ResolvedBasket) -> BasketShow:
+        """Merges the guest basket of the token into the user basket."""
+        if basket.is_guest:
+            raise InvalidCredentialsException()
+        if not basket.guest_token:
+            raise BasketGetException()
         try:
             async with self.uow:
-                basket = None
-                if authorization:
-                    user_id = await UserService(self.uow)._user_id_from_jwt(
-                        authorization
+                await self._ensure_basket(basket)
+                await self._merge_guest_basket(
+                    basket.basket_id, basket.guest_token
+                )
+                return await self._get_basket_show_scheme(
+                    basket, await self._get_db_items(basket.basket_id)
+                )
+        except (SQLAlchemyError, RedisError) as e:
+            log.exception(e)
+            raise BasketGetException()
+
+    async def get_basket(self, basket: ResolvedBasket) -> BasketShow:
+        try:
+            async with self.uow:
+                if self._uses_guest_store(basket):
+                    items = (
+                        await self._get_guest_items(basket.basket_token)
+                        if basket.basket_token
+                        else None
                     )
-                    if not user_id:
-                        raise InvalidCredentialsException()
-                    user = await self.uow.user.get_by_id(obj_id=user_id)
-                    if not user:
-                        raise UserNotFoundByIdException()
-                    basket = await self.uow.basket.get_by_user_id(user.id)
-                    if not basket:
-                        basket_id = await self.uow.basket.create(
-                            obj_in=BasketCreate(
-                                user_id=user.id,
-                                basket_token=generate_basket_token(),
-                            )
-                        )
-                else:
-                    if basket_token:
-                        basket = await self.uow.basket.get_by_token(
-                            token=basket_token
-                        )
-                    else:
-                        basket_id = await self.uow.basket.create(
-                            obj_in=BasketCreate(
-                                basket_token=generate_basket_token(),
-                            )
+                    if items is None:
+                        basket = ResolvedBasket(
+                            basket_token=generate_basket_token()
                         )
-                await self.uow.commit()
-                if not basket:
-                    basket = await self.uow.basket.get_by_id(obj_id=basket_id)
-                return await self.get_show_scheme(basket)
-        except SQLAlchemyError as e:
+                        await self.guest_store.create(basket.basket_token)
+                        items = []
+                    return await self._get_basket_show_scheme(basket, items)
+                await self._ensure_basket(basket)
+                if basket.guest_token:
+                    await self._merge_guest_basket(
+                        basket.basket_id, basket.guest_token
+                    )
+                return await self._get_basket_show_scheme(
+                    basket, await self._get_db_items(basket.basket_id)
+                )
+        except (SQLAlchemyError, RedisError) as e:
             log.exception(e)
             raise BasketGetException()
 
     async def add_item(
         self,
         item_data: BasketItemCreate,
-        authorization: str | None = None,
-        basket_token: str | None = None,
+        basket: ResolvedBasket,
     ) -> BasketShow:
         try:
             async with self.uow:
-                if authorization:
-                    user_id = await UserService(self.uow)._user_id_from_jwt(
-                        authorization
-                    )
-                    if not user_id:
-                        raise InvalidCredentialsException()
-                    user = await self.uow.user.get_by_id(obj_id=user_id)
-                    if not user:
-                        raise UserNotFoundByIdException()
-                    basket = await self.uow.basket.get_by_user_id(user.id)
-                else:
-                    basket = await self.uow.basket.get_by_token(
-                        token=basket_token
-                    )
-                if not basket:
-                    raise BasketGetException()
-                item_data.basket_id = basket.id
-                product = await self.uow.product.get_by_id(
+                if not await self.uow.product.exists_by_id(
                     obj_id=item_data.product_id
-                )
-                if not product:
+                ):
                     raise BasketItemAddException(
                         product_id=item_data.product_id
                     )
-                if await self.uow.basket_item.exists_by_attrs(
-                    attrs={
-                        self.uow.basket_item.model.product_id: item_data.product_id,
-                        self.uow.basket_item.model.basket_id: basket.id,
-                    }
-                ):
-                    basket_item = await self.uow.basket_item.get_by_attrs(
-                        {
-                            self.uow.basket_item.model.product_id: item_data.product_id,
-                            self.uow.basket_item.model.basket_id: basket.id,
-                        }
+                if self._uses_guest_store(basket):
+                    if (
+                        not basket.basket_token
+                        or await self._get_guest_items(basket.basket_token)
+                        is None
+                    ):
+                        raise BasketGetException()
+                    items = await self.guest_store.add_item(
+                        basket.basket_token, self._guest_item_data(item_data)
                     )
-                    basket_item.quantity += (
-                        item_data.quantity if item_data.quantity else 1
-                    )
-                else:
-                    await self.uow.basket_item.create(obj_in=item_data)
+                    if items is None:
+                        raise BasketGetException()
+                    return await self._get_basket_show_scheme(basket, items)
+                if basket.basket_id is None:
+                    raise BasketGetException()
+                await self._add_db_items(basket.basket_id, [item_data])
                 await self.uow.commit()
-                return await self.get_show_scheme(basket)
-        except SQLAlchemyError as e:
+                return await self._get_basket_show_scheme(
+                    basket, await self._get_db_items(basket.basket_id)
+                )
+        except (SQLAlchemyError, RedisError) as e:
             log.exception(e)
             raise BasketItemAddException(product_id=item_data.product_id)
 
@@ -189,144 +340,181 @@ class BasketService(BaseService):
         self,
         item_data: BasketItemUpdate,
         item_id: int,
-        authorization: str | None = None,
-        basket_token: str | None = None,
-    ):
+        basket: ResolvedBasket,
+    ) -> BasketShow:
         try:
             async with self.uow:
-                if authorization:
-                    user_id = await UserService(self.uow)._user_id_from_jwt(
-                        authorization
-                    )
-                    if not user_id:
-                        raise InvalidCredentialsException()
-                    user = await self.uow.user.get_by_id(obj_id=user_id)
-                    if not user:
-                        raise UserNotFoundByIdException()
-                    basket = await self.uow.basket.get_by_user_id(user.id)
-                else:
-                    basket = await self.uow.basket.get_by_token(
-                        token=basket_token
-                    )
-                if not basket:
+                if self._uses_guest_store(basket):
+                    if (
+                        not basket.basket_token
+                        or await self._get_guest_items(basket.basket_token)
+                        is None
+                    ):
+                        raise BasketGetException()
+                    try:
+                        items = await self.guest_store.update_item(
+                            basket.basket_token,
+                            item_id,
+                            item_data.model_dump(
+                                mode="json",
+                                exclude={"basket_id"},
+                                exclude_none=True,
+                            ),
+                        )
+                    except KeyError:
+                        raise BasketItemUpdateException(item_id=item_id)
+                    if items is None:
+                        raise BasketGetException()
+                    return await self._get_basket_show_scheme(basket, items)
+                if basket.basket_id is None:
                     raise BasketGetException()
                 item = await self.uow.basket_item.get_by_id(obj_id=item_id)
-                if not item:
+                if not item or item.basket_id != basket.basket_id:
                     raise BasketItemUpdateException(item_id=item_id)
                 await self.uow.basket_item.update(
                     obj_in=item_data, obj_id=item.id
                 )
                 await self.uow.commit()
-                return await self.get_show_scheme(basket)
-        except SQLAlchemyError as e:
+                return await self._get_basket_show_scheme(
+                    basket, await self._get_db_items(basket.basket_id)
+                )
+        except (SQLAlchemyError, RedisError) as e:
             log.exception(e)
-            raise BasketItemUpdateException(item_id=item_data.product_id)
+            raise BasketItemUpdateException(item_id=item_id)
 
     async def remove_item(
         self,
         item_id: int,
-    ):
+        basket: ResolvedBasket,
+    ) -> bool:
         try:
             async with self.uow:
+                if self._uses_guest_store(basket):
+                    if (
+                        not basket.basket_token
+                        or await self._get_guest_items(basket.basket_token)
+                        is None
+                    ):
+                        raise BasketGetException()
+                    try:
+                        await self.guest_store.remove_item(
+                            basket.basket_token, item_id
+                        )
+                    except KeyError:
+                        raise BasketItemRemoveException(item_id=item_id)
+                    return True
                 item = await self.uow.basket_item.get_by_id(obj_id=item_id)
-                if not item:
+                if not item or item.basket_id != basket.basket_id:
                     raise BasketItemRemoveException(item_id=item_id)
                 await self.uow.basket_item.delete_by_id(obj_id=item_id)
                 await self.uow.commit()
                 return True
-        except SQLAlchemyError as e:
+        except (SQLAlchemyError, RedisError) as e:
             log.exception(e)
             raise BasketItemRemoveException(item_id=item_id)
 
+    async def purge_stale_guest_baskets(self) -> PurgeReport:
+        """
+        Deletes inactive guest baskets from the database. Guest baskets
+        kept in Redis expire on their own, these are the legacy rows
+        and the ones created while Redis is off.
+        """
+        inactive_for = datetime.timedelta(
+            days=settings.purge.guest_basket_inactive_days
+        )
+        return await purge_in_batches(
+            self.uow,
+            "basket",
+            lambda limit: self.uow.basket.delete_stale_guests(
+                inactive_for, limit
+            ),
+        )
+
 
 class OrderService(BaseService):
     filter_processor = OrderFilterProcessor
     list_schema = OrderListSchema
-
-    async def get_show_scheme(self, obj: Order) -> OrderShow:
-        return OrderShow(
-            id=obj.id,
-            user_id=obj.user_id,
-            full_name=obj.full_name,
-            phone=obj.phone,
-            email=obj.email,
-            region=obj.region,
-            city_or_settlement=obj.city_or_settlement,
-            warehouse=obj.warehouse,
-            pickup=obj.pickup,
-            delivery_address=obj.delivery_address,
-            items=OrderItemList(
-                objects_count=obj.total_items,
-                results=[
-                    OrderItemShow(
-                        id=item.id,
-                        product_id=item.product_id,
-                        color_id=item.color_id,
-                        size_id=item.size_id,
-                        covering_id=item.covering_id,
-                        glass_color_id=item.glass_color_id,
-                        material=item.material,
-                        type_of_platband=item.type_of_platband,
-                        orientation=item.orientation,
-                        with_glass=item.with_glass,
-                        quantity=item.quantity,
-                        total_price=item.total_price,
-                        product=await ProductService(self.uow).get_show_scheme(
-                            item.product,
-                        ),
-                    )
-                    for item in obj.items
-                ],
-            ),
-            created_at=obj.created_at,
-            updated_at=obj.updated_at,
-            total_items=obj.total_items,
-            total_value=obj.total_value,
-            additional_info=obj.additional_info,
-            status=obj.status,
-            status_date_to=obj.status_date_to,
+    show_schema = OrderShow
+
+    # item fields referencing product option tables, by uow repository
+    item_references = {
+        "color_id": "product_color",
+        "size_id": "product_size",
+        "covering_id": "product_covering",
+        "glass_color_id": "product_glass_color",
+    }
+
+    async def _validate_items(
+        self, items: list[OrderItemCreate]
+    ) -> dict[int, dict]:
+        """
+        Checks the ids the items reference with one query per table,
+        before anything is flushed. Returns the product snapshots,
+        the order items take their prices from.
+        """
+        product_ids = {item.product_id for item in items}
+        snapshots = (
+            await self.uow.product.get_order_snapshots(product_ids)
+            if product_ids
+            else {}
         )
+        if missing := product_ids - snapshots.keys():
+            raise OrderItemReferenceException("product_id", sorted(missing))
+        for field, repo_name in self.item_references.items():
+            ids = {
+                getattr(item, field)
+                for item in items
+                if getattr(item, field) is not None
+            }
+            if not ids:
+                continue
+            repo = getattr(self.uow, repo_name)
+            if missing := ids - await repo.get_existing_ids(ids):
+                raise OrderItemReferenceException(field, sorted(missing))
+        return snapshots
 
     async def create_order(
         self,
         data: OrderCreate,
-        authorization: str | None = None,
-        basket_token: str | None = None,
+        basket: ResolvedBasket,
     ):
+        basket_service = BasketService(self.uow)
+        guest_basket = basket_service._uses_guest_store(basket)
         try:
             async with self.uow:
+                items = data.items or []
+                snapshots = await self._validate_items(items)
                 order = await self.uow.order.create(obj_in=data)
-                if authorization:
-                    user_id = await UserService(self.uow)._user_id_from_jwt(
-                        authorization
-                    )
-                    if not user_id:
-                        raise InvalidCredentialsException()
-                    user = await self.uow.user.get_by_id(obj_id=user_id)
-                    if not user:
-                        raise UserNotFoundByIdException()
-                    order.user_id = user.id
-                    basket = await self.uow.basket.get_by_user_id(user.id)
+                order.user_id = basket.user_id
+                if guest_basket:
+                    # the guest basket is dropped once the order is saved
+                    if (
+                        not basket.basket_token
+                        or await basket_service._get_guest_items(
+                            basket.basket_token
+                        )
+                        is None
+                    ):
+                        raise BasketGetException()
+                elif basket.basket_id is None:
+                    raise BasketGetException()
                 else:
-                    basket = await self.uow.basket.get_by_token(
-                        token=basket_token
+                    await self.uow.basket_item.delete_by_basket_id(
+                        basket.basket_id
                     )
-                if not basket:
-                    raise BasketGetException()
-                basket.clear()
-                await self.uow.add_all([order, basket])
+                await self.uow.add(order)
                 await self.uow.flush()
-
-                for item_data in data.items:
-                    order_item = await self.uow.order_item.create(
-                        obj_in=item_data,
-                        order_id=order.id,
-                    )
-                    await self.uow.add(order_item)
+                await self.uow.order_item.bulk_create(
+                    items, order_id=order.id, product_snapshots=snapshots
+                )
                 await self.uow.commit()
+                if guest_basket:
+                    await basket_service.guest_store.delete(
+                        basket.basket_token
+                    )
                 order = await self.uow.order.get_by_id(obj_id=order.id)
                 return await self.get_show_scheme(order)
-        except SQLAlchemyError as e:
+        except (SQLAlchemyError, RedisError) as e:
             log.exception(e)
             raise OrderCreateException()
 
@@ -375,6 +563,7 @@ class OrderService(BaseService):
         self,
         pagination: Optional[PaginationParams] = None,
         filters_decoder: Optional[FiltersDecoder] = None,
+        sort: Optional[str] = None,
     ) -> OrderListSchema | list[OrderShow]:
         try:
             async with self.uow:
@@ -383,6 +572,7 @@ class OrderService(BaseService):
                     options=await self.uow.order._add_default_options(),
                     pagination_params=pagination,
                     filters_decoder=filters_decoder,
+                    sort=sort,
                 )
         except SQLAlchemyError as e:
             log.exception(e)
@@ -393,6 +583,7 @@ class OrderService(BaseService):
         authorization: str,
         pagination: Optional[PaginationParams] = None,
         filters_decoder: Optional[FiltersDecoder] = None,
+        sort: Optional[str] = None,
     ) -> OrderListSchema | list[OrderShow]:
         try:
             async with self.uow:
@@ -411,6 +602,7 @@ class OrderService(BaseService):
                         pagination_params=pagination,
                         filters_decoder=filters_decoder,
                         filters=[self.uow.order.model.user_id == user.id],
+                        sort=sort,
                     )
                 else:
                     raise InvalidCredentialsException()
@@ -483,21 +675,16 @@ class OrderService(BaseService):
                         "Колір скла",
                         "Покриття",
                         "Розмір",
-                        "URL фотографій",
+                        "URL фотографії",
                     ]
                 )
                 writer.writerow(headers)
 
                 for item in order.items:
-                    product = item.product
-
-                    photos = [photo.photo for photo in product.photos]
-                    photo_urls = ", ".join(photos)
-
                     row = [
-                        product.name,
-                        product.sku,
-                        product.price,
+                        item.product_name,
+                        item.product_sku,
+                        item.unit_price,
                         item.quantity,
                         item.total_price,
                     ]
@@ -528,7 +715,7 @@ class OrderService(BaseService):
                             ),
                             item.covering.name if item.covering else "Н/Д",
                             item.size.dimensions if item.size else "Н/Д",
-                            photo_urls,
+                            item.main_photo or "",
                         ]
                     )
                     writer.writerow(row)
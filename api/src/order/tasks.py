@@ -1,10 +1,12 @@
 import asyncio
 import logging
 
+from dataclasses import asdict
+
 from ..core.celery import app as celery_app
 from ..core.db.unitofwork import UnitOfWork
 
-from .service import OrderService
+from .service import BasketService, OrderService
 
 
 log = logging.getLogger(__name__)
@@ -18,3 +20,14 @@ def update_order_status_by_status_date_to():
         )
     except Exception as e:
         log.exception(e)
+
+
+@celery_app.task(name="purge_stale_guest_baskets")
+def purge_stale_guest_baskets():
+    try:
+        report = asyncio.run(
+            BasketService(UnitOfWork()).purge_stale_guest_baskets(),
+        )
+        return asdict(report)
+    except Exception as e:
+        log.exception(e)
@@ -0,0 +1,87 @@
+import logging
+
+from typing import Iterable, Sequence
+
+from pydantic_core import to_json
+from redis.exceptions import RedisError
+
+from ..core.caching import RedisCaching
+from ..core.config import settings
+
+from .schemas import ProductShow
+
+
+log = logging.getLogger(__name__)
+
+
+class ProductJSONCache:
+    """
+    Serialized ProductShow JSON per product, kept in Redis.
+
+    Entries are rewritten by the product and photo write paths,
+    the expire only bounds staleness after writes made outside
+    of the services (catalog import, manual SQL). Redis errors
+    are logged and treated as cache misses.
+    """
+
+    key_prefix = "product:json"
+
+    def __init__(self) -> None:
+        self.enabled = settings.cache.use_redis
+        self.expire = settings.cache.product_json_expire
+        self.redis = RedisCaching().redis if self.enabled else None
+
+    @classmethod
+    def get_key(cls, product_id: int) -> str:
+        return f"{cls.key_prefix}:{product_id}"
+
+    @staticmethod
+    def render(product: ProductShow) -> bytes:
+        return to_json(product)
+
+    async def get_many(self, product_ids: Sequence[int]) -> list[bytes | None]:
+        if not self.enabled or not product_ids:
+            return [None] * len(product_ids)
+        try:
+            return await self.redis.mget(
+                [self.get_key(product_id) for product_id in product_ids]
+            )
+        except RedisError as e:
+            log.warning("Product JSON cache read failed: %s", e)
+            return [None] * len(product_ids)
+
+    async def set_many(self, blobs: dict[int, bytes]) -> None:
+        if not self.enabled or not blobs:
+            return
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for product_id, blob in blobs.items():
+                    pipe.set(self.get_key(product_id), blob, ex=self.expire)
+                await pipe.execute()
+        except RedisError as e:
+            log.warning("Product JSON cache write failed: %s", e)
+
+    async def delete(self, product_ids: Iterable[int]) -> None:
+        keys = [self.get_key(product_id) for product_id in product_ids]
+        if not self.enabled or not keys:
+            return
+        try:
+            await self.redis.unlink(*keys)
+        except RedisError as e:
+            log.warning("Product JSON cache delete failed: %s", e)
+
+    async def clear(self) -> None:
+        """Drops every product entry, used when shared references change."""
+        if not self.enabled:
+            return
+        try:
+            keys = [
+                key
+                async for key in self.redis.scan_iter(
+                    match=f"{self.key_prefix}:*", count=500
+                )
+            ]
+            if keys:
+                await self.redis.unlink(*keys)
+        except RedisError as e:
+            log.warning("Product JSON cache clear failed: %s", e)
@@ -34,3 +34,15 @@ class ProductRelModelEnum(BaseEnum):
 
     def get_name(self):
         return self._name_mapping[self.value]
+
+
+class ProductExportFormatEnum(BaseEnum):
+    CSV = "csv"
+    JSONL = "jsonl"
+
+    @property
+    def media_type(self) -> str:
+        return {
+            self.CSV: "text/csv",
+            self.JSONL: "application/x-ndjson",
+        }[self]
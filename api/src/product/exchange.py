@@ -0,0 +1,109 @@
+import csv
+import io
+import json
+
+from typing import Any, Iterable, Iterator, TextIO
+
+from pydantic_core import to_json
+
+from .enums import ProductExportFormatEnum
+
+
+# Columns of an exported row, in CSV header order. The category name
+# and photo links are exported for reference and ignored on import.
+EXPORT_COLUMNS = (
+    "id",
+    "sku",
+    "name",
+    "price",
+    "category_id",
+    "category",
+    "covering_id",
+    "have_glass",
+    "material_choice",
+    "type_of_platband_choice",
+    "orientation_choice",
+    "active",
+    "description",
+    "photos",
+)
+IMPORT_COLUMNS = frozenset(EXPORT_COLUMNS) - {"category", "photos"}
+JSON_COLUMNS = ("description", "photos")
+
+
+def encode_rows(
+    rows: Iterable[dict], export_format: ProductExportFormatEnum
+) -> bytes:
+    """Encodes exported rows, one JSON object or CSV line each."""
+    if export_format == ProductExportFormatEnum.JSONL:
+        return b"".join(to_json(row) + b"\n" for row in rows)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow(
+            [
+                to_json(row[column]).decode()
+                if column in JSON_COLUMNS and row[column] is not None
+                else row[column]
+                for column in EXPORT_COLUMNS
+            ]
+        )
+    return buffer.getvalue().encode()
+
+
+def encode_header(export_format: ProductExportFormatEnum) -> bytes:
+    if export_format == ProductExportFormatEnum.JSONL:
+        return b""
+    return (",".join(EXPORT_COLUMNS) + "\r\n").encode()
+
+
+def _parse_csv_row(row: dict) -> dict:
+    data = {}
+    for column, value in row.items():
+        if column not in IMPORT_COLUMNS or value is None:
+            continue
+        value = value.strip()
+        if value == "":
+            # an empty cell leaves the field unchanged
+            continue
+        if column in JSON_COLUMNS:
+            value = json.loads(value)
+        data[column] = value
+    return data
+
+
+def read_rows(
+    file: TextIO, import_format: ProductExportFormatEnum
+) -> Iterator[tuple[int, dict[str, Any] | None, str | None]]:
+    """
+    Yields (line number, row data, error) for every row of the file.
+    Rows that can not be parsed are yielded with an error, so one bad
+    line does not stop the import.
+    """
+    if import_format == ProductExportFormatEnum.JSONL:
+        for line_number, line in enumerate(file, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as e:
+                yield line_number, None, f"Invalid JSON: {e}"
+                continue
+            if not isinstance(row, dict):
+                yield line_number, None, "Row must be a JSON object"
+                continue
+            yield line_number, {
+                column: value
+                for column, value in row.items()
+                if column in IMPORT_COLUMNS and value is not None
+            }, None
+        return
+
+    reader = csv.DictReader(file)
+    for row in reader:
+        # header is line 1
+        line_number = reader.line_num
+        try:
+            yield line_number, _parse_csv_row(row), None
+        except ValueError as e:
+            yield line_number, None, f"Invalid JSON in description: {e}"
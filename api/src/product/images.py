@@ -0,0 +1,152 @@
+import base64
+import io
+import logging
+import os
+
+from PIL import Image, ImageOps, features
+
+from ..core.config import settings
+from ..utils.processors.static.base import get_static_relative_path
+
+
+log = logging.getLogger(__name__)
+
+
+PLACEHOLDER_SIZE = 16
+
+VARIANT_SAVE_OPTIONS = {
+    "webp": {"quality": 80, "method": 4},
+    "avif": {"quality": 60, "speed": 6},
+}
+
+
+def get_variant_formats() -> list[str]:
+    """Variant formats the installed Pillow can encode."""
+    return [
+        variant_format
+        for variant_format in VARIANT_SAVE_OPTIONS
+        if features.check(variant_format)
+    ]
+
+
+def get_static_path(link: str) -> str | None:
+    """Maps a static file link to its path on disk."""
+    relative_path = get_static_relative_path(link)
+    if relative_path is None:
+        return None
+    return os.path.join(settings.static.directory, relative_path)
+
+
+def _save_variant(image, path: str, variant_format: str) -> None:
+    # uploads are served as immutable, a variant appears under its
+    # final name only once fully written; dot-files are skipped by
+    # the manifest and the GC
+    directory, filename = os.path.split(path)
+    temp_path = os.path.join(directory, f".{filename}.{os.getpid()}.tmp")
+    try:
+        image.save(
+            temp_path,
+            variant_format.upper(),
+            **VARIANT_SAVE_OPTIONS[variant_format],
+        )
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def build_photo_variants(link: str) -> list[dict]:
+    """
+    Writes resized copies of the photo next to the original, one
+    per configured width narrower than the photo and per format.
+    Returns the variants as stored in ProductPhoto.variants, none
+    when the photo can not be decoded.
+    Blocking, meant to run in a worker thread or process.
+    """
+    variant_formats = get_variant_formats()
+    path = get_static_path(link)
+    if path is None or not os.path.isfile(path):
+        log.warning("Photo file for %s not found, variants are skipped", link)
+        return []
+
+    directory, filename = os.path.split(path)
+    stem = os.path.splitext(filename)[0]
+    link_prefix = link.rsplit("/", 1)[0]
+    variants = []
+    try:
+        with Image.open(path) as image:
+            image = ImageOps.exif_transpose(image)
+            if image.mode not in ("RGB", "RGBA"):
+                image = image.convert(
+                    "RGBA" if "A" in image.getbands() else "RGB"
+                )
+            for width in settings.static.variant_widths:
+                if width >= image.width:
+                    break
+                height = round(image.height * width / image.width)
+                resized = image.resize(
+                    (width, height), Image.Resampling.LANCZOS
+                )
+                for variant_format in variant_formats:
+                    variant_name = f"{stem}-{width}w.{variant_format}"
+                    _save_variant(
+                        resized,
+                        os.path.join(directory, variant_name),
+                        variant_format,
+                    )
+                    variants.append(
+                        {
+                            "url": f"{link_prefix}/{variant_name}",
+                            "width": width,
+                            "height": height,
+                            "format": variant_format,
+                        }
+                    )
+    except (OSError, ValueError, Image.DecompressionBombError) as e:
+        # the variants already written are left to the static GC
+        log.warning("Variants of %s not built: %s", link, e)
+        return []
+    return variants
+
+
+def placeholders_supported() -> bool:
+    """Placeholders are WebP, which Pillow may be built without."""
+    return features.check("webp")
+
+
+def build_placeholder(path: str) -> str | None:
+    """
+    Tiny WebP preview of the image, at most PLACEHOLDER_SIZE px a
+    side, as a data URI for clients to show blurred until the photo
+    loads. Blocking, meant to run in a worker thread or process.
+    """
+    if not placeholders_supported():
+        return None
+    try:
+        with Image.open(path) as image:
+            # JPEG is decoded at a reduced scale, much faster
+            image.draft("RGB", (PLACEHOLDER_SIZE * 8, PLACEHOLDER_SIZE * 8))
+            image = ImageOps.exif_transpose(image)
+            if image.mode not in ("RGB", "RGBA"):
+                image = image.convert(
+                    "RGBA" if "A" in image.getbands() else "RGB"
+                )
+            image.thumbnail(
+                (PLACEHOLDER_SIZE, PLACEHOLDER_SIZE), Image.Resampling.BOX
+            )
+            buffer = io.BytesIO()
+            image.save(buffer, "WEBP", quality=40)
+    except (OSError, ValueError, Image.DecompressionBombError) as e:
+        log.warning("Placeholder for %s not built: %s", path, e)
+        return None
+    return "data:image/webp;base64," + base64.b64encode(
+        buffer.getvalue()
+    ).decode()
+
+
+def build_photo_placeholder(link: str) -> str | None:
+    path = get_static_path(link)
+    if path is None or not os.path.isfile(path):
+        return None
+    return build_placeholder(path)
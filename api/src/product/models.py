@@ -1,6 +1,6 @@
 from enum import Enum as PyEnum
 
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, Index, String, Text, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.dialects.postgresql import ENUM, JSONB
@@ -116,6 +116,34 @@ class ProductGlassColor(BaseProductRelMixin, Base):
 
 class Product(BaseModelMixin, Base):
     __label__ = "Product"
+    __table_args__ = (
+        # lists show active products only, unless filtered by active
+        Index(
+            "ix_product_category_id_price_id",
+            "category_id",
+            "price",
+            "id",
+            postgresql_where=text("active"),
+        ),
+        Index(
+            "ix_product_price_id",
+            "price",
+            "id",
+            postgresql_where=text("active"),
+        ),
+        Index(
+            "ix_product_created_at_id",
+            "created_at",
+            "id",
+            postgresql_where=text("active"),
+        ),
+        Index(
+            "ix_product_name_id",
+            "name",
+            "id",
+            postgresql_where=text("active"),
+        ),
+    )
 
     name: Mapped[str] = mapped_column(nullable=True, index=True, doc="Name")
     sku: Mapped[str] = mapped_column(nullable=True, index=True, doc="SKU")
@@ -144,6 +172,12 @@ class Product(BaseModelMixin, Base):
         default=False,
         doc="Is orientation choice available",
     )
+    active: Mapped[bool] = mapped_column(
+        nullable=False,
+        default=True,
+        server_default="true",
+        doc="Is product shown in lists",
+    )
 
     category_id: Mapped[int] = mapped_column(
         ForeignKey(
@@ -260,6 +294,62 @@ class ProductPhoto(BaseModelMixin, Base):
         index=True,
         doc="Size ID",
     )
+    variants: Mapped[list] = mapped_column(
+        JSONB,
+        nullable=True,
+        doc="Resized variants: url, width, height and format of each",
+    )
+    placeholder: Mapped[str] = mapped_column(
+        Text,
+        nullable=True,
+        doc="Tiny WebP preview as a data URI",
+    )
 
     def __str__(self) -> str:
         return f"Photo: {self.photo}"
+
+
+class CatalogImportFolder(BaseModelMixin, Base):
+    __tablename__ = "catalog_import_folder"
+    __label__ = "Catalog import folder"
+
+    folder: Mapped[str] = mapped_column(
+        unique=True,
+        nullable=False,
+        doc="Product folder path inside the catalog directory",
+    )
+    checksum: Mapped[str] = mapped_column(
+        String(64),
+        nullable=False,
+        doc="SHA-256 of the description and photo list",
+    )
+    description_checksum: Mapped[str] = mapped_column(
+        String(64),
+        nullable=True,
+        doc="SHA-256 of the description file",
+    )
+    photos: Mapped[list] = mapped_column(
+        JSONB,
+        nullable=False,
+        default=list,
+        doc="Imported photo links",
+    )
+    deactivated: Mapped[bool] = mapped_column(
+        nullable=False,
+        default=False,
+        server_default="false",
+        doc="Product deactivated by the import, the folder is missing",
+    )
+    product_id: Mapped[int] = mapped_column(
+        ForeignKey(
+            "product.id",
+            ondelete="CASCADE",
+            onupdate="CASCADE",
+        ),
+        nullable=False,
+        index=True,
+        doc="Product ID",
+    )
+
+    def __str__(self) -> str:
+        return f"Catalog import folder: {self.folder}"
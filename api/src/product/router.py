@@ -1,7 +1,9 @@
-from fastapi import APIRouter, status, Request
+from fastapi import APIRouter, status, Request, UploadFile
+from fastapi.responses import StreamingResponse
 
 from ..core.db.dependencies import uowDEP
-from ..core.dependencies import pagination_params
+from ..core.dependencies import pagination_params, sort_params
+from ..core.responses import RawJSONResponse
 
 from .service import (
     ProductService,
@@ -28,8 +30,9 @@ from .schemas import (
     ProductRelUpdate,
     ProductRelShow,
     ProductRelListSchema,
+    ProductImportReport,
 )
-from .enums import ProductRelModelEnum
+from .enums import ProductRelModelEnum, ProductExportFormatEnum
 
 from ..utils.processors.filters.dependencies import filters_decoder
 
@@ -326,34 +329,81 @@ async def product_delete(
 @router.get(
     "/list/",
     status_code=status.HTTP_200_OK,
+    response_model=ProductListSchema | list[ProductShow],
     tags=["Product"],
 )
 async def get_all_products(
     uow: uowDEP,
     pagination: pagination_params,
+    sort: sort_params,
     filters_decoder: filters_decoder = None,
-) -> ProductListSchema | list[ProductShow]:
-    return await ProductService(uow).get_product_list(
-        pagination=pagination,
-        filters_decoder=filters_decoder,
+) -> RawJSONResponse:
+    return RawJSONResponse(
+        await ProductService(uow).get_product_list(
+            pagination=pagination,
+            filters_decoder=filters_decoder,
+            sort=sort.sort,
+        )
     )
 
 
 @router.get(
     "/list/category/{category_id}/",
     status_code=status.HTTP_200_OK,
+    response_model=ProductListSchema | list[ProductShow],
     tags=["Product"],
 )
 async def get_all_products_by_category(
     uow: uowDEP,
     category_id: int,
     pagination: pagination_params,
+    sort: sort_params,
     filters_decoder: filters_decoder = None,
-) -> ProductListSchema | list[ProductShow]:
-    return await ProductService(uow).get_products_by_category(
-        category_id=category_id,
-        pagination=pagination,
-        filters_decoder=filters_decoder,
+) -> RawJSONResponse:
+    return RawJSONResponse(
+        await ProductService(uow).get_products_by_category(
+            category_id=category_id,
+            pagination=pagination,
+            filters_decoder=filters_decoder,
+            sort=sort.sort,
+        )
+    )
+
+
+@router.get(
+    "/export/",
+    status_code=status.HTTP_200_OK,
+    tags=["Product"],
+)
+async def export_products(
+    uow: uowDEP,
+    export_format: ProductExportFormatEnum = ProductExportFormatEnum.CSV,
+) -> StreamingResponse:
+    return StreamingResponse(
+        ProductService(uow).export_products(export_format=export_format),
+        media_type=export_format.media_type,
+        headers={
+            "Content-Disposition": (
+                f'attachment; filename="products.{export_format.value}"'
+            )
+        },
+    )
+
+
+@router.post(
+    "/import/",
+    status_code=status.HTTP_200_OK,
+    response_model=ProductImportReport,
+    tags=["Product"],
+)
+async def import_products(
+    uow: uowDEP,
+    file: UploadFile,
+    import_format: ProductExportFormatEnum = ProductExportFormatEnum.CSV,
+) -> ProductImportReport:
+    return await ProductService(uow).import_products(
+        file=file,
+        import_format=import_format,
     )
 
 
@@ -366,9 +416,11 @@ async def get_all_products_by_category(
 async def get_product(
     uow: uowDEP,
     product_id: int,
-) -> ProductShow:
-    return await ProductService(uow).get_product_obj(
-        product_id=product_id,
+) -> RawJSONResponse:
+    return RawJSONResponse(
+        await ProductService(uow).get_product_obj(
+            product_id=product_id,
+        )
     )
 
 
@@ -1,6 +1,6 @@
 from typing import Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, computed_field, field_validator
 
 from ..core.schemas import MainSchema, BaseListSchema
 from .enums import (
@@ -48,6 +48,7 @@ class ProductPhotoCreate(BaseModel):
     color_id: Optional[int] = None
     size_id: Optional[int] = None
     glass_color_id: Optional[int] = None
+    placeholder: Optional[str] = None
 
 
 class ProductPhotoUpdate(BaseModel):
@@ -61,6 +62,13 @@ class ProductPhotoUpdate(BaseModel):
     glass_color_id: Optional[int] = None
 
 
+class ProductPhotoVariant(BaseModel):
+    url: str
+    width: int
+    height: int
+    format: str
+
+
 class ProductPhotoShow(MainSchema):
     id: int
     product_id: int
@@ -72,6 +80,20 @@ class ProductPhotoShow(MainSchema):
     type_of_platband: Optional[ProductTypeOfPlatbandEnum] = None
     color_id: Optional[int] = None
     size_id: Optional[int] = None
+    variants: Optional[list[ProductPhotoVariant]] = None
+    placeholder: Optional[str] = None
+
+    @computed_field
+    @property
+    def srcset(self) -> Optional[str]:
+        """WebP variants as an img srcset, None until they are generated."""
+        if not self.variants:
+            return None
+        return ", ".join(
+            f"{variant.url} {variant.width}w"
+            for variant in self.variants
+            if variant.format == "webp"
+        ) or None
 
 
 class ProductCreate(BaseModel):
@@ -85,6 +107,7 @@ class ProductCreate(BaseModel):
     orientation_choice: Optional[bool] = False
     category_id: int
     covering_id: Optional[int] = None
+    active: bool = True
 
 
 class ProductUpdate(BaseModel):
@@ -98,6 +121,7 @@ class ProductUpdate(BaseModel):
     orientation_choice: Optional[bool] = None
     category_id: Optional[int] = None
     covering_id: Optional[int] = None
+    active: Optional[bool] = None
 
 
 class ProductShow(MainSchema):
@@ -112,6 +136,7 @@ class ProductShow(MainSchema):
     orientation_choice: bool
     category_id: int
     covering_id: Optional[int] = None
+    active: bool = True
     photos: list[ProductPhotoShow] = []
 
 
@@ -145,6 +170,11 @@ class CategoryShow(MainSchema):
     priority: Optional[int] = None
     allowed_sizes: list[int] = []
 
+    @field_validator("allowed_sizes", mode="before")
+    @classmethod
+    def allowed_sizes_to_ids(cls, value):
+        return [getattr(size, "id", size) for size in value or []]
+
 
 class ProductSizeCreate(BaseModel):
     height: int
@@ -182,6 +212,18 @@ class ProductRelShow(MainSchema):
     active: bool
 
 
+class ProductImportRowError(BaseModel):
+    row: int
+    errors: list[str]
+
+
+class ProductImportReport(BaseModel):
+    created: int = 0
+    updated: int = 0
+    failed: int = 0
+    errors: list[ProductImportRowError] = []
+
+
 ProductListSchema = BaseListSchema[ProductShow]
 ProductSizeListSchema = BaseListSchema[ProductSizeShow]
 ProductRelListSchema = BaseListSchema[ProductRelShow]
@@ -1,16 +1,25 @@
+import asyncio
+import io
 import logging
 import json
+import multiprocessing
+import os
 
-from typing import Optional, TypeVar
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
 
-from pydantic import BaseModel
+from typing import AsyncIterator, Optional, TypeVar, Iterable
 
-from fastapi import Request
+from fastapi import Request, UploadFile
 from fastapi.datastructures import FormData
+from pydantic import ValidationError
+from pydantic_core import to_json
 
 from sqlalchemy.orm import selectinload
 from sqlalchemy.exc import SQLAlchemyError
 
+from ..core.celery import app as celery_app
+from ..core.config import settings
 from ..core.db.service import BaseService
 from ..core.dependencies import PaginationParams
 
@@ -23,8 +32,19 @@ from ..utils.exceptions.uow import GetRepoByAttrNameException
 from ..utils.exceptions.processors.filters import FilterException
 from ..utils.exceptions.http.filters import FilterProcessException
 from ..utils.exceptions.http.base import IdNotFoundException
+from ..utils.exceptions.sort import InvalidSortException
+from ..utils.exceptions.http.sort import SortProcessException
+from ..utils.exceptions.processors.static import (
+    StaticFileValidationException,
+)
+from ..utils.exceptions.http.static import StaticFileUploadException
+from ..utils.exceptions.http.product import ProductImportException
 from ..utils.base import merge_dicts, model_to_dict
-from ..utils.processors.static.base import StaticFilesProcessor
+from ..utils.processors.static.base import (
+    StaticFilesProcessor,
+    get_static_relative_path,
+)
+from ..utils.processors.static.dataclasses import StaticFileProcessResponse
 
 from .schemas import (
     ProductCreate,
@@ -47,8 +67,21 @@ from .schemas import (
     ProductRelUpdate,
     ProductRelShow,
     ProductRelListSchema,
+    ProductImportRowError,
+    ProductImportReport,
+)
+from .caching import ProductJSONCache
+from .images import (
+    build_photo_placeholder,
+    build_photo_variants,
+    build_placeholder,
+)
+from .enums import (
+    ProductRelModelEnum,
+    ProductPhotoDepEnum,
+    ProductExportFormatEnum,
 )
-from .enums import ProductRelModelEnum, ProductPhotoDepEnum
+from .exchange import encode_header, encode_rows, read_rows
 from .utils import _default_product_description_json
 from ..utils.processors.filters.decoder import FiltersDecoder
 from ..utils.processors.filters.product import (
@@ -69,26 +102,105 @@ Repo = TypeVar("Repo")
 
 class ProductService(BaseService):
     list_schema = ProductListSchema
+    show_schema = ProductShow
     filter_processor = ProductFilterProcessor
+    export_batch_size = 500
+    import_batch_size = 500
+    import_errors_limit = 1000
+
+    def __init__(self, uow) -> None:
+        super().__init__(uow)
+        self.json_cache = ProductJSONCache()
+
+    async def cache_products_json(self, products: Iterable[ProductShow]) -> None:
+        await self.json_cache.set_many(
+            {product.id: self.json_cache.render(product) for product in products}
+        )
+
+    async def refresh_products_json(self, product_ids: Iterable[int]) -> None:
+        """
+        Regenerates cached JSON of the given products, must be
+        called inside the unit of work after the commit.
+        """
+        product_ids = list(product_ids)
+        products = await self.uow.product.get_by_ids(obj_ids=product_ids)
+        await self.json_cache.delete(
+            set(product_ids) - {product.id for product in products}
+        )
+        await self.cache_products_json(await self.get_show_schemes(products))
+
+    async def get_products_json(self, product_ids: list[int]) -> list[bytes]:
+        """
+        Returns cached JSON of the products in the given order.
+        Misses are loaded in one query, serialized and cached.
+        """
+        blobs = await self.json_cache.get_many(product_ids)
+        missing_ids = [
+            product_id
+            for product_id, blob in zip(product_ids, blobs)
+            if blob is None
+        ]
+        if not missing_ids:
+            return blobs
+        products = await self.uow.product.get_by_ids(obj_ids=missing_ids)
+        built = {
+            product.id: self.json_cache.render(product)
+            for product in await self.get_show_schemes(products)
+        }
+        await self.json_cache.set_many(built)
+        return [
+            blob if blob is not None else built[product_id]
+            for product_id, blob in zip(product_ids, blobs)
+            if blob is not None or product_id in built
+        ]
+
+    def get_active_filters(
+        self, filters_decoder: Optional[FiltersDecoder] = None
+    ) -> list:
+        """Inactive products are listed only when filtered by active."""
+        decoded_filters = (
+            filters_decoder.decoded_filters if filters_decoder else None
+        )
+        if decoded_filters and any(
+            isinstance(filter_lst, list)
+            and filter_lst
+            and filter_lst[0] == "active"
+            for filter_lst in decoded_filters
+        ):
+            return []
+        return [self.uow.product.model.active.is_(True)]
 
-    async def get_show_scheme(self, obj) -> BaseModel:
-        return ProductShow(
-            id=obj.id,
-            name=obj.name,
-            sku=obj.sku,
-            price=obj.price,
-            description=obj.description,
-            have_glass=obj.have_glass,
-            material_choice=obj.material_choice,
-            type_of_platband_choice=obj.type_of_platband_choice,
-            orientation_choice=obj.orientation_choice,
-            category_id=obj.category_id,
-            covering_id=obj.covering_id,
-            photos=[
-                await ProductPhotoService(self.uow).get_show_scheme(photo)
-                for photo in obj.photos
-            ],
+    async def get_products_json_list(
+        self,
+        filters: Optional[list] = None,
+        pagination: Optional[PaginationParams] = None,
+        filters_decoder: Optional[FiltersDecoder] = None,
+        sort: Optional[str] = None,
+    ) -> bytes:
+        """
+        Same payload as get_obj_list, stitched from cached
+        product JSON. Only product ids are queried.
+        """
+        filters = await self.get_list_filters(filters, filters_decoder)
+        paginated = bool(pagination and pagination.page)
+        try:
+            product_ids = await self.uow.product.get_ids(
+                filters=filters,
+                with_pagination=paginated,
+                pagination=pagination,
+                sort=sort,
+            )
+        except InvalidSortException as e:
+            raise SortProcessException(e.message)
+        results = (
+            b"[" + b",".join(await self.get_products_json(product_ids)) + b"]"
         )
+        if not paginated:
+            return results
+        page_meta = to_json(
+            await self.get_page_meta(self.uow.product, pagination, filters)
+        )
+        return page_meta[:-1] + b',"results":' + results + b"}"
 
     async def _clean_description(
         self,
@@ -139,7 +251,9 @@ class ProductService(BaseService):
                 product_id = await self.uow.product.create(obj_in=obj_in_data)
                 await self.uow.commit()
                 product = await self.uow.product.get_by_id(obj_id=product_id)
-                return await self.get_show_scheme(product)
+                product_show = await self.get_show_scheme(product)
+                await self.cache_products_json([product_show])
+                return product_show
         except SQLAlchemyError as e:
             log.exception(e)
             raise ObjectCreateException("Product")
@@ -185,7 +299,9 @@ class ProductService(BaseService):
                 )
                 await self.uow.commit()
                 product = await self.uow.product.get_by_id(obj_id=product_id)
-                return await self.get_show_scheme(product)
+                product_show = await self.get_show_scheme(product)
+                await self.cache_products_json([product_show])
+                return product_show
         except SQLAlchemyError as e:
             log.exception(e)
             raise ObjectUpdateException("Product")
@@ -193,21 +309,29 @@ class ProductService(BaseService):
     async def delete_product(self, product_id: int) -> None:
         try:
             async with self.uow:
+                photo_links = await self.uow.product_photo.get_links(
+                    [self.uow.product_photo.model.product_id == product_id]
+                )
                 await self.uow.product.delete_by_id(obj_id=product_id)
+                await self.uow.static_file.remove_references(
+                    map(get_static_relative_path, photo_links)
+                )
                 await self.uow.commit()
+                await self.json_cache.delete([product_id])
         except SQLAlchemyError as e:
             log.exception(e)
             raise ObjectUpdateException("Product")
 
-    async def get_product_obj(self, product_id: int) -> ProductShow:
+    async def get_product_obj(self, product_id: int) -> bytes:
+        """Returns the product as cached ProductShow JSON."""
         try:
             async with self.uow:
-                product = await self.uow.product.get_by_id(obj_id=product_id)
-                if not product:
+                product_json = await self.get_products_json([product_id])
+                if not product_json:
                     raise IdNotFoundException(
                         self.uow.product.model, product_id
                     )
-                return await self.get_show_scheme(product)
+                return product_json[0]
         except SQLAlchemyError as e:
             log.exception(e)
             raise ObjectUpdateException("Product")
@@ -216,13 +340,15 @@ class ProductService(BaseService):
         self,
         pagination: Optional[PaginationParams] = None,
         filters_decoder: Optional[FiltersDecoder] = None,
-    ) -> list[ProductShow]:
+        sort: Optional[str] = None,
+    ) -> bytes:
         try:
             async with self.uow:
-                return await self.get_obj_list(
-                    repo=self.uow.product,
-                    pagination_params=pagination,
+                return await self.get_products_json_list(
+                    filters=self.get_active_filters(filters_decoder),
+                    pagination=pagination,
                     filters_decoder=filters_decoder,
+                    sort=sort,
                 )
         except SQLAlchemyError as e:
             log.exception(e)
@@ -235,7 +361,8 @@ class ProductService(BaseService):
         category_id: int,
         pagination: Optional[PaginationParams] = None,
         filters_decoder: Optional[FiltersDecoder] = None,
-    ) -> list[ProductShow]:
+        sort: Optional[str] = None,
+    ) -> bytes:
         try:
             async with self.uow:
                 if not await self.uow.category.exists_by_id(
@@ -244,67 +371,283 @@ class ProductService(BaseService):
                     raise IdNotFoundException(
                         self.uow.category.model, category_id
                     )
-                return await self.get_obj_list(
-                    repo=self.uow.product,
+                return await self.get_products_json_list(
                     filters=[
-                        self.uow.product.model.category_id == category_id
+                        self.uow.product.model.category_id == category_id,
+                        *self.get_active_filters(filters_decoder),
                     ],
-                    pagination_params=pagination,
+                    pagination=pagination,
                     filters_decoder=filters_decoder,
+                    sort=sort,
+                )
+
+        except SQLAlchemyError as e:
+            log.exception(e)
+            raise ObjectUpdateException("Product")
+
+    async def export_products(
+        self, export_format: ProductExportFormatEnum
+    ) -> AsyncIterator[bytes]:
+        """
+        Yields the encoded catalog in chunks of export_batch_size rows,
+        read through a server-side cursor, so memory does not grow
+        with the number of products.
+        """
+        yield encode_header(export_format)
+        try:
+            async with self.uow:
+                batch = []
+                async for row in self.uow.product.stream_export_rows():
+                    batch.append(row)
+                    if len(batch) >= self.export_batch_size:
+                        yield encode_rows(batch, export_format)
+                        batch = []
+                if batch:
+                    yield encode_rows(batch, export_format)
+        except SQLAlchemyError as e:
+            # the response has started, the client gets a cut stream
+            log.exception(e)
+            raise
+
+    def _validate_import_row(
+        self,
+        data: dict,
+        category_ids: set[int],
+        covering_ids: set[int],
+    ) -> tuple[Optional[int], ProductCreate | ProductUpdate]:
+        """Returns (product id, schema), raises ValueError with the errors."""
+        product_id = data.pop("id", None)
+        try:
+            if product_id is None:
+                schema = ProductCreate.model_validate(data)
+            else:
+                product_id = int(product_id)
+                schema = ProductUpdate.model_validate(data)
+        except ValidationError as e:
+            raise ValueError(
+                [
+                    f"{'.'.join(map(str, error['loc']))}: {error['msg']}"
+                    for error in e.errors()
+                ]
+            )
+        except (TypeError, ValueError):
+            raise ValueError([f"id: invalid value {product_id!r}"])
+        errors = []
+        if (
+            schema.category_id is not None
+            and schema.category_id not in category_ids
+        ):
+            errors.append(f"category_id: {schema.category_id} not found")
+        if (
+            schema.covering_id is not None
+            and schema.covering_id not in covering_ids
+        ):
+            errors.append(f"covering_id: {schema.covering_id} not found")
+        if errors:
+            raise ValueError(errors)
+        return product_id, schema
+
+    async def _import_batch(
+        self,
+        batch: list[tuple[int, Optional[dict], Optional[str]]],
+        category_ids: set[int],
+        covering_ids: set[int],
+        report: ProductImportReport,
+    ) -> None:
+        """Writes one batch of parsed rows in a single transaction."""
+
+        def add_error(line_number: int, errors: list[str]) -> None:
+            report.failed += 1
+            if len(report.errors) < self.import_errors_limit:
+                report.errors.append(
+                    ProductImportRowError(row=line_number, errors=errors)
+                )
+
+        creates, updates = [], []
+        for line_number, data, error in batch:
+            if error:
+                add_error(line_number, [error])
+                continue
+            try:
+                product_id, schema = self._validate_import_row(
+                    data, category_ids, covering_ids
                 )
+            except ValueError as e:
+                add_error(line_number, e.args[0])
+                continue
+            if product_id is None:
+                creates.append((line_number, schema))
+            else:
+                updates.append((line_number, product_id, schema))
+
+        descriptions = (
+            await self.uow.product.get_descriptions(
+                [product_id for _, product_id, _ in updates]
+            )
+            if updates
+            else {}
+        )
+        create_values = []
+        for _, schema in creates:
+            values = dict(schema)
+            values["description"] = await self._clean_description(
+                schema.description
+            )
+            create_values.append(values)
+        update_values = []
+        update_lines = []
+        for line_number, product_id, schema in updates:
+            if product_id not in descriptions:
+                add_error(line_number, [f"id: product {product_id} not found"])
+                continue
+            values = {
+                key: value
+                for key, value in dict(schema).items()
+                if value is not None
+            }
+            if schema.description:
+                values["description"] = await self._clean_description(
+                    schema.description,
+                    product_description=descriptions[product_id],
+                )
+            values["id"] = product_id
+            update_values.append(values)
+            update_lines.append(line_number)
+
+        if not create_values and not update_values:
+            return
+        try:
+            if create_values:
+                await self.uow.product.bulk_create(create_values)
+            await self.uow.product.bulk_update(update_values)
+            await self.uow.commit()
+        except SQLAlchemyError as e:
+            log.exception(e)
+            await self.uow.rollback()
+            for line_number in [line for line, _ in creates] + update_lines:
+                add_error(line_number, ["Database error, row not saved"])
+            return
+        report.created += len(create_values)
+        report.updated += len(update_values)
+        await self.json_cache.delete(
+            [values["id"] for values in update_values]
+        )
 
+    async def import_products(
+        self,
+        file: UploadFile,
+        import_format: ProductExportFormatEnum,
+    ) -> ProductImportReport:
+        """
+        Creates rows without an id and updates rows with one. Empty
+        cells and missing keys leave fields unchanged. Rows are
+        validated and written in batches of import_batch_size, each
+        batch in its own transaction; invalid rows are reported and
+        skipped without failing the rest.
+        """
+        report = ProductImportReport()
+        rows = read_rows(
+            io.TextIOWrapper(file.file, encoding="utf-8-sig", newline=""),
+            import_format,
+        )
+        try:
+            async with self.uow:
+                category_ids = set(await self.uow.category.get_ids())
+                covering_ids = set(await self.uow.product_covering.get_ids())
+                while batch := await asyncio.to_thread(
+                    lambda: list(islice(rows, self.import_batch_size))
+                ):
+                    await self._import_batch(
+                        batch, category_ids, covering_ids, report
+                    )
         except SQLAlchemyError as e:
             log.exception(e)
             raise ObjectUpdateException("Product")
+        except UnicodeDecodeError:
+            raise ProductImportException("File must be UTF-8 encoded")
+        report.errors.sort(key=lambda row_error: row_error.row)
+        return report
 
 
 class ProductPhotoService(BaseService):
-    async def get_show_scheme(self, obj) -> ProductPhotoShow:
-        return ProductPhotoShow(
-            id=obj.id,
-            product_id=obj.product_id,
-            photo=obj.photo,
-            is_main=obj.is_main,
-            dependency=obj.dependency,
-            with_glass=obj.with_glass,
-            orientation=obj.orientation,
-            type_of_platband=obj.type_of_platband,
-            color_id=obj.color_id,
-            size_id=obj.size_id,
+    show_schema = ProductPhotoShow
+
+    async def __process_photo(
+        self,
+        semaphore: asyncio.Semaphore,
+        base_url: str,
+        photo: UploadFile,
+        dependency_data: dict,
+        product_id: int,
+    ) -> tuple[ProductPhotoCreate, StaticFileProcessResponse]:
+        async with semaphore:
+            photo_data = await StaticFilesProcessor(
+                base_url=base_url,
+                uploaded_file=photo,
+            ).process()
+            placeholder = await asyncio.to_thread(
+                build_placeholder,
+                os.path.join(settings.static.directory, photo_data.path),
+            )
+        return (
+            ProductPhotoCreate(
+                product_id=product_id,
+                photo=photo_data.link,
+                placeholder=placeholder,
+                **dependency_data,
+            ),
+            photo_data,
         )
 
     async def __prepare_photos_data(
         self, request: Request, form_data: FormData, product_id: int
-    ) -> list[ProductPhotoCreate]:
-        prepared_photos_data: list[ProductPhotoCreate] = []
-        photos_data: list[dict] = []
+    ) -> list[tuple[ProductPhotoCreate, StaticFileProcessResponse]]:
+        """
+        Writes the uploaded files concurrently, at most
+        STATIC_UPLOAD_CONCURRENCY at a time. Dependency data of
+        all files is parsed before any file is written.
+        """
+        photos_data: list[tuple[UploadFile, dict]] = []
         photo_keys_count = int(len(form_data.items()) / 2)
 
         for file_num in range(1, photo_keys_count + 1):
             photo = form_data[f"file_{file_num}"]
             dependency_data = json.loads(form_data[f"file_{file_num}_dep"])
-            photos_data.append({"photo": photo, **dependency_data})
-
-        for file_data in photos_data:
-            photo_processor = StaticFilesProcessor(
-                base_url=request.base_url,
-                uploaded_file=file_data["photo"],
-            )
-            photo_data = await photo_processor.process()
-            file_data["photo"] = photo_data.link
-            dependency_attr_name = ProductPhotoDepEnum(
-                file_data["dependency"]
-            ).name
-            file_data["dependency"] = getattr(
-                ProductPhotoDepEnum, dependency_attr_name
+            dependency_data["dependency"] = ProductPhotoDepEnum(
+                dependency_data["dependency"]
             )
-            prepared_photos_data.append(
-                ProductPhotoCreate(
-                    product_id=product_id,
-                    **file_data,
+            photos_data.append((photo, dependency_data))
+
+        semaphore = asyncio.Semaphore(settings.static.upload_concurrency)
+        try:
+            async with asyncio.TaskGroup() as task_group:
+                tasks = [
+                    task_group.create_task(
+                        self.__process_photo(
+                            semaphore,
+                            request.base_url,
+                            photo,
+                            dependency_data,
+                            product_id,
+                        )
+                    )
+                    for photo, dependency_data in photos_data
+                ]
+        except ExceptionGroup as e:
+            # the first failure cancels the remaining uploads, files the
+            # finished ones wrote are left to the static GC, another
+            # request may already reference them
+            validation_errors, errors = e.split(StaticFileValidationException)
+            if errors is not None:
+                for error in errors.exceptions[1:]:
+                    log.error("Photo upload failed", exc_info=error)
+                raise errors.exceptions[0]
+            raise StaticFileValidationException(
+                "; ".join(
+                    error.message for error in validation_errors.exceptions
                 )
             )
-        return prepared_photos_data
+        return [task.result() for task in tasks]
 
     async def add_product_photos(
         self,
@@ -319,21 +662,124 @@ class ProductPhotoService(BaseService):
                     raise IdNotFoundException(
                         self.uow.product.model, product_id
                     )
-                photos_data = await self.__prepare_photos_data(
-                    request=request,
-                    form_data=photos_form_data,
-                    product_id=product_id,
-                )
+            # files are written outside of the unit of work, so the upload
+            # does not hold a connection with an open transaction
+            photos_data = await self.__prepare_photos_data(
+                request=request,
+                form_data=photos_form_data,
+                product_id=product_id,
+            )
+            photos_create = [photo_data for photo_data, _ in photos_data]
+            files = [file for _, file in photos_data]
+            async with self.uow:
                 photos = await self.uow.product_photo.bulk_product_photo_save(
-                    photos=photos_data
+                    photos=photos_create
+                )
+                await self.uow.static_file.add_references(files)
+                await self.uow.commit()
+                photos_show = await self.get_show_schemes(photos)
+                await ProductService(self.uow).refresh_products_json(
+                    [product_id]
+                )
+            self.schedule_photo_variants([photo.id for photo in photos])
+            return photos_show
+        except StaticFileValidationException as e:
+            raise StaticFileUploadException(e.message)
+        except SQLAlchemyError as e:
+            log.exception(e)
+            raise ObjectUpdateException("ProductPhoto")
+
+    def schedule_photo_variants(self, photo_ids: list[int]) -> None:
+        """Queues variant generation, the upload succeeds without it."""
+        try:
+            celery_app.send_task(
+                "generate_product_photo_variants", args=[photo_ids]
+            )
+        except Exception as e:
+            log.exception(e)
+
+    async def generate_photo_variants(self, photo_ids: list[int]) -> None:
+        """
+        Builds resized variants of the photos and stores them,
+        then refreshes the cached JSON of the affected products.
+        """
+        try:
+            async with self.uow:
+                photos = await self.uow.product_photo.get_by_ids(
+                    obj_ids=photo_ids
                 )
-                await self.uow.add_all(photos)
+                for photo in photos:
+                    photo.variants = (
+                        await asyncio.to_thread(
+                            build_photo_variants, photo.photo
+                        )
+                        or None
+                    )
                 await self.uow.commit()
-                return [await self.get_show_scheme(photo) for photo in photos]
+                await ProductService(self.uow).refresh_products_json(
+                    {photo.product_id for photo in photos}
+                )
         except SQLAlchemyError as e:
             log.exception(e)
             raise ObjectUpdateException("ProductPhoto")
 
+    async def backfill_placeholders(
+        self, workers: int | None = None, batch_size: int = 500
+    ) -> int:
+        """
+        Builds placeholders of photos that have none, in batches
+        by id, in a process pool. Photos whose file can not be read
+        are left without one. Returns the number of updated photos.
+        """
+        loop = asyncio.get_running_loop()
+        updated = 0
+        after_id = 0
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        ) as executor:
+            while True:
+                async with self.uow:
+                    photos = await self.uow.product_photo.get_without_placeholder(
+                        after_id=after_id, limit=batch_size
+                    )
+                if not photos:
+                    break
+                after_id = photos[-1].id
+                placeholders = await asyncio.gather(
+                    *(
+                        loop.run_in_executor(
+                            executor, build_photo_placeholder, photo.photo
+                        )
+                        for photo in photos
+                    )
+                )
+                values = [
+                    {"id": photo.id, "placeholder": placeholder}
+                    for photo, placeholder in zip(photos, placeholders)
+                    if placeholder
+                ]
+                if not values:
+                    continue
+                try:
+                    async with self.uow:
+                        await self.uow.product_photo.bulk_update(values)
+                        await self.uow.commit()
+                        await ProductService(self.uow).refresh_products_json(
+                            {
+                                photo.product_id
+                                for photo, placeholder in zip(
+                                    photos, placeholders
+                                )
+                                if placeholder
+                            }
+                        )
+                except SQLAlchemyError as e:
+                    log.exception(e)
+                    raise ObjectUpdateException("ProductPhoto")
+                updated += len(values)
+        return updated
+
     async def update_product_photo(
         self,
         data: ProductPhotoUpdate,
@@ -341,9 +787,13 @@ class ProductPhotoService(BaseService):
     ) -> ProductPhotoShow:
         try:
             async with self.uow:
-                return await self.update_obj(
+                photo_show = await self.update_obj(
                     self.uow.product_photo, data, photo_id
                 )
+                await ProductService(self.uow).refresh_products_json(
+                    [photo_show.product_id]
+                )
+                return photo_show
         except SQLAlchemyError as e:
             log.exception(e)
             raise ObjectUpdateException("ProductPhoto")
@@ -351,8 +801,17 @@ class ProductPhotoService(BaseService):
     async def delete_product_photo(self, photo_id: int) -> None:
         try:
             async with self.uow:
+                photo = await self.uow.product_photo.get_by_id(obj_id=photo_id)
                 await self.uow.product_photo.delete_by_id(obj_id=photo_id)
+                if photo:
+                    await self.uow.static_file.remove_references(
+                        [get_static_relative_path(photo.photo)]
+                    )
                 await self.uow.commit()
+                if photo:
+                    await ProductService(self.uow).refresh_products_json(
+                        [photo.product_id]
+                    )
         except SQLAlchemyError as e:
             log.exception(e)
             raise ObjectUpdateException("ProductPhoto")
@@ -361,18 +820,7 @@ class ProductPhotoService(BaseService):
 class CategoryService(BaseService):
     filter_processor = CategoryFilterProcessor
     list_schema = CategoryListSchema
-
-    async def get_show_scheme(self, obj) -> CategoryShow:
-        return CategoryShow(
-            id=obj.id,
-            name=obj.name,
-            is_glass_available=obj.is_glass_available,
-            have_material_choice=obj.have_material_choice,
-            have_orientation_choice=obj.have_orientation_choice,
-            have_type_of_platband_choice=obj.have_type_of_platband_choice,
-            priority=obj.priority,
-            allowed_sizes=[size.id for size in obj.allowed_sizes],
-        )
+    show_schema = CategoryShow
 
     async def create_category(self, data: CategoryCreate) -> CategoryShow:
         try:
@@ -425,8 +873,19 @@ class CategoryService(BaseService):
     async def delete_category(self, category_id: int) -> None:
         try:
             async with self.uow:
+                photo_links = await self.uow.product_photo.get_links(
+                    [
+                        self.uow.product_photo.model.product.has(
+                            category_id=category_id
+                        )
+                    ]
+                )
                 await self.uow.category.delete_by_id(obj_id=category_id)
+                await self.uow.static_file.remove_references(
+                    map(get_static_relative_path, photo_links)
+                )
                 await self.uow.commit()
+                await ProductJSONCache().clear()
         except SQLAlchemyError as e:
             log.exception(e)
             raise ObjectUpdateException("Category")
@@ -471,15 +930,7 @@ class CategoryService(BaseService):
 class ProductSizeService(BaseService):
     filter_processor = ProductSizeFilterProcessor
     list_schema = ProductSizeListSchema
-
-    async def get_show_scheme(self, obj) -> ProductSizeShow:
-        return ProductSizeShow(
-            id=obj.id,
-            height=obj.height,
-            width=obj.width,
-            thickness=obj.thickness,
-            dimensions=obj.dimensions,
-        )
+    show_schema = ProductSizeShow
 
     async def create_product_size(
         self, data: ProductSizeCreate
@@ -512,6 +963,7 @@ class ProductSizeService(BaseService):
                     obj_id=product_size_id
                 )
                 await self.uow.commit()
+                await ProductJSONCache().clear()
         except SQLAlchemyError as e:
             log.exception(e)
             raise ObjectUpdateException("ProductSize")
@@ -548,13 +1000,7 @@ class ProductSizeService(BaseService):
 class ProductRelService(BaseService):
     filter_processor = None
     list_schema = ProductRelListSchema
-
-    async def get_show_scheme(self, obj) -> BaseModel:
-        return ProductRelShow(
-            id=obj.id,
-            name=obj.name,
-            active=obj.active,
-        )
+    show_schema = ProductRelShow
 
     async def get_repo(
         self, rel_model: ProductRelModelEnum
@@ -606,6 +1052,7 @@ class ProductRelService(BaseService):
                 repo = await self.get_repo(rel_model)
                 await repo.delete_by_id(obj_id=rel_obj_id)
                 await self.uow.commit()
+                await ProductJSONCache().clear()
         except SQLAlchemyError as e:
             log.exception(e)
             raise ObjectUpdateException(rel_model)
@@ -628,9 +1075,10 @@ class ProductRelService(BaseService):
         filters: list | None = None,
         pagination_params: PaginationParams | None = None,
         filters_decoder: FiltersDecoder | None = None,
+        sort: str | None = None,
     ) -> ProductRelListSchema | list[ProductRelShow]:
         return await super().get_obj_list(
-            repo, options, filters, pagination_params, filters_decoder
+            repo, options, filters, pagination_params, filters_decoder, sort
         )
 
     async def get_product_rel_list(
@@ -0,0 +1,29 @@
+import asyncio
+import logging
+
+from ..core.caching import RedisCaching
+from ..core.celery import app as celery_app
+from ..core.db.unitofwork import UnitOfWork
+
+from .service import ProductPhotoService
+
+
+log = logging.getLogger(__name__)
+
+
+async def _generate_product_photo_variants(photo_ids: list[int]) -> None:
+    try:
+        await ProductPhotoService(UnitOfWork()).generate_photo_variants(
+            photo_ids
+        )
+    finally:
+        # the next task runs in a new event loop
+        await RedisCaching.close()
+
+
+@celery_app.task(name="generate_product_photo_variants")
+def generate_product_photo_variants(photo_ids: list[int]):
+    try:
+        asyncio.run(_generate_product_photo_variants(photo_ids))
+    except Exception as e:
+        log.exception(e)
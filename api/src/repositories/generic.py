@@ -1,5 +1,6 @@
 import uuid
 
+from dataclasses import dataclass
 from typing import Generic, TypeVar, Optional, Any
 
 from pydantic import BaseModel
@@ -18,6 +19,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from ..core.db.base import Base
 from ..core.dependencies import PaginationParams
 from ..utils.base import clean_dict
+from ..utils.exceptions.sort import InvalidSortException
 
 
 T = TypeVar("T", bound=Base)
@@ -25,11 +27,51 @@ CreateScheme = TypeVar("CreateScheme", bound=BaseModel)
 UpdateScheme = TypeVar("UpdateScheme", bound=BaseModel)
 
 
+@dataclass(frozen=True)
+class SortOption:
+    """
+    Ordering of a named list sort. The order should end with
+    the id, so pages stay stable and match a composite index.
+    """
+
+    order_by: tuple
+    joins: tuple = ()
+
+
 class GenericRepository(Generic[T, CreateScheme, UpdateScheme]):
+    sort_options: dict[str, SortOption] = {}
+    default_sort: Optional[str] = None
+
     def __init__(self, session: AsyncSession, model: type[T]) -> None:
         self.session = session
         self.model = model
 
+    async def _get_ordering(
+        self,
+        sort: Optional[str],
+        order_by: Optional[list],
+        joins: Optional[list],
+    ) -> tuple[list, Optional[list]]:
+        """
+        Returns the order and joins of the list query. Named sorts
+        are checked against sort_options, without one the given
+        order is followed by created_at descending.
+        """
+        sort = sort or self.default_sort
+        if sort is not None:
+            if sort not in self.sort_options:
+                raise InvalidSortException(sort, list(self.sort_options))
+            sort_option = self.sort_options[sort]
+            return list(sort_option.order_by), (joins or []) + list(
+                sort_option.joins
+            )
+        order_by = (
+            order_by + [self.model.created_at.desc()]
+            if order_by is not None
+            else [self.model.created_at.desc()]
+        )
+        return order_by, joins
+
     async def _add_options_to_query(self, query, options: list) -> None:
         for option in options:
             query = query.options(option)
@@ -175,12 +217,9 @@ class GenericRepository(Generic[T, CreateScheme, UpdateScheme]):
         joins: Optional[list] = None,
         with_pagination: bool = False,
         pagination: Optional[PaginationParams] = None,
+        sort: Optional[str] = None,
     ) -> list[T]:
-        order_by = (
-            order_by + [self.model.created_at.desc()]
-            if order_by is not None
-            else [self.model.created_at.desc()]
-        )
+        order_by, joins = await self._get_ordering(sort, order_by, joins)
         query = select(self.model).order_by(*order_by)
         if joins:
             query = await self._add_joins_to_query(query, joins)
@@ -197,6 +236,43 @@ class GenericRepository(Generic[T, CreateScheme, UpdateScheme]):
         res = await self.session.execute(query)
         return res.scalars().all()
 
+    async def get_ids(
+        self,
+        filters: Optional[list] = None,
+        order_by: Optional[list] = None,
+        joins: Optional[list] = None,
+        with_pagination: bool = False,
+        pagination: Optional[PaginationParams] = None,
+        sort: Optional[str] = None,
+    ) -> list[int | uuid.UUID]:
+        """
+        Same query as get_all, but only ids are selected,
+        so no rows or relationships are loaded.
+        """
+        order_by, joins = await self._get_ordering(sort, order_by, joins)
+        query = select(self.model.id).order_by(*order_by)
+        if joins:
+            query = await self._add_joins_to_query(query, joins)
+        if filters:
+            query = await self._add_filters_to_query(query, filters)
+        if with_pagination:
+            query = await self._add_pagination_to_query(
+                query,
+                page=pagination.page,
+                page_size=pagination.size,
+            )
+        res = await self.session.execute(query)
+        return res.scalars().all()
+
+    async def get_existing_ids(
+        self, obj_ids: list[int | uuid.UUID]
+    ) -> set[int | uuid.UUID]:
+        """The ids among obj_ids that have a row, in one query."""
+        res = await self.session.execute(
+            select(self.model.id).where(self.model.id.in_(obj_ids))
+        )
+        return set(res.scalars().all())
+
     async def exists_by_id(self, *, obj_id: int | uuid.UUID) -> bool:
         query = exists().where(self.model.id == obj_id).select()
         res = await self.session.execute(query)
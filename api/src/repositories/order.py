@@ -1,20 +1,25 @@
 import uuid
 import datetime
 
-from sqlalchemy import update, and_
+from typing import AsyncIterator
+
+from sqlalchemy import Row, delete, exists, func, literal, select, update, and_
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from .generic import GenericRepository
+from .generic import GenericRepository, SortOption
 
 
 from ..order.models import (
+    BASKET_ITEM_VARIANT_COLUMNS,
     Basket,
     BasketItem,
     Order,
     OrderItem,
 )
 from ..product.models import Product
+from ..user.models import User
 from ..order.schemas import (
     BasketCreate,
     BasketUpdate,
@@ -71,6 +76,42 @@ class BasketRepository(GenericRepository[Basket, BasketCreate, BasketUpdate]):
             options=options,
         )
 
+    async def get_user_basket_ref(self, user_id: uuid.UUID) -> Row | None:
+        """
+        The user with their basket id and token, in one query.
+        None when there is no such user, basket columns are None
+        when the user has no basket yet.
+        """
+        res = await self.session.execute(
+            select(
+                User.id.label("user_id"),
+                User.email,
+                User.is_active,
+                self.model.id.label("basket_id"),
+                self.model.basket_token,
+            )
+            .outerjoin(self.model, self.model.user_id == User.id)
+            .where(User.id == user_id)
+            .order_by(self.model.id)
+            .limit(1)
+        )
+        return res.first()
+
+    async def get_id_by_token(self, token: str) -> int | None:
+        res = await self.session.execute(
+            select(self.model.id).where(self.model.basket_token == token)
+        )
+        return res.scalar()
+
+    async def get_guest_id_by_token(self, token: str) -> int | None:
+        res = await self.session.execute(
+            select(self.model.id).where(
+                self.model.basket_token == token,
+                self.model.user_id.is_(None),
+            )
+        )
+        return res.scalar()
+
     async def get_by_token(
         self,
         token: str,
@@ -83,6 +124,36 @@ class BasketRepository(GenericRepository[Basket, BasketCreate, BasketUpdate]):
             options=options,
         )
 
+    async def delete_stale_guests(
+        self, inactive_for: datetime.timedelta, limit: int
+    ) -> int:
+        """
+        Deletes up to limit guest baskets with neither the basket nor
+        any of its items changed within inactive_for. Items go with
+        the basket by the foreign key cascade. Returns deleted rows.
+        """
+        inactive_before = func.now() - inactive_for
+        stale = (
+            select(self.model.id)
+            .where(
+                self.model.user_id.is_(None),
+                self.model.updated_at < inactive_before,
+                ~exists().where(
+                    BasketItem.basket_id == self.model.id,
+                    BasketItem.updated_at >= inactive_before,
+                ),
+            )
+            .order_by(self.model.updated_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        res = await self.session.execute(
+            delete(self.model)
+            .where(self.model.id.in_(stale))
+            .execution_options(synchronize_session=False)
+        )
+        return res.rowcount
+
 
 class BasketItemRepository(
     GenericRepository[BasketItem, BasketItemCreate, BasketItemUpdate]
@@ -90,21 +161,98 @@ class BasketItemRepository(
     def __init__(self, session: AsyncSession):
         super().__init__(session, BasketItem)
 
+    async def move_to_basket(self, from_basket_id: int, to_basket_id: int):
+        """
+        Moves the items of one basket into another with a single
+        INSERT ... SELECT, summing quantities of lines of the same
+        variant. The source items are left for the caller to delete.
+        """
+        variant_columns = [
+            column for column in BASKET_ITEM_VARIANT_COLUMNS
+            if column != "basket_id"
+        ]
+        stmt = insert(self.model).from_select(
+            ["basket_id", *variant_columns, "quantity"],
+            select(
+                literal(to_basket_id),
+                *(getattr(self.model, column) for column in variant_columns),
+                self.model.quantity,
+            ).where(self.model.basket_id == from_basket_id),
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[
+                getattr(self.model, column)
+                for column in BASKET_ITEM_VARIANT_COLUMNS
+            ],
+            set_={
+                "quantity": self.model.quantity + stmt.excluded.quantity,
+                "updated_at": func.now(),
+            },
+        )
+        await self.session.execute(stmt)
+
+    async def get_by_basket_id(self, basket_id: int) -> list[BasketItem]:
+        """Items of the basket without any relationship loaded."""
+        res = await self.session.execute(
+            select(self.model)
+            .where(self.model.basket_id == basket_id)
+            .order_by(self.model.id)
+        )
+        return res.scalars().all()
+
+    async def delete_by_basket_id(self, basket_id: int) -> None:
+        await self.session.execute(
+            delete(self.model).where(self.model.basket_id == basket_id)
+        )
+
+    async def upsert(self, values: list[dict]) -> list[int]:
+        """
+        Inserts the items, or adds their quantity to the line of the
+        same variant, in one statement. Returns the item ids.
+        """
+        # one statement can not update a row twice, lines of the
+        # same variant are summed first
+        lines = {}
+        for item in values:
+            variant = tuple(item[column] for column in BASKET_ITEM_VARIANT_COLUMNS)
+            if variant in lines:
+                lines[variant]["quantity"] += item["quantity"]
+            else:
+                lines[variant] = dict(item)
+        if not lines:
+            return []
+        stmt = insert(self.model).values(list(lines.values()))
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[
+                getattr(self.model, column)
+                for column in BASKET_ITEM_VARIANT_COLUMNS
+            ],
+            set_={
+                "quantity": self.model.quantity + stmt.excluded.quantity,
+                "updated_at": func.now(),
+            },
+        ).returning(self.model.id)
+        res = await self.session.execute(stmt)
+        return res.scalars().all()
+
 
 class OrderRepository(GenericRepository[Order, OrderCreate, OrderUpdate]):
+    sort_options = {
+        "newest": SortOption(order_by=(Order.created_at.desc(), Order.id.desc())),
+        "oldest": SortOption(order_by=(Order.created_at, Order.id)),
+        "value_desc": SortOption(
+            order_by=(Order.total_value.desc(), Order.id.desc())
+        ),
+        "value_asc": SortOption(order_by=(Order.total_value, Order.id)),
+    }
+    default_sort = "newest"
+
     def __init__(self, session: AsyncSession):
         super().__init__(session, Order)
 
     async def _add_default_options(self, options: list | None = None) -> list:
         default_options = (
             selectinload(self.model.items).options(
-                selectinload(
-                    OrderItem.product,
-                ).options(
-                    selectinload(
-                        Product.photos,
-                    )
-                ),
                 selectinload(OrderItem.color),
                 selectinload(OrderItem.size),
                 selectinload(OrderItem.covering),
@@ -176,25 +324,68 @@ class OrderItemRepository(
     def __init__(self, session: AsyncSession):
         super().__init__(session, OrderItem)
 
+    async def stream_main_photos(self) -> AsyncIterator[str]:
+        """Yields the photo links kept by order item snapshots."""
+        result = await self.session.stream(
+            select(self.model.main_photo)
+            .where(self.model.main_photo.is_not(None))
+            .distinct()
+            .execution_options(yield_per=1000)
+        )
+        async for (link,) in result:
+            yield link
+
+    @staticmethod
+    def _get_values(
+        obj_in: OrderItemCreate, order_id: int, product_snapshot: dict
+    ) -> dict:
+        return {
+            "order_id": order_id,
+            **product_snapshot,
+            "product_id": obj_in.product_id,
+            "color_id": obj_in.color_id,
+            "size_id": obj_in.size_id,
+            "covering_id": obj_in.covering_id,
+            "glass_color_id": obj_in.glass_color_id,
+            "material": obj_in.material,
+            "type_of_platband": obj_in.type_of_platband,
+            "orientation": obj_in.orientation,
+            "with_glass": obj_in.with_glass,
+            "quantity": obj_in.quantity,
+        }
+
     async def create(
         self,
         *,
         obj_in: OrderItemCreate,
         order_id: int,
+        product_snapshot: dict,
         clean_dict_ignore_keys: list | None = None,
         **kwargs,
     ) -> OrderItem:
-        order_item = self.model(
-            order_id=order_id,
-            product_id=obj_in.product_id,
-            color_id=obj_in.color_id,
-            size_id=obj_in.size_id,
-            covering_id=obj_in.covering_id,
-            glass_color_id=obj_in.glass_color_id,
-            material=obj_in.material,
-            type_of_platband=obj_in.type_of_platband,
-            orientation=obj_in.orientation,
-            with_glass=obj_in.with_glass,
-            quantity=obj_in.quantity,
-        )
-        return order_item
+        return self.model(
+            **self._get_values(obj_in, order_id, product_snapshot)
+        )
+
+    async def bulk_create(
+        self,
+        items: list[OrderItemCreate],
+        order_id: int,
+        product_snapshots: dict[int, dict],
+    ) -> None:
+        """
+        Inserts the items of the order with one multi-row INSERT,
+        product_snapshots maps product ids to get_order_snapshots rows.
+        """
+        if not items:
+            return
+        await self.session.execute(
+            insert(self.model).values(
+                [
+                    self._get_values(
+                        item, order_id, product_snapshots[item.product_id]
+                    )
+                    for item in items
+                ]
+            )
+        )
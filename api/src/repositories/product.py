@@ -1,13 +1,15 @@
-from typing import TypeVar, Iterable, Optional
+from typing import AsyncIterator, TypeVar, Iterable, Optional
 
 from uuid import UUID
 
+from sqlalchemy import String, and_, func, insert, literal, select, update
+from sqlalchemy.dialects.postgresql import ARRAY, aggregate_order_by
 from sqlalchemy.orm import joinedload, selectinload
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..core.dependencies import PaginationParams
 
-from .generic import GenericRepository
+from .generic import GenericRepository, SortOption
 
 from ..product.models import (
     Product,
@@ -44,6 +46,26 @@ ProductRel = TypeVar(
 class ProductRepository(
     GenericRepository[Product, ProductCreate, ProductUpdate]
 ):
+    sort_options = {
+        "priority": SortOption(
+            order_by=(
+                Category.priority,
+                Product.created_at.desc(),
+                Product.id.desc(),
+            ),
+            joins=(Category,),
+        ),
+        "price_asc": SortOption(order_by=(Product.price, Product.id)),
+        "price_desc": SortOption(
+            order_by=(Product.price.desc(), Product.id.desc())
+        ),
+        "newest": SortOption(
+            order_by=(Product.created_at.desc(), Product.id.desc())
+        ),
+        "name": SortOption(order_by=(Product.name, Product.id)),
+    }
+    default_sort = "priority"
+
     def __init__(self, session: AsyncSession) -> None:
         super().__init__(session, Product)
 
@@ -82,16 +104,109 @@ class ProductRepository(
         filters: list | None = None,
         with_pagination: bool = False,
         pagination: Optional[PaginationParams] = None,
+        sort: str | None = None,
     ) -> list[Product]:
         options = await self._add_default_options(options)
         return await super().get_all(
             options=options,
             filters=filters,
-            order_by=[Category.priority],
-            joins=[Category],
             with_pagination=with_pagination,
             pagination=pagination,
+            sort=sort,
+        )
+
+    async def stream_export_rows(self) -> AsyncIterator[dict]:
+        """
+        Yields all products with their category name and photo
+        links, read through a server-side cursor.
+        """
+        photos = (
+            select(
+                func.coalesce(
+                    func.array_agg(
+                        aggregate_order_by(ProductPhoto.photo, ProductPhoto.id)
+                    ),
+                    literal([], ARRAY(String)),
+                )
+            )
+            .where(ProductPhoto.product_id == self.model.id)
+            .scalar_subquery()
+        )
+        query = (
+            select(
+                self.model.id,
+                self.model.sku,
+                self.model.name,
+                self.model.price,
+                self.model.category_id,
+                Category.name.label("category"),
+                self.model.covering_id,
+                self.model.have_glass,
+                self.model.material_choice,
+                self.model.type_of_platband_choice,
+                self.model.orientation_choice,
+                self.model.active,
+                self.model.description,
+                photos.label("photos"),
+            )
+            .join(Category, Category.id == self.model.category_id)
+            .order_by(self.model.id)
+            .execution_options(yield_per=1000)
+        )
+        result = await self.session.stream(query)
+        async for row in result.mappings():
+            yield dict(row)
+
+    async def get_order_snapshots(
+        self, obj_ids: Iterable[int]
+    ) -> dict[int, dict]:
+        """
+        Price, name, sku and main photo of the products, the
+        fields an order item keeps from the product.
+        """
+        main_photo = (
+            select(ProductPhoto.photo)
+            .where(ProductPhoto.product_id == self.model.id)
+            .order_by(ProductPhoto.is_main.desc(), ProductPhoto.id)
+            .limit(1)
+            .scalar_subquery()
+        )
+        res = await self.session.execute(
+            select(
+                self.model.id,
+                self.model.price.label("unit_price"),
+                self.model.name.label("product_name"),
+                self.model.sku.label("product_sku"),
+                main_photo.label("main_photo"),
+            ).where(self.model.id.in_(obj_ids))
+        )
+        return {
+            row.pop("id"): row for row in map(dict, res.mappings().all())
+        }
+
+    async def get_descriptions(self, obj_ids: Iterable[int]) -> dict[int, dict]:
+        """Descriptions of the existing products among obj_ids."""
+        res = await self.session.execute(
+            select(self.model.id, self.model.description).where(
+                self.model.id.in_(obj_ids)
+            )
+        )
+        return dict(res.all())
+
+    async def bulk_create(self, values: list[dict]) -> list[int]:
+        """Inserts the products in one statement, ids in values order."""
+        res = await self.session.execute(
+            insert(self.model).returning(
+                self.model.id, sort_by_parameter_order=True
+            ),
+            values,
         )
+        return res.scalars().all()
+
+    async def bulk_update(self, values: list[dict]) -> None:
+        """Updates many products by primary key, each dict has an id."""
+        if values:
+            await self.session.execute(update(self.model), values)
 
     async def get_by_id(
         self,
@@ -127,15 +242,62 @@ class ProductPhotoRepository(
     def __init__(self, session: AsyncSession) -> None:
         super().__init__(session, ProductPhoto)
 
+    async def get_links(self, filters: list) -> list[str]:
+        res = await self.session.execute(
+            select(self.model.photo).where(and_(*filters))
+        )
+        return res.scalars().all()
+
+    async def stream_links(self) -> AsyncIterator[str]:
+        """Yields links of all photos and their variants."""
+        result = await self.session.stream(
+            select(self.model.photo, self.model.variants).execution_options(
+                yield_per=1000
+            )
+        )
+        async for photo, variants in result:
+            yield photo
+            for variant in variants or ():
+                yield variant["url"]
+
+    async def get_without_placeholder(
+        self, after_id: int, limit: int
+    ) -> list[tuple[int, int, str]]:
+        """Id, product id and link of photos without a placeholder."""
+        res = await self.session.execute(
+            select(self.model.id, self.model.product_id, self.model.photo)
+            .where(self.model.placeholder.is_(None), self.model.id > after_id)
+            .order_by(self.model.id)
+            .limit(limit)
+        )
+        return res.all()
+
+    async def bulk_update(self, values: list[dict]) -> None:
+        """Updates many photos by primary key, each dict has an id."""
+        if values:
+            await self.session.execute(update(self.model), values)
+
     async def bulk_product_photo_save(
         self, photos: list[ProductPhotoCreate]
     ) -> list[ProductPhoto]:
-        instance_list = []
-        photos_data = [clean_dict(dict(photo)) for photo in photos]
-
-        for photo_data in photos_data:
-            instance_list.append(ProductPhoto(**photo_data))
-        return instance_list
+        """
+        Inserts all photos with a single INSERT ... RETURNING and
+        returns the created objects in the order of the given photos.
+        """
+        if not photos:
+            return []
+        photos_data = []
+        for photo in photos:
+            photo_data = photo.model_dump(exclude={"glass_color_id"})
+            photo_data["is_main"] = bool(photo_data["is_main"])
+            photos_data.append(photo_data)
+        res = await self.session.scalars(
+            insert(self.model).returning(
+                self.model, sort_by_parameter_order=True
+            ),
+            photos_data,
+        )
+        return res.all()
 
 
 class CategoryRepository(
@@ -204,12 +366,14 @@ class ProductRelRepository(
         filters: list | None = None,
         with_pagination: bool = False,
         pagination: Optional[PaginationParams] = None,
+        sort: str | None = None,
     ) -> list[ProductRel]:
         return await super().get_all(
             options=options,
             filters=filters,
             with_pagination=with_pagination,
             pagination=pagination,
+            sort=sort,
         )
 
 
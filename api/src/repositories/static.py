@@ -0,0 +1,83 @@
+from collections import Counter
+from typing import AsyncIterator, Iterable
+
+from pydantic import BaseModel
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .generic import GenericRepository
+
+from ..static_img.models import StaticFile
+from ..utils.processors.static.dataclasses import StaticFileProcessResponse
+
+
+class StaticFileRepository(GenericRepository[StaticFile, BaseModel, BaseModel]):
+    def __init__(self, session: AsyncSession) -> None:
+        super().__init__(session, StaticFile)
+
+    async def add_references(
+        self, files: Iterable[StaticFileProcessResponse]
+    ) -> None:
+        """Registers the files or increments their reference counts."""
+        files_by_path = {}
+        ref_counts = Counter()
+        for file in files:
+            files_by_path[file.path] = file
+            ref_counts[file.path] += 1
+        if not files_by_path:
+            return
+        stmt = insert(self.model).values(
+            [
+                {
+                    "path": path,
+                    "content_hash": file.content_hash,
+                    "size": file.size,
+                    "ref_count": ref_counts[path],
+                }
+                for path, file in files_by_path.items()
+            ]
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[self.model.path],
+            set_={
+                "ref_count": self.model.ref_count + stmt.excluded.ref_count,
+                "updated_at": func.now(),
+            },
+        )
+        await self.session.execute(stmt)
+
+    async def remove_references(self, paths: Iterable[str | None]) -> None:
+        """
+        Decrements reference counts of the files. Paths that are not
+        registered, such as files stored before content addressing,
+        are ignored. Files are not deleted here.
+        """
+        paths_by_count: dict[int, list[str]] = {}
+        for path, count in Counter(p for p in paths if p).items():
+            paths_by_count.setdefault(count, []).append(path)
+        for count, count_paths in paths_by_count.items():
+            await self.session.execute(
+                update(self.model)
+                .where(self.model.path.in_(count_paths))
+                .values(
+                    ref_count=func.greatest(self.model.ref_count - count, 0)
+                )
+            )
+
+    async def stream_referenced_paths(self) -> AsyncIterator[str]:
+        result = await self.session.stream_scalars(
+            select(self.model.path)
+            .where(self.model.ref_count > 0)
+            .execution_options(yield_per=1000)
+        )
+        async for path in result:
+            yield path
+
+    async def delete_unreferenced(self, paths: list[str]) -> None:
+        """Deletes rows of the files, unless referenced again."""
+        await self.session.execute(
+            delete(self.model).where(
+                self.model.path.in_(paths), self.model.ref_count == 0
+            )
+        )
@@ -1,7 +1,7 @@
 from uuid import UUID  # noqa: F401
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import update
+from sqlalchemy import delete, func, select, update
 
 from .generic import GenericRepository
 
@@ -81,3 +81,19 @@ class AuthTokenRepository(
 
     async def exists_by_token(self, token: str) -> bool:
         return await self.exists_by_attr(attr=self.model.token, value=token)
+
+    async def delete_expired(self, limit: int) -> int:
+        """Deletes up to limit expired tokens. Returns deleted rows."""
+        expired = (
+            select(self.model.id)
+            .where(self.model.expires_at < func.now())
+            .order_by(self.model.expires_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        res = await self.session.execute(
+            delete(self.model)
+            .where(self.model.id.in_(expired))
+            .execution_options(synchronize_session=False)
+        )
+        return res.rowcount
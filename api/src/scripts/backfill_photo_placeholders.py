@@ -0,0 +1,54 @@
+import asyncio
+import argparse
+import sys
+import logging
+
+from ..core.db.unitofwork import UnitOfWork
+
+from ..product.images import placeholders_supported
+from ..product.service import ProductPhotoService
+from ..utils.exceptions.http.base import ObjectUpdateException
+
+
+log = logging.getLogger(__name__)
+
+
+async def main(argv=sys.argv):
+    description = "Script to build placeholders of photos that have none"
+
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument(
+        "--workers",
+        "-w",
+        type=int,
+        default=None,
+        help="Number of worker processes, the CPU count by default",
+    )
+    parser.add_argument(
+        "--batch-size",
+        "-b",
+        type=int,
+        default=500,
+        help="Number of photos processed and saved at a time",
+    )
+
+    args = parser.parse_args(argv[1:])
+
+    if not placeholders_supported():
+        parser.error(
+            "Pillow is built without WebP support, placeholders can not be built"
+        )
+
+    try:
+        updated = await ProductPhotoService(UnitOfWork()).backfill_placeholders(
+            workers=args.workers,
+            batch_size=args.batch_size,
+        )
+    except ObjectUpdateException:
+        parser.error("Error saving placeholders")
+
+    print(f"\n\nPlaceholders built: {updated}\n\n")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
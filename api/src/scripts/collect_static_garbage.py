@@ -0,0 +1,58 @@
+import asyncio
+import argparse
+import sys
+import logging
+
+from dataclasses import asdict
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from ..core.db.unitofwork import UnitOfWork
+
+from ..static_img.gc import StaticGCService
+
+
+log = logging.getLogger(__name__)
+
+
+async def main(argv=sys.argv):
+    description = (
+        "Script to move uploaded static files not referenced by the "
+        "database to the trash directory"
+    )
+
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Only report orphaned files, move nothing",
+    )
+    parser.add_argument(
+        "--grace-period",
+        "-g",
+        type=int,
+        default=None,
+        help="Keep files modified within this many seconds",
+    )
+
+    args = parser.parse_args(argv[1:])
+
+    try:
+        report = await StaticGCService(UnitOfWork()).collect(
+            dry_run=args.dry_run,
+            grace_period=args.grace_period,
+        )
+    except SQLAlchemyError as e:
+        log.exception(e)
+        parser.error("Error reading referenced files")
+
+    print("\n\nStatic GC report:")
+    for key, value in asdict(report).items():
+        print(f"  {key}: {value}")
+    print(
+        f"  reclaimed from static: {report.orphaned_bytes / 1024 / 1024:.2f} MB"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
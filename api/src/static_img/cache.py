@@ -0,0 +1,69 @@
+import os
+import threading
+
+from collections import OrderedDict
+
+
+class DiskLRUCache:
+    """
+    Size bounded directory of generated files, keyed by content hash.
+
+    The index is rebuilt from the directory on first use, ordered by
+    access time, so eviction order survives restarts. Each worker
+    process keeps its own index, files removed by another worker are
+    treated as misses.
+    """
+
+    def __init__(self, directory: str, max_size: int) -> None:
+        self.directory = directory
+        self.max_size = max_size
+        self.entries: OrderedDict[str, int] = OrderedDict()
+        self.size = 0
+        self.loaded = False
+        self.lock = threading.Lock()
+
+    def get_path(self, key: str, extension: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.{extension}")
+
+    def _load(self) -> None:
+        files = []
+        for root, _, filenames in os.walk(self.directory):
+            for filename in filenames:
+                if filename.endswith(".tmp"):
+                    continue
+                path = os.path.join(root, filename)
+                stat = os.stat(path)
+                files.append((stat.st_atime, path, stat.st_size))
+        for _, path, size in sorted(files):
+            self.entries[path] = size
+            self.size += size
+        self.loaded = True
+
+    def touch(self, path: str) -> bool:
+        """Marks the file as recently used, returns False on a miss."""
+        with self.lock:
+            if not self.loaded:
+                self._load()
+            if path not in self.entries:
+                return False
+            if not os.path.exists(path):
+                self.size -= self.entries.pop(path)
+                return False
+            self.entries.move_to_end(path)
+        os.utime(path)
+        return True
+
+    def add(self, path: str) -> None:
+        size = os.path.getsize(path)
+        with self.lock:
+            if not self.loaded:
+                self._load()
+            self.size += size - self.entries.pop(path, 0)
+            self.entries[path] = size
+            while self.size > self.max_size and len(self.entries) > 1:
+                evicted_path, evicted_size = self.entries.popitem(last=False)
+                self.size -= evicted_size
+                try:
+                    os.remove(evicted_path)
+                except FileNotFoundError:
+                    pass
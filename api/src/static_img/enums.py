@@ -0,0 +1,8 @@
+from ..utils.enums import BaseEnum
+
+
+class ImageFormatEnum(BaseEnum):
+    WEBP = "webp"
+    AVIF = "avif"
+    JPEG = "jpeg"
+    PNG = "png"
@@ -0,0 +1,175 @@
+import asyncio
+import logging
+import os
+import shutil
+import time
+
+from dataclasses import dataclass
+from datetime import datetime
+
+from ..core.config import settings
+from ..core.db.service import BaseService
+from ..utils.processors.static.base import get_static_relative_path
+
+from .manifest import static_manifest
+
+
+log = logging.getLogger(__name__)
+
+
+TRASH_RUN_FORMAT = "%Y%m%d-%H%M%S"
+
+
+@dataclass
+class StaticGCReport:
+    scanned_files: int = 0
+    referenced_files: int = 0
+    orphaned_files: int = 0
+    orphaned_bytes: int = 0
+    purged_files: int = 0
+    purged_bytes: int = 0
+    dry_run: bool = False
+
+
+class StaticGCService(BaseService):
+    """
+    Moves static files no longer referenced by the database to the
+    trash directory, and deletes trash older than the retention.
+
+    A file is referenced by a product photo link, a photo variant,
+    the main photo snapshot of an order item or a static_file row
+    with references. Files modified within the grace period are
+    kept, so uploads not yet committed are safe. Only the upload
+    directory is collected, catalog sources and assets elsewhere in
+    the static directory are never touched.
+    """
+
+    async def get_referenced_paths(self) -> set[str]:
+        paths = set()
+        async with self.uow:
+            async for link in self.uow.product_photo.stream_links():
+                path = get_static_relative_path(link)
+                if path:
+                    paths.add(os.path.normpath(path))
+            # orders keep showing the photo after it leaves the product
+            async for link in self.uow.order_item.stream_main_photos():
+                path = get_static_relative_path(link)
+                if path:
+                    paths.add(os.path.normpath(path))
+            async for path in self.uow.static_file.stream_referenced_paths():
+                paths.add(path)
+        return paths
+
+    @staticmethod
+    def _find_orphans(
+        referenced: set[str], modified_before: float, report: StaticGCReport
+    ) -> list[tuple[str, int]]:
+        static_directory = os.path.realpath(settings.static.directory)
+        upload_directory = os.path.join(
+            static_directory, settings.static.upload_dir
+        )
+        trash_directory = os.path.realpath(settings.static.gc_trash_dir)
+        orphans = []
+        if not os.path.isdir(upload_directory):
+            return orphans
+        stack = [upload_directory]
+        while stack:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    # temp files of uploads and scripts
+                    if entry.name.startswith("."):
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.path != trash_directory:
+                            stack.append(entry.path)
+                        continue
+                    if not entry.is_file(follow_symlinks=False):
+                        continue
+                    report.scanned_files += 1
+                    path = os.path.relpath(entry.path, static_directory)
+                    if path in referenced:
+                        continue
+                    stat = entry.stat(follow_symlinks=False)
+                    if stat.st_mtime < modified_before:
+                        orphans.append((path, stat.st_size))
+        return orphans
+
+    @staticmethod
+    def _move_to_trash(orphans: list[tuple[str, int]]) -> list[str]:
+        run_directory = os.path.join(
+            settings.static.gc_trash_dir,
+            datetime.now().strftime(TRASH_RUN_FORMAT),
+        )
+        moved = []
+        for path, _ in orphans:
+            target = os.path.join(run_directory, path)
+            try:
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                shutil.move(
+                    os.path.join(settings.static.directory, path), target
+                )
+            except FileNotFoundError:
+                continue
+            moved.append(path)
+        return moved
+
+    @staticmethod
+    def _purge_trash(created_before: float, report: StaticGCReport) -> None:
+        """Deletes trash runs older than the retention."""
+        try:
+            entries = os.scandir(settings.static.gc_trash_dir)
+        except FileNotFoundError:
+            return
+        with entries:
+            runs = [entry.path for entry in entries if entry.is_dir()]
+        for run_directory in runs:
+            try:
+                created_at = datetime.strptime(
+                    os.path.basename(run_directory), TRASH_RUN_FORMAT
+                ).timestamp()
+            except ValueError:
+                continue
+            if created_at >= created_before:
+                continue
+            for root, _, filenames in os.walk(run_directory):
+                for filename in filenames:
+                    report.purged_files += 1
+                    report.purged_bytes += os.path.getsize(
+                        os.path.join(root, filename)
+                    )
+            shutil.rmtree(run_directory, ignore_errors=True)
+
+    async def collect(
+        self, dry_run: bool = False, grace_period: int | None = None
+    ) -> StaticGCReport:
+        if grace_period is None:
+            grace_period = settings.static.gc_grace_period
+        report = StaticGCReport(dry_run=dry_run)
+        referenced = await self.get_referenced_paths()
+        report.referenced_files = len(referenced)
+        if not referenced:
+            # an empty or wrong database must not empty the static dir
+            log.warning("No referenced static files found, GC skipped")
+            return report
+
+        now = time.time()
+        orphans = await asyncio.to_thread(
+            self._find_orphans, referenced, now - grace_period, report
+        )
+        report.orphaned_files = len(orphans)
+        report.orphaned_bytes = sum(size for _, size in orphans)
+        if dry_run:
+            return report
+
+        moved = await asyncio.to_thread(self._move_to_trash, orphans)
+        for path in moved:
+            static_manifest.discard(path)
+        if moved:
+            async with self.uow:
+                await self.uow.static_file.delete_unreferenced(moved)
+                await self.uow.commit()
+        await asyncio.to_thread(
+            self._purge_trash, now - settings.static.gc_trash_retention, report
+        )
+        log.info("Static GC: %s", report)
+        return report
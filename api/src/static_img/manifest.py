@@ -0,0 +1,154 @@
+import asyncio
+import logging
+import os
+import time
+
+from ..core.config import settings
+
+try:
+    import watchfiles
+except ImportError:  # installed with uvicorn[standard]
+    watchfiles = None
+
+
+log = logging.getLogger(__name__)
+
+
+class StaticManifest:
+    """
+    In-memory index of the static directory, path -> size.
+
+    Built once in a background task at startup and kept fresh by
+    watching the directory (watchfiles, when installed) or by a
+    periodic rescan. Uploads register their files directly, so new
+    photos are visible before the next refresh. Until the first
+    build finishes, ``ready`` is False and queries see an empty index.
+    """
+
+    def __init__(self, directory: str) -> None:
+        self.directory = os.path.realpath(directory)
+        self.files: dict[str, int] = {}
+        self.ready = False
+        self.built_at: float | None = None
+        self.task: asyncio.Task | None = None
+
+    def _scan(self) -> dict[str, int]:
+        files = {}
+        stack = [self.directory]
+        while stack:
+            try:
+                entries = os.scandir(stack.pop())
+            except FileNotFoundError:
+                continue
+            with entries:
+                for entry in entries:
+                    # temp files of uploads and scripts
+                    if entry.name.startswith("."):
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        files[
+                            os.path.relpath(entry.path, self.directory)
+                        ] = entry.stat(follow_symlinks=False).st_size
+        return files
+
+    async def refresh(self) -> None:
+        """Rebuilds the index off the event loop and swaps it in."""
+        started = time.monotonic()
+        files = await asyncio.to_thread(self._scan)
+        self.files = files
+        self.ready = True
+        self.built_at = time.time()
+        log.info(
+            "Static manifest built: %s files in %.2fs",
+            len(files),
+            time.monotonic() - started,
+        )
+
+    def add(self, path: str, size: int) -> None:
+        self.files[path] = size
+
+    def discard(self, path: str) -> None:
+        self.files.pop(path, None)
+
+    def _apply_changes(self, changes: set) -> None:
+        for change, path in changes:
+            relative_path = os.path.relpath(path, self.directory)
+            if os.path.basename(path).startswith("."):
+                continue
+            if change == watchfiles.Change.deleted:
+                self.discard(relative_path)
+                # a removed directory reports only itself
+                prefix = relative_path + os.sep
+                for file_path in [p for p in self.files if p.startswith(prefix)]:
+                    self.discard(file_path)
+            elif os.path.isfile(path):
+                self.add(relative_path, os.path.getsize(path))
+
+    async def _watch(self) -> None:
+        async for changes in watchfiles.awatch(
+            self.directory,
+            recursive=True,
+            rust_timeout=settings.static.manifest_refresh_interval * 1000,
+            yield_on_timeout=True,
+        ):
+            if changes:
+                self._apply_changes(changes)
+            else:
+                # timeout, resync in case events were missed
+                await self.refresh()
+
+    async def _poll(self) -> None:
+        while True:
+            await asyncio.sleep(settings.static.manifest_refresh_interval)
+            try:
+                await self.refresh()
+            except Exception as e:
+                log.exception(e)
+
+    async def _run(self) -> None:
+        try:
+            await self.refresh()
+        except Exception as e:
+            log.exception(e)
+        if watchfiles is not None and settings.static.manifest_watch:
+            try:
+                await self._watch()
+            except Exception as e:
+                # fall back to polling
+                log.exception(e)
+        await self._poll()
+
+    def start(self) -> None:
+        if self.task is None:
+            self.task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+
+    @property
+    def count(self) -> int:
+        return len(self.files)
+
+    @property
+    def total_size(self) -> int:
+        return sum(self.files.values())
+
+    def exists(self, path: str) -> bool:
+        return os.path.normpath(path) in self.files
+
+    def list_files(
+        self, prefix: str = "", limit: int = 20, offset: int = 0
+    ) -> list[str]:
+        paths = sorted(p for p in self.files if p.startswith(prefix))
+        return paths[offset : offset + limit]
+
+
+static_manifest = StaticManifest(settings.static.directory)
@@ -0,0 +1,32 @@
+from sqlalchemy import String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from ..core.db.base import Base
+from ..core.db.mixins import BaseModelMixin
+
+
+class StaticFile(BaseModelMixin, Base):
+    __tablename__ = "static_file"
+    __label__ = "Static file"
+
+    path: Mapped[str] = mapped_column(
+        unique=True,
+        nullable=False,
+        doc="Path inside the static directory",
+    )
+    content_hash: Mapped[str] = mapped_column(
+        String(64),
+        nullable=False,
+        index=True,
+        doc="SHA-256 of the file content",
+    )
+    size: Mapped[int] = mapped_column(nullable=False, doc="Size in bytes")
+    ref_count: Mapped[int] = mapped_column(
+        nullable=False,
+        default=0,
+        server_default="0",
+        doc="Number of rows referencing the file",
+    )
+
+    def __str__(self) -> str:
+        return f"Static file: {self.path}"
@@ -0,0 +1,55 @@
+import os
+
+from PIL import Image, ImageOps, features
+
+
+class ImageDecodeError(Exception):
+    """The source file is not an image Pillow can decode."""
+
+
+def is_format_supported(image_format: str) -> bool:
+    if image_format in ("webp", "avif"):
+        return features.check(image_format)
+    return True
+
+
+def resize_image(
+    source_path: str,
+    target_path: str,
+    width: int | None,
+    height: int | None,
+    image_format: str,
+) -> None:
+    """
+    Resizes the image to fit into width x height, keeping the aspect
+    ratio and never upscaling, and atomically writes it to
+    target_path. Raises ImageDecodeError for files that are not
+    images. Runs in a worker process.
+    """
+    try:
+        with Image.open(source_path) as image:
+            image = ImageOps.exif_transpose(image)
+            box = (
+                min(width or image.width, image.width),
+                min(height or image.height, image.height),
+            )
+            image = ImageOps.contain(image, box, Image.Resampling.LANCZOS)
+            if image_format == "jpeg" or image.mode not in ("RGB", "RGBA"):
+                image = image.convert(
+                    "RGBA"
+                    if image_format != "jpeg" and "A" in image.getbands()
+                    else "RGB"
+                )
+    except (OSError, ValueError, Image.DecompressionBombError) as e:
+        # raised as a plain exception, so it crosses the process boundary
+        raise ImageDecodeError(str(e)) from None
+
+    os.makedirs(os.path.dirname(target_path), exist_ok=True)
+    temp_path = f"{target_path}.{os.getpid()}.tmp"
+    try:
+        image.save(temp_path, image_format.upper(), quality=80)
+        os.replace(temp_path, target_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
@@ -0,0 +1,45 @@
+from typing import Optional
+
+from fastapi import APIRouter, Query
+from fastapi.responses import FileResponse
+
+from ..core.config import settings
+from ..utils.exceptions.http.static import ImageResizeParamsException
+
+from .enums import ImageFormatEnum
+from .service import image_resize_service
+
+
+router = APIRouter(
+    prefix="/static-img",
+    tags=["Static images"],
+)
+
+
+@router.get("/{path:path}", response_class=FileResponse)
+async def get_resized_image(
+    path: str,
+    w: Optional[int] = Query(
+        default=None, ge=1, le=settings.static.image_max_dimension
+    ),
+    h: Optional[int] = Query(
+        default=None, ge=1, le=settings.static.image_max_dimension
+    ),
+    fmt: ImageFormatEnum = ImageFormatEnum.WEBP,
+) -> FileResponse:
+    if w is None and h is None:
+        raise ImageResizeParamsException()
+    image_path, key = await image_resize_service.get_resized_image(
+        path=path,
+        width=w,
+        height=h,
+        image_format=fmt,
+    )
+    return FileResponse(
+        image_path,
+        media_type=f"image/{fmt.value}",
+        headers={
+            "Cache-Control": "public, max-age=31536000, immutable",
+            "ETag": f'"{key}"',
+        },
+    )
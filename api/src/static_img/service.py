@@ -0,0 +1,159 @@
+import asyncio
+import hashlib
+import multiprocessing
+import os
+
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from ..core.config import settings
+from ..utils.exceptions.http.static import (
+    ImageDecodeException,
+    ImageNotFoundException,
+    ImageResizeUnavailableException,
+)
+
+from .cache import DiskLRUCache
+from .enums import ImageFormatEnum
+from .resize import ImageDecodeError, is_format_supported, resize_image
+
+
+class ImageResizeService:
+    """
+    Resizes files of the static directory on request.
+
+    Results are cached on disk under a hash of the source content
+    and the requested size and format. Resizes run in a process
+    pool, concurrent requests for the same result share one resize.
+    """
+
+    source_hashes_limit: int = 10000
+
+    def __init__(self) -> None:
+        self.static_directory = os.path.realpath(settings.static.directory)
+        self.cache = DiskLRUCache(
+            settings.static.image_cache_dir,
+            settings.static.image_cache_max_size,
+        )
+        self.executor: ProcessPoolExecutor | None = None
+        self.in_flight: dict[str, asyncio.Future] = {}
+        self.source_hashes: dict[tuple, str] = {}
+
+    def get_executor(self) -> ProcessPoolExecutor:
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(
+                max_workers=settings.static.image_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self.executor
+
+    def drop_executor(self, executor: ProcessPoolExecutor) -> None:
+        """Forgets a broken pool, the next get_executor builds a new one."""
+        if self.executor is executor:
+            self.executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self) -> None:
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+    def get_source_path(self, path: str) -> str:
+        source_path = os.path.realpath(
+            os.path.join(self.static_directory, path)
+        )
+        if not source_path.startswith(
+            self.static_directory + os.sep
+        ) or not os.path.isfile(source_path):
+            raise ImageNotFoundException()
+        return source_path
+
+    @staticmethod
+    def _hash_file(path: str) -> str:
+        file_hash = hashlib.sha256()
+        with open(path, "rb") as file:
+            while chunk := file.read(1024 * 1024):
+                file_hash.update(chunk)
+        return file_hash.hexdigest()
+
+    async def get_source_hash(self, source_path: str) -> str:
+        """Content hash of the source, recomputed only when it changes."""
+        stat = os.stat(source_path)
+        stat_key = (source_path, stat.st_mtime_ns, stat.st_size)
+        source_hash = self.source_hashes.get(stat_key)
+        if source_hash is None:
+            source_hash = await asyncio.to_thread(self._hash_file, source_path)
+            if len(self.source_hashes) >= self.source_hashes_limit:
+                self.source_hashes.clear()
+            self.source_hashes[stat_key] = source_hash
+        return source_hash
+
+    async def _resize(
+        self,
+        source_path: str,
+        target_path: str,
+        width: int | None,
+        height: int | None,
+        image_format: str,
+    ) -> None:
+        loop = asyncio.get_running_loop()
+        # a worker killed mid-resize (e.g. by the OOM killer) breaks
+        # the whole pool, the resize is retried once in a new one
+        for attempt in range(2):
+            executor = self.get_executor()
+            try:
+                await loop.run_in_executor(
+                    executor,
+                    resize_image,
+                    source_path,
+                    target_path,
+                    width,
+                    height,
+                    image_format,
+                )
+                break
+            except BrokenProcessPool:
+                self.drop_executor(executor)
+                if attempt:
+                    raise ImageResizeUnavailableException(
+                        "Image resize failed, try again later"
+                    )
+            except ImageDecodeError:
+                raise ImageDecodeException()
+        await asyncio.to_thread(self.cache.add, target_path)
+
+    async def get_resized_image(
+        self,
+        path: str,
+        width: int | None,
+        height: int | None,
+        image_format: ImageFormatEnum,
+    ) -> tuple[str, str]:
+        """Returns the cached file path and its cache key."""
+        if not is_format_supported(image_format.value):
+            raise ImageResizeUnavailableException()
+        source_path = self.get_source_path(path)
+        source_hash = await self.get_source_hash(source_path)
+        key = hashlib.sha256(
+            f"{source_hash}:{width}:{height}:{image_format.value}".encode()
+        ).hexdigest()
+        target_path = self.cache.get_path(key, image_format.value)
+
+        if await asyncio.to_thread(self.cache.touch, target_path):
+            return target_path, key
+
+        task = self.in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(
+                self._resize(
+                    source_path, target_path, width, height, image_format.value
+                )
+            )
+            self.in_flight[key] = task
+            task.add_done_callback(lambda _: self.in_flight.pop(key, None))
+        # a disconnected client must not cancel the resize others wait for
+        await asyncio.shield(task)
+        return target_path, key
+
+
+image_resize_service = ImageResizeService()
@@ -0,0 +1,12 @@
+from fastapi.staticfiles import StaticFiles
+
+
+class ImmutableStaticFiles(StaticFiles):
+    """Static files whose URLs never change content, cached for a year."""
+
+    def file_response(self, *args, **kwargs):
+        response = super().file_response(*args, **kwargs)
+        response.headers["Cache-Control"] = (
+            "public, max-age=31536000, immutable"
+        )
+        return response
@@ -0,0 +1,18 @@
+import asyncio
+import logging
+
+from ..core.celery import app as celery_app
+from ..core.db.unitofwork import UnitOfWork
+
+from .gc import StaticGCService
+
+
+log = logging.getLogger(__name__)
+
+
+@celery_app.task(name="collect_static_garbage")
+def collect_static_garbage():
+    try:
+        asyncio.run(StaticGCService(UnitOfWork()).collect())
+    except Exception as e:
+        log.exception(e)
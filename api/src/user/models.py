@@ -83,6 +83,7 @@ class AuthToken(BaseModelMixin, Base):
     expires_at: Mapped[datetime.datetime] = mapped_column(
         server_default=text("NOW() + INTERVAL '1 day'"),
         nullable=False,
+        index=True,
         doc="Expires at",
     )
 
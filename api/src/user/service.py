@@ -6,6 +6,7 @@ from typing import Optional
 
 from sqlalchemy.exc import SQLAlchemyError
 
+from ..core.db.purge import PurgeReport, purge_in_batches
 from ..core.db.service import BaseService
 from ..core.dependencies import PaginationParams
 
@@ -33,7 +34,6 @@ from ..utils.exceptions.http.user import (
 
 from ..utils.token import generate_token
 
-from .models import User, AuthToken
 from .schemas import (
     UserCreate,
     AdminUserCreate,
@@ -64,17 +64,7 @@ log = logging.getLogger(__name__)
 
 
 class AuthTokenService(BaseService):
-    async def get_show_scheme(self, obj: AuthToken) -> UserShow:
-        return AuthTokenShow(
-            id=obj.id,
-            token=obj.token,
-            token_type=obj.token_type,
-            owner_email=obj.owner_email,
-            owner_new_email=obj.owner_new_email,
-            expires_at=obj.expires_at,
-            created_at=obj.created_at,
-            updated_at=obj.updated_at,
-        )
+    show_schema = AuthTokenShow
 
     async def create_auth_token(self, data: AuthTokenCreate) -> AuthTokenShow:
         try:
@@ -89,23 +79,19 @@ class AuthTokenService(BaseService):
             log.exception(e)
             raise ObjectCreateException("Auth token")
 
+    async def purge_expired_tokens(self) -> PurgeReport:
+        return await purge_in_batches(
+            self.uow,
+            "auth_token",
+            lambda limit: self.uow.auth_token.delete_expired(limit),
+        )
+
 
 class UserService(JWTTokensMixin, BaseService):
     list_schema = UserListSchema
+    show_schema = UserShow
     filter_processor = UserFilterProcessor
 
-    async def get_show_scheme(self, obj: User) -> UserShow:
-        return UserShow(
-            id=obj.id,
-            email=obj.email,
-            phone=obj.phone,
-            full_name=obj.full_name,
-            is_active=obj.is_active,
-            is_admin=obj.is_admin,
-            created_at=obj.created_at,
-            updated_at=obj.updated_at,
-        )
-
     async def create_user(
         self,
         data: UserCreate | AdminUserCreate,
@@ -2,12 +2,15 @@ import asyncio
 import logging
 import json
 
+from dataclasses import asdict
+
 from pydantic import ValidationError
 
 from .schemas import AuthTokenShow
 from .utils import AuthTokenEmailManager
 
 from ..core.celery import app as celery_app
+from ..core.db.unitofwork import UnitOfWork
 
 
 log = logging.getLogger(__name__)
@@ -53,3 +56,17 @@ def send_email_change_confirmation_email(token_data: str):
         log.exception(e.errors())
     except Exception as e:
         log.exception(e)
+
+
+@celery_app.task(name="purge_expired_auth_tokens")
+def purge_expired_auth_tokens():
+    # the service module imports this one to queue the emails
+    from .service import AuthTokenService
+
+    try:
+        report = asyncio.run(
+            AuthTokenService(UnitOfWork()).purge_expired_tokens(),
+        )
+        return asdict(report)
+    except Exception as e:
+        log.exception(e)
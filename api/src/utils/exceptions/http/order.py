@@ -66,6 +66,20 @@ class OrderCreateException(HTTPException):
         )
 
 
+class OrderItemReferenceException(HTTPException):
+    def __init__(
+        self,
+        field: str,
+        ids: list[int],
+        headers: Optional[dict[str, Any]] = None,
+    ) -> None:
+        super().__init__(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Order items reference unknown {field}: {ids}",
+            headers=headers,
+        )
+
+
 class OrderUpdateException(HTTPException):
     def __init__(
         self,
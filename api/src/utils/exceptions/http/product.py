@@ -0,0 +1,16 @@
+from typing import Any, Optional
+
+from fastapi import HTTPException, status
+
+
+class ProductImportException(HTTPException):
+    def __init__(
+        self,
+        detail: Any = "Invalid product import file",
+        headers: Optional[dict[str, Any]] = None,
+    ) -> None:
+        super().__init__(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=detail,
+            headers=headers,
+        )
@@ -0,0 +1,17 @@
+from typing import Any, Optional
+
+from fastapi import status
+from fastapi.exceptions import HTTPException
+
+
+class SortProcessException(HTTPException):
+    def __init__(
+        self,
+        detail: Any = "Invalid sort",
+        headers: Optional[dict[str, Any]] = None,
+    ) -> None:
+        super().__init__(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=detail,
+            headers=headers,
+        )
@@ -0,0 +1,69 @@
+from typing import Any, Optional
+
+from fastapi import status
+from fastapi.exceptions import HTTPException
+
+
+class StaticFileUploadException(HTTPException):
+    def __init__(
+        self,
+        detail: Any = "Invalid file upload",
+        headers: Optional[dict[str, Any]] = None,
+    ) -> None:
+        super().__init__(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=detail,
+            headers=headers,
+        )
+
+
+class ImageNotFoundException(HTTPException):
+    def __init__(
+        self,
+        detail: Any = "Image not found",
+        headers: Optional[dict[str, Any]] = None,
+    ) -> None:
+        super().__init__(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=detail,
+            headers=headers,
+        )
+
+
+class ImageResizeParamsException(HTTPException):
+    def __init__(
+        self,
+        detail: Any = "Width or height is required",
+        headers: Optional[dict[str, Any]] = None,
+    ) -> None:
+        super().__init__(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=detail,
+            headers=headers,
+        )
+
+
+class ImageResizeUnavailableException(HTTPException):
+    def __init__(
+        self,
+        detail: Any = "Image format is not supported by this server",
+        headers: Optional[dict[str, Any]] = None,
+    ) -> None:
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=detail,
+            headers=headers,
+        )
+
+
+class ImageDecodeException(HTTPException):
+    def __init__(
+        self,
+        detail: Any = "File is not a valid image",
+        headers: Optional[dict[str, Any]] = None,
+    ) -> None:
+        super().__init__(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=detail,
+            headers=headers,
+        )
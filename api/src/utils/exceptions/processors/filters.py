@@ -27,6 +27,11 @@ class FilterInvalidColumnException(FilterException):
         super().__init__(f"Invalid column: {column} for {model.__label__}")
 
 
+class FilterInvalidValueException(FilterException):
+    def __init__(self, column: str):
+        super().__init__(f"Invalid filter value for column: {column}")
+
+
 class FilterRangeListSizeException(FilterException):
     def __init__(self):
         super().__init__("Filter range length must be 2")
@@ -3,3 +3,19 @@ from ..base import BaseCustomException
 
 class StaticFilesProcessException(BaseCustomException):
     pass
+
+
+class StaticFileValidationException(StaticFilesProcessException):
+    pass
+
+
+class StaticFileExtensionException(StaticFileValidationException):
+    def __init__(self, filename: str):
+        super().__init__(f"File type is not allowed: {filename}")
+
+
+class StaticFileSizeException(StaticFileValidationException):
+    def __init__(self, filename: str, max_size: int):
+        super().__init__(
+            f"File {filename} is larger than {max_size} bytes"
+        )
@@ -0,0 +1,8 @@
+from .base import BaseCustomException
+
+
+class InvalidSortException(BaseCustomException):
+    def __init__(self, sort: str, allowed: list[str]):
+        super().__init__(
+            f"Invalid sort: {sort}, allowed: {', '.join(allowed)}"
+        )
@@ -1,6 +1,11 @@
 from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Optional
 
-from sqlalchemy import Enum
+from sqlalchemy import Boolean, Enum, and_, inspect
+from sqlalchemy.types import JSON
 from sqlalchemy.orm.attributes import InstrumentedAttribute
 
 from .enums import FilterOperator
@@ -8,10 +13,64 @@ from ...exceptions.processors.filters import (
     FilterLenListException,
     FilterInvalidColumnException,
     FilterInvalidOperatorException,
+    FilterInvalidValueException,
     FilterRangeListSizeException,
 )
 
 
+EQUALITY_OPERATORS = frozenset(
+    (FilterOperator.EQUALS.value, FilterOperator.VALUE_IN.value)
+)
+ALL_OPERATORS = frozenset(FilterOperator.values())
+
+
+@dataclass(frozen=True)
+class FilterColumn:
+    """Filterable column of a model, inspected once per model."""
+
+    attr: InstrumentedAttribute
+    enum_class: Optional[type] = None
+    operators: frozenset = ALL_OPERATORS
+
+
+@lru_cache(maxsize=None)
+def get_filter_columns(model) -> dict[str, FilterColumn]:
+    """
+    Builds the registry of filterable columns of the model.
+    Booleans and enums only support equality operators,
+    JSON columns are not filterable.
+    """
+    columns = {}
+    for key, column in inspect(model).columns.items():
+        column_type = column.type
+        if isinstance(column_type, JSON):
+            continue
+        if isinstance(column_type, Enum):
+            columns[key] = FilterColumn(
+                attr=getattr(model, key),
+                enum_class=column_type.enum_class,
+                operators=EQUALITY_OPERATORS,
+            )
+        elif isinstance(column_type, Boolean):
+            columns[key] = FilterColumn(
+                attr=getattr(model, key),
+                operators=EQUALITY_OPERATORS,
+            )
+        else:
+            columns[key] = FilterColumn(attr=getattr(model, key))
+    return columns
+
+
+@lru_cache(maxsize=None)
+def get_relation_filter_processor(model) -> type["FilterProcessor"]:
+    """Returns a plain processor filtering the related model of a dotted path."""
+    return type(
+        f"{model.__name__}RelationFilterProcessor",
+        (FilterProcessor,),
+        {"model": model},
+    )
+
+
 class AbstractFilterProcessor(ABC):
     model = None
 
@@ -65,50 +124,102 @@ class AbstractFilterProcessor(ABC):
 
 
 class FilterProcessor(AbstractFilterProcessor):
+    """
+    Compiles decoded filters into SQL expressions.
+
+    Columns are read from a registry built when the subclass is
+    defined. Dotted paths such as "category.name" or
+    "photos.color_id" filter through relationships with has()
+    for scalar and any() for list relationships. Compiled
+    filters are kept per processor in an LRU keyed by the
+    encoded filter string.
+    """
+
+    columns: dict[str, FilterColumn] = {}
+    # hybrid properties with SQL expressions, filterable like columns
+    hybrid_columns: tuple[str, ...] = ()
+    compiled_cache_size: int = 256
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        if cls.model is not None:
+            cls.columns = get_filter_columns(cls.model)
+            if cls.hybrid_columns:
+                cls.columns = {
+                    **cls.columns,
+                    **{
+                        name: FilterColumn(attr=getattr(cls.model, name))
+                        for name in cls.hybrid_columns
+                    },
+                }
+        cls._compiled_filters = OrderedDict()
+
     def __init__(self) -> None:
         super().__init__()
 
-    async def process_equals(self, field: str, value: str):
-        print("process_equals")
-        print(field, value)
-        return [getattr(self.model, field) == value]
+    async def process_equals(self, field: str, value: Any):
+        return [self.columns[field].attr == value]
 
     async def process_range(self, field: str, range_values: list):
         if len(range_values) != 2:
             raise FilterRangeListSizeException()
-        return [getattr(self.model, field).between(*range_values)]
+        return [self.columns[field].attr.between(*range_values)]
 
     async def process_value_in(self, field: str, values: list):
-        print("process_value_in")
-        return [getattr(self.model, field).in_(values)]
+        return [self.columns[field].attr.in_(values)]
 
-    async def process_value_more_than(self, field: str, value: str):
-        return [getattr(self.model, field) > value]
+    async def process_value_more_than(self, field: str, value: Any):
+        return [self.columns[field].attr > value]
 
-    async def process_value_less_than(self, field: str, value: str):
-        return [getattr(self.model, field) < value]
+    async def process_value_less_than(self, field: str, value: Any):
+        return [self.columns[field].attr < value]
 
-    async def process_value_more_than_or_equals(self, field: str, value: str):
-        return [getattr(self.model, field) >= value]
+    async def process_value_more_than_or_equals(self, field: str, value: Any):
+        return [self.columns[field].attr >= value]
 
-    async def process_value_less_than_or_equals(self, field: str, value: str):
-        return [getattr(self.model, field) <= value]
+    async def process_value_less_than_or_equals(self, field: str, value: Any):
+        return [self.columns[field].attr <= value]
 
     async def process_filters(self, filters: list):
         filters_list = []
         for filter_lst in filters:
             filters_list.extend(await self.process_filter(filter_lst))
-        print(filters_list)
         return filters_list
 
-    async def __get_column_enum(self, column: str):
-        column = getattr(self.model, column)
-        if isinstance(column, InstrumentedAttribute) and isinstance(
-            column.property.columns[0].type,
-            Enum,
-        ):
-            return column.property.columns[0].type.enum_class
-        return None
+    async def process_encoded_filters(
+        self, encoded_filters: str, filters: list
+    ) -> list:
+        """
+        Same as process_filters, but the result is cached under
+        the encoded filter string the filters were decoded from.
+        """
+        compiled_filters = self._compiled_filters
+        if encoded_filters in compiled_filters:
+            compiled_filters.move_to_end(encoded_filters)
+            return list(compiled_filters[encoded_filters])
+        processed_filters = await self.process_filters(filters)
+        compiled_filters[encoded_filters] = tuple(processed_filters)
+        if len(compiled_filters) > self.compiled_cache_size:
+            compiled_filters.popitem(last=False)
+        return processed_filters
+
+    async def process_relation_filter(
+        self, column: str, operator: str, value: Any
+    ):
+        relation_name, related_column = column.split(".", 1)
+        relationship = inspect(self.model).relationships.get(relation_name)
+        if relationship is None:
+            raise FilterInvalidColumnException(column, self.model)
+        related_processor = get_relation_filter_processor(
+            relationship.mapper.class_
+        )()
+        related_filters = await related_processor.process_filter(
+            [related_column, operator, value]
+        )
+        relation_attr = getattr(self.model, relation_name)
+        if relationship.uselist:
+            return [relation_attr.any(and_(*related_filters))]
+        return [relation_attr.has(and_(*related_filters))]
 
     async def process_filter(self, filter_lst: list):
         if len(filter_lst) != 3:
@@ -116,16 +227,30 @@ class FilterProcessor(AbstractFilterProcessor):
 
         column, operator, value = filter_lst
 
-        if not hasattr(self.model, column):
-            raise FilterInvalidColumnException(column, self.model)
-        if operator not in FilterOperator.values():
+        if operator not in ALL_OPERATORS:
             raise FilterInvalidOperatorException(operator)
+        if "." in column:
+            return await self.process_relation_filter(column, operator, value)
 
-        enum_class = await self.__get_column_enum(column)
-        if enum_class:
-            value = enum_class(value)
-
-        print(column, operator, value)
+        filter_column = self.columns.get(column)
+        if filter_column is None:
+            raise FilterInvalidColumnException(column, self.model)
+        if operator not in filter_column.operators:
+            raise FilterInvalidOperatorException(operator)
+        if operator in (FilterOperator.RANGE, FilterOperator.VALUE_IN):
+            if not isinstance(value, list):
+                raise FilterInvalidValueException(column)
+        elif isinstance(value, (list, dict)):
+            raise FilterInvalidValueException(column)
+
+        if filter_column.enum_class:
+            try:
+                if isinstance(value, list):
+                    value = [filter_column.enum_class(item) for item in value]
+                else:
+                    value = filter_column.enum_class(value)
+            except ValueError:
+                raise FilterInvalidValueException(column)
 
         if operator == FilterOperator.EQUALS:
             return await self.process_equals(column, value)
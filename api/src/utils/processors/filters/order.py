@@ -5,3 +5,4 @@ from ....order.models import Order
 
 class OrderFilterProcessor(FilterProcessor):
     model = Order
+    hybrid_columns = ("total_value", "total_items")
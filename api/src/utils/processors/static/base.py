@@ -1,61 +1,139 @@
-import shutil
-import unicodedata
-import re
+import asyncio
+import hashlib
+import os
+import uuid
 import logging
 
+import aiofiles
+import aiofiles.os
+
 from fastapi import UploadFile
 
 from .dataclasses import StaticFileProcessResponse
-from ...exceptions.processors.static import StaticFilesProcessException
+from ...exceptions.processors.static import (
+    StaticFilesProcessException,
+    StaticFileExtensionException,
+    StaticFileSizeException,
+)
 from ....core.config import settings
+from ....static_img.manifest import static_manifest
 
 
 log = logging.getLogger(__name__)
 
 
+def get_static_relative_path(link: str) -> str | None:
+    """Maps a static file link to its path inside the static directory."""
+    static_prefix = (
+        f"/{os.path.basename(os.path.normpath(settings.static.directory))}/"
+    )
+    _, separator, relative_path = link.partition(static_prefix)
+    if not separator or not relative_path:
+        return None
+    return relative_path
+
+
 class StaticFilesProcessor:
+    """
+    Stores uploads under their content hash, e.g.
+    uploads/ab/cd/abcd....webp, so a stored file never changes and
+    identical uploads share one file.
+    """
+
+    chunk_size: int = 1024 * 1024
+
     def __init__(self, base_url: str, uploaded_file: UploadFile) -> None:
         self.base_url = base_url
         self.file = uploaded_file
 
     @property
     def file_format(self) -> str:
-        return self.file.filename.split(".")[-1]
+        return self.file.filename.split(".")[-1].lower()
 
-    @property
-    def filename(self) -> str:
-        return self.file.filename.replace(f".{self.file_format}", "")
+    def _validate_extension(self) -> None:
+        if (
+            "." not in self.file.filename
+            or f".{self.file_format}" not in settings.static.allowed_extensions
+        ):
+            raise StaticFileExtensionException(self.file.filename)
 
-    @property
-    def full_filename(self) -> str:
-        return f"{self._normalize_filename(self.filename)}.{self.file_format}"
-
-    def _normalize_filename(self, filename: str) -> str:
-        value = (
-            unicodedata.normalize("NFKD", filename)
-            .encode("ascii", "ignore")
-            .decode("ascii")
+    def _validate_size(self, size: int | None) -> None:
+        if size is not None and size > settings.static.max_file_size:
+            raise StaticFileSizeException(
+                self.file.filename, settings.static.max_file_size
+            )
+
+    def _get_relative_path(self, content_hash: str) -> str:
+        return "/".join(
+            (
+                settings.static.upload_dir,
+                content_hash[:2],
+                content_hash[2:4],
+                f"{content_hash}.{self.file_format}",
+            )
         )
-        value = re.sub(r"[^\w\s-]", "", value.lower())
-        return re.sub(r"[-\s]+", "-", value).strip("-_")
 
-    async def _process_file(self) -> str:
+    async def _process_file(self) -> tuple[str, str, int]:
+        """
+        Streams the upload in chunks into a temp file, hashing it on
+        the way, then renames it to its content addressed path. If
+        that file exists already, the temp file is dropped. Reads
+        and writes run in threads, not on the event loop.
+        """
+        self._validate_extension()
+        self._validate_size(self.file.size)
+
+        upload_directory = os.path.join(
+            settings.static.directory, settings.static.upload_dir
+        )
+        temp_path = os.path.join(
+            upload_directory, f".{uuid.uuid4().hex}.upload"
+        )
+        content_hash = hashlib.sha256()
+        written = 0
         try:
-            with open(
-                f"{settings.static.directory}/{self.full_filename}", "wb"
-            ) as buffer:
-                shutil.copyfileobj(self.file.file, buffer)
+            await aiofiles.os.makedirs(upload_directory, exist_ok=True)
+            async with aiofiles.open(temp_path, "wb") as buffer:
+                while chunk := await self.file.read(self.chunk_size):
+                    written += len(chunk)
+                    self._validate_size(written)
+                    content_hash.update(chunk)
+                    await buffer.write(chunk)
+            relative_path = self._get_relative_path(content_hash.hexdigest())
+            path = os.path.join(settings.static.directory, relative_path)
+            if await aiofiles.os.path.exists(path):
+                await self._remove_temp_file(temp_path)
+                # fresh mtime keeps the file out of the GC grace period
+                await asyncio.to_thread(os.utime, path)
+            else:
+                await aiofiles.os.makedirs(
+                    os.path.dirname(path), exist_ok=True
+                )
+                await aiofiles.os.replace(temp_path, path)
+        except (StaticFilesProcessException, asyncio.CancelledError):
+            await self._remove_temp_file(temp_path)
+            raise
         except Exception as e:
             log.exception(e)
+            await self._remove_temp_file(temp_path)
             raise StaticFilesProcessException("Error processing file")
+        static_manifest.add(relative_path, written)
+        return relative_path, content_hash.hexdigest(), written
 
-    async def _get_file_link(self) -> str:
-        return (
-            f"{self.base_url}{settings.static.directory}/{self.full_filename}"
-        )
+    async def _remove_temp_file(self, temp_path: str) -> None:
+        try:
+            await aiofiles.os.remove(temp_path)
+        except FileNotFoundError:
+            pass
+
+    async def _get_file_link(self, relative_path: str) -> str:
+        return f"{self.base_url}{settings.static.directory}/{relative_path}"
 
     async def process(self) -> StaticFileProcessResponse:
-        await self._process_file()
+        relative_path, content_hash, size = await self._process_file()
         return StaticFileProcessResponse(
-            link=await self._get_file_link(),
+            link=await self._get_file_link(relative_path),
+            path=relative_path,
+            content_hash=content_hash,
+            size=size,
         )
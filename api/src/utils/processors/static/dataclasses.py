@@ -4,3 +4,6 @@ from dataclasses import dataclass
 @dataclass
 class StaticFileProcessResponse:
     link: str
+    path: str
+    content_hash: str
+    size: int
@@ -0,0 +1,243 @@
+import asyncio
+
+import pytest
+
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.schema import CreateIndex
+
+from src.order.models import BASKET_ITEM_VARIANT_COLUMNS, BasketItem
+from src.order.service import BasketService
+from src.repositories.order import BasketItemRepository
+
+
+class FakeResult:
+    def __init__(self, rows: list) -> None:
+        self.rows = rows
+
+    def scalars(self) -> "FakeResult":
+        return self
+
+    def all(self) -> list:
+        return self.rows
+
+
+class FakeSession:
+    """Records the statements instead of running them."""
+
+    def __init__(self) -> None:
+        self.statements = []
+
+    async def execute(self, stmt) -> FakeResult:
+        self.statements.append(stmt)
+        return FakeResult([])
+
+
+def compile_sql(stmt) -> str:
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+def inserted_rows(stmt) -> list[dict]:
+    """Rows of a multi VALUES insert, by column name."""
+    params = stmt.compile(dialect=postgresql.dialect()).params
+    rows = {}
+    for key, value in params.items():
+        column, _, row = key.rpartition("_m")
+        rows.setdefault(int(row), {})[column] = value
+    return [rows[row] for row in sorted(rows)]
+
+
+def make_item(product_id: int, quantity: int = 1, **variant) -> dict:
+    return {
+        **dict.fromkeys(BASKET_ITEM_VARIANT_COLUMNS),
+        "basket_id": 1,
+        "product_id": product_id,
+        "quantity": quantity,
+        **variant,
+    }
+
+
+def test_upsert_sums_duplicate_variants_into_one_row():
+    session = FakeSession()
+
+    asyncio.run(
+        BasketItemRepository(session).upsert(
+            [
+                make_item(1, 2),
+                make_item(1, 3),
+                make_item(1, 1, color_id=4),
+                make_item(2, 5),
+            ]
+        )
+    )
+
+    (stmt,) = session.statements
+    assert [
+        (row["product_id"], row["color_id"], row["quantity"])
+        for row in inserted_rows(stmt)
+    ] == [(1, None, 5), (1, 4, 1), (2, None, 5)]
+
+
+def test_upsert_treats_null_variant_columns_as_one_variant():
+    session = FakeSession()
+
+    asyncio.run(
+        BasketItemRepository(session).upsert(
+            [
+                make_item(1, 1, size_id=None, with_glass=None),
+                make_item(1, 1, size_id=None, with_glass=None),
+                make_item(1, 1, size_id=2, with_glass=False),
+            ]
+        )
+    )
+
+    rows = inserted_rows(session.statements[0])
+    assert [
+        (row["size_id"], row["with_glass"], row["quantity"]) for row in rows
+    ] == [(None, None, 2), (2, False, 1)]
+
+
+def test_upsert_adds_quantity_on_conflict():
+    session = FakeSession()
+
+    asyncio.run(BasketItemRepository(session).upsert([make_item(1)]))
+
+    sql = compile_sql(session.statements[0])
+    conflict_target = ", ".join(BASKET_ITEM_VARIANT_COLUMNS)
+    assert f"ON CONFLICT ({conflict_target}) DO UPDATE" in sql
+    assert "quantity = (basket_item.quantity + excluded.quantity)" in sql
+    assert sql.endswith("RETURNING basket_item.id")
+
+
+def test_upsert_without_items_runs_nothing():
+    session = FakeSession()
+
+    assert asyncio.run(BasketItemRepository(session).upsert([])) == []
+    assert session.statements == []
+
+
+def test_conflict_target_is_a_nulls_not_distinct_unique_index():
+    # ON CONFLICT only matches lines with NULL variant columns when
+    # the arbiter index treats NULLs as equal
+    (index,) = (
+        index
+        for index in BasketItem.__table__.indexes
+        if index.name == "uq_basket_item_variant"
+    )
+
+    assert index.unique
+    assert [column.name for column in index.columns] == list(
+        BASKET_ITEM_VARIANT_COLUMNS
+    )
+    assert compile_sql(CreateIndex(index)).endswith("NULLS NOT DISTINCT")
+
+
+def test_move_to_basket_sums_into_the_target_basket():
+    session = FakeSession()
+
+    asyncio.run(BasketItemRepository(session).move_to_basket(7, 3))
+
+    sql = compile_sql(session.statements[0])
+    assert sql.startswith(
+        f"INSERT INTO basket_item ({', '.join(BASKET_ITEM_VARIANT_COLUMNS)}"
+        ", quantity) SELECT"
+    )
+    assert "WHERE basket_item.basket_id = %(basket_id_1)s" in sql
+    assert "quantity = (basket_item.quantity + excluded.quantity)" in sql
+
+
+class FakeBasketRepository:
+    def __init__(self, guest_basket_id: int | None) -> None:
+        self.guest_basket_id = guest_basket_id
+        self.deleted = []
+
+    async def get_guest_id_by_token(self, token: str) -> int | None:
+        return self.guest_basket_id
+
+    async def delete_by_id(self, obj_id: int) -> None:
+        self.deleted.append(obj_id)
+
+
+class FakeUnitOfWork:
+    def __init__(
+        self, guest_basket_id: int | None = None, fail_commit: bool = False
+    ) -> None:
+        self.session = FakeSession()
+        self.basket = FakeBasketRepository(guest_basket_id)
+        self.basket_item = BasketItemRepository(self.session)
+        self.fail_commit = fail_commit
+        self.committed = False
+
+    async def commit(self) -> None:
+        if self.fail_commit:
+            raise SQLAlchemyError("commit failed")
+        self.committed = True
+
+
+class FakeGuestStore:
+    enabled = True
+
+    def __init__(self, items: list[dict]) -> None:
+        self.items = items
+        self.restored = None
+
+    async def take(self, token: str) -> list[dict]:
+        items, self.items = self.items, None
+        return items
+
+    async def restore(self, token: str, items: list[dict]) -> None:
+        self.restored = items
+
+
+def merge_guest_basket(
+    uow: FakeUnitOfWork, guest_items: list[dict]
+) -> FakeGuestStore:
+    service = BasketService(uow)
+    service.guest_store = FakeGuestStore(guest_items)
+    asyncio.run(service._merge_guest_basket(3, "guest-token"))
+    return service.guest_store
+
+
+def test_merge_upserts_guest_items_into_the_user_basket():
+    uow = FakeUnitOfWork()
+
+    guest_store = merge_guest_basket(
+        uow,
+        [
+            {"id": 1, "product_id": 1, "quantity": 2},
+            {"id": 2, "product_id": 1, "quantity": 1, "color_id": None},
+            {"id": 3, "product_id": 1, "quantity": 4, "color_id": 5},
+        ],
+    )
+
+    (stmt,) = uow.session.statements
+    assert [
+        (row["basket_id"], row["color_id"], row["quantity"])
+        for row in inserted_rows(stmt)
+    ] == [(3, None, 3), (3, 5, 4)]
+    assert uow.committed
+    assert guest_store.items is None
+    assert guest_store.restored is None
+
+
+def test_merge_moves_a_database_guest_basket():
+    uow = FakeUnitOfWork(guest_basket_id=7)
+
+    merge_guest_basket(uow, [])
+
+    (stmt,) = uow.session.statements
+    assert compile_sql(stmt).startswith("INSERT INTO basket_item")
+    assert uow.basket.deleted == [7]
+    assert uow.committed
+
+
+def test_failed_merge_restores_the_guest_items():
+    uow = FakeUnitOfWork(fail_commit=True)
+    items = [{"id": 1, "product_id": 1, "quantity": 2}]
+    service = BasketService(uow)
+    service.guest_store = FakeGuestStore(items)
+
+    with pytest.raises(SQLAlchemyError):
+        asyncio.run(service._merge_guest_basket(3, "guest-token"))
+
+    assert service.guest_store.restored == items
@@ -0,0 +1,121 @@
+import asyncio
+import base64
+import json
+
+import pytest
+
+from sqlalchemy.dialects import postgresql
+
+from src.utils.exceptions.processors.filters import (
+    FilterInvalidColumnException,
+    FilterInvalidOperatorException,
+    FilterInvalidValueException,
+)
+from src.utils.processors.filters.decoder import FiltersDecoder
+from src.utils.processors.filters.order import OrderFilterProcessor
+from src.utils.processors.filters.product import ProductFilterProcessor
+
+
+def encode_filters(filters: list) -> str:
+    """Encodes filters the way the frontend sends them."""
+    return (
+        base64.urlsafe_b64encode(json.dumps(filters).encode())
+        .decode()
+        .replace("=", "_")
+        .replace("+", "-")
+        .replace("/", ".")
+    )
+
+
+def compile_filters(processor, filters: list) -> list[str]:
+    expressions = asyncio.run(processor.process_filters(filters))
+    return [
+        str(
+            expression.compile(
+                dialect=postgresql.dialect(),
+                compile_kwargs={"literal_binds": True},
+            )
+        )
+        for expression in expressions
+    ]
+
+
+def test_decoder_reads_encoded_filters():
+    filters = [["price", "><", [100, 2500]], ["category.name", "=", "Двері"]]
+
+    assert FiltersDecoder(encode_filters(filters)).decoded_filters == filters
+
+
+def test_relation_filter_on_scalar_relationship_uses_exists():
+    (sql,) = compile_filters(
+        ProductFilterProcessor(), [["category.name", "=", "Doors"]]
+    )
+
+    assert sql.startswith("EXISTS (SELECT 1")
+    assert "category.id = product.category_id" in sql
+    assert "category.name = 'Doors'" in sql
+
+
+def test_relation_filter_on_list_relationship_uses_exists():
+    (sql,) = compile_filters(
+        ProductFilterProcessor(), [["photos.color_id", "in", [1, 2]]]
+    )
+
+    assert sql.startswith("EXISTS (SELECT 1")
+    assert "product.id = product_photo.product_id" in sql
+    assert "product_photo.color_id IN (1, 2)" in sql
+
+
+def test_relation_filter_checks_related_columns():
+    with pytest.raises(FilterInvalidColumnException):
+        compile_filters(ProductFilterProcessor(), [["category.nope", "=", 1]])
+    with pytest.raises(FilterInvalidColumnException):
+        compile_filters(ProductFilterProcessor(), [["nope.name", "=", 1]])
+
+
+def test_hybrid_columns_compile_to_their_expressions():
+    range_sql, more_sql = compile_filters(
+        OrderFilterProcessor(),
+        [["total_value", "><", [100, 200]], ["total_items", ">=", 3]],
+    )
+
+    assert "FROM order_item" in range_sql
+    assert range_sql.endswith("BETWEEN 100 AND 200")
+    assert "FROM order_item" in more_sql
+    assert more_sql.endswith(">= 3")
+
+
+def test_hybrid_columns_are_registered_only_on_their_processor():
+    assert "total_value" in OrderFilterProcessor.columns
+    assert OrderFilterProcessor.columns["total_value"].attr is not None
+    assert "total_value" not in ProductFilterProcessor.columns
+
+
+def test_range_and_in_require_lists():
+    with pytest.raises(FilterInvalidValueException):
+        compile_filters(OrderFilterProcessor(), [["total_value", "><", 1]])
+    with pytest.raises(FilterInvalidValueException):
+        compile_filters(ProductFilterProcessor(), [["price", "in", 1]])
+    with pytest.raises(FilterInvalidValueException):
+        compile_filters(ProductFilterProcessor(), [["price", ">", [1]]])
+
+
+def test_boolean_columns_allow_equality_only():
+    with pytest.raises(FilterInvalidOperatorException):
+        compile_filters(ProductFilterProcessor(), [["active", ">", True]])
+
+
+def test_encoded_filters_are_compiled_once():
+    processor = OrderFilterProcessor()
+    filters = [["total_items", ">=", 3]]
+    encoded_filters = encode_filters(filters)
+
+    first = asyncio.run(
+        processor.process_encoded_filters(encoded_filters, filters)
+    )
+    second = asyncio.run(
+        OrderFilterProcessor().process_encoded_filters(encoded_filters, [])
+    )
+
+    assert [str(expr) for expr in second] == [str(expr) for expr in first]
+    assert encoded_filters in OrderFilterProcessor._compiled_filters
@@ -0,0 +1,243 @@
+import asyncio
+
+import pytest
+
+from redis.exceptions import WatchError
+
+from src.order.caching import GuestBasketStore
+
+
+def encode(value) -> bytes:
+    return value if isinstance(value, bytes) else str(value).encode()
+
+
+class FakePipeline:
+    """
+    Pipeline of FakeRedis. Commands run right away until multi(),
+    then they are queued, execute() fails with WatchError when a
+    watched key changed in between, like on a Redis server.
+    """
+
+    def __init__(self, redis: "FakeRedis", transaction: bool) -> None:
+        self.redis = redis
+        self.buffered = transaction
+        self.watched: dict[str, int] = {}
+        self.queue: list[tuple] = []
+
+    async def __aenter__(self) -> "FakePipeline":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.watched = {}
+
+    async def watch(self, *keys: str) -> None:
+        self.buffered = False
+        self.watched = {key: self.redis.versions.get(key, 0) for key in keys}
+
+    def multi(self) -> None:
+        self.buffered = True
+
+    def __getattr__(self, name: str):
+        command = getattr(self.redis, f"_{name}")
+        if self.buffered:
+
+            def queue(*args, **kwargs) -> "FakePipeline":
+                self.queue.append((command, args, kwargs))
+                return self
+
+            return queue
+
+        async def call(*args, **kwargs):
+            # lets concurrent transactions interleave between commands
+            await asyncio.sleep(0)
+            return command(*args, **kwargs)
+
+        return call
+
+    async def execute(self) -> list:
+        queue, self.queue = self.queue, []
+        watched, self.watched = self.watched, {}
+        if any(
+            self.redis.versions.get(key, 0) != version
+            for key, version in watched.items()
+        ):
+            self.redis.conflicts += 1
+            raise WatchError()
+        return [command(*args, **kwargs) for command, args, kwargs in queue]
+
+
+class FakeRedis:
+    """The hash commands GuestBasketStore uses, kept in memory."""
+
+    def __init__(self) -> None:
+        self.data: dict[str, dict[bytes, bytes]] = {}
+        self.versions: dict[str, int] = {}
+        self.conflicts = 0
+
+    def _touch(self, key: str) -> None:
+        self.versions[key] = self.versions.get(key, 0) + 1
+
+    def _hgetall(self, key: str) -> dict:
+        return dict(self.data.get(key, {}))
+
+    def _hset(self, key: str, mapping: dict) -> int:
+        self.data.setdefault(key, {}).update(
+            (encode(field), encode(value)) for field, value in mapping.items()
+        )
+        self._touch(key)
+        return len(mapping)
+
+    def _hdel(self, key: str, *fields) -> int:
+        data = self.data.get(key, {})
+        removed = sum(
+            data.pop(encode(field), None) is not None for field in fields
+        )
+        self._touch(key)
+        return removed
+
+    def _delete(self, key: str) -> int:
+        self._touch(key)
+        return int(self.data.pop(key, None) is not None)
+
+    def _unlink(self, key: str) -> int:
+        return self._delete(key)
+
+    def _expire(self, key: str, seconds: int) -> int:
+        return int(key in self.data)
+
+    def pipeline(self, transaction: bool = True) -> FakePipeline:
+        return FakePipeline(self, transaction)
+
+    async def unlink(self, key: str) -> int:
+        return self._unlink(key)
+
+    async def transaction(self, func, *watches, value_from_callable=False):
+        async with self.pipeline(True) as pipe:
+            while True:
+                try:
+                    await pipe.watch(*watches)
+                    func_value = await func(pipe)
+                    exec_value = await pipe.execute()
+                    return func_value if value_from_callable else exec_value
+                except WatchError:
+                    continue
+
+
+TOKEN = "guest-token"
+
+
+def make_item(product_id: int, quantity: int = 1, **variant) -> dict:
+    return {"product_id": product_id, "quantity": quantity, **variant}
+
+
+@pytest.fixture
+def store() -> GuestBasketStore:
+    store = GuestBasketStore()
+    store.redis = FakeRedis()
+    asyncio.run(store.create(TOKEN))
+    return store
+
+
+def test_concurrent_adds_of_one_variant_sum_up(store):
+    async def add_concurrently():
+        await asyncio.gather(
+            *(
+                store.add_item(TOKEN, make_item(1, quantity=2, color_id=3))
+                for _ in range(20)
+            )
+        )
+        return await store.get_items(TOKEN)
+
+    (item,) = asyncio.run(add_concurrently())
+
+    assert item["quantity"] == 40
+    assert store.redis.conflicts > 0
+
+
+def test_concurrent_adds_of_different_variants_get_own_ids(store):
+    async def add_concurrently():
+        await asyncio.gather(
+            *(
+                store.add_item(TOKEN, make_item(product_id))
+                for product_id in range(1, 11)
+            )
+        )
+        return await store.get_items(TOKEN)
+
+    items = asyncio.run(add_concurrently())
+
+    assert [item["id"] for item in items] == list(range(1, 11))
+    assert sorted(item["product_id"] for item in items) == list(range(1, 11))
+    assert store.redis.conflicts > 0
+
+
+def test_null_variant_columns_are_one_variant(store):
+    async def add_concurrently():
+        await asyncio.gather(
+            store.add_item(TOKEN, make_item(1, color_id=None)),
+            store.add_item(TOKEN, make_item(1)),
+            store.add_item(TOKEN, make_item(1, color_id=2)),
+        )
+        return await store.get_items(TOKEN)
+
+    items = asyncio.run(add_concurrently())
+
+    assert sorted(
+        (item.get("color_id") or 0, item["quantity"]) for item in items
+    ) == [(0, 2), (2, 1)]
+
+
+def test_concurrent_update_and_remove_keep_the_other_items(store):
+    async def change_concurrently():
+        for product_id in (1, 2, 3):
+            await store.add_item(TOKEN, make_item(product_id))
+        await asyncio.gather(
+            store.update_item(TOKEN, 1, {"quantity": 5}),
+            store.remove_item(TOKEN, 2),
+            store.add_item(TOKEN, make_item(4)),
+        )
+        return await store.get_items(TOKEN)
+
+    items = asyncio.run(change_concurrently())
+
+    assert [(item["id"], item["quantity"]) for item in items] == [
+        (1, 5),
+        (3, 1),
+        (4, 1),
+    ]
+
+
+def test_missing_basket_and_item(store):
+    assert asyncio.run(store.add_item("other", make_item(1))) is None
+    assert asyncio.run(store.get_items("other")) is None
+    with pytest.raises(KeyError):
+        asyncio.run(store.remove_item(TOKEN, 99))
+
+
+def test_take_empties_the_basket_in_one_transaction(store):
+    async def take():
+        await store.add_item(TOKEN, make_item(1, quantity=2))
+        return await store.take(TOKEN)
+
+    (item,) = asyncio.run(take())
+
+    assert item["quantity"] == 2
+    assert asyncio.run(store.get_items(TOKEN)) is None
+    assert asyncio.run(store.take(TOKEN)) is None
+
+
+def test_restore_adds_to_lines_written_after_take(store):
+    async def take_and_restore():
+        await store.add_item(TOKEN, make_item(1, quantity=2))
+        await store.add_item(TOKEN, make_item(2))
+        taken = await store.take(TOKEN)
+        # a guest write racing the failed merge
+        await store.create(TOKEN, [make_item(1, quantity=3)])
+        await store.restore(TOKEN, taken)
+        return await store.get_items(TOKEN)
+
+    items = asyncio.run(take_and_restore())
+
+    assert [
+        (item["id"], item["product_id"], item["quantity"]) for item in items
+    ] == [(1, 1, 5), (2, 2, 1)]
@@ -0,0 +1,93 @@
+import asyncio
+import os
+
+import pytest
+
+from src.core.config import settings
+from src.static_img.gc import StaticGCService
+
+
+class FakeStaticFileRepository:
+    def __init__(self) -> None:
+        self.deleted = []
+
+    async def delete_unreferenced(self, paths: list[str]) -> None:
+        self.deleted.extend(paths)
+
+
+class FakeUnitOfWork:
+    def __init__(self) -> None:
+        self.static_file = FakeStaticFileRepository()
+
+    async def __aenter__(self) -> "FakeUnitOfWork":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        pass
+
+    async def commit(self) -> None:
+        pass
+
+
+class FakeStaticGCService(StaticGCService):
+    def __init__(self, uow, referenced: set[str]) -> None:
+        super().__init__(uow)
+        self.referenced = referenced
+
+    async def get_referenced_paths(self) -> set[str]:
+        return self.referenced
+
+
+@pytest.fixture
+def static_directory(tmp_path, monkeypatch):
+    directory = tmp_path / "static"
+    monkeypatch.setattr(settings.static, "directory", str(directory))
+    monkeypatch.setattr(settings.static, "upload_dir", "uploads")
+    monkeypatch.setattr(
+        settings.static, "gc_trash_dir", str(tmp_path / "trash")
+    )
+    return directory
+
+
+def write_old_file(path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"data")
+    os.utime(path, (0, 0))
+
+
+def test_gc_collects_only_unreferenced_uploads(static_directory):
+    kept = [
+        "catalog/doors/door-1/description.docx",
+        "catalog/mouldings/moulding-1/photo.webp",
+        "lishtva.webp",
+        "uploads/ab/cd/abcd-referenced.webp",
+    ]
+    orphan = "uploads/ef/01/ef01-orphan.webp"
+    for path in [*kept, orphan]:
+        write_old_file(static_directory / path)
+    uow = FakeUnitOfWork()
+
+    report = asyncio.run(
+        FakeStaticGCService(uow, {"uploads/ab/cd/abcd-referenced.webp"})
+        .collect(grace_period=0)
+    )
+
+    assert report.scanned_files == 2
+    assert report.orphaned_files == 1
+    assert uow.static_file.deleted == [orphan]
+    assert not (static_directory / orphan).exists()
+    for path in kept:
+        assert (static_directory / path).exists()
+
+
+def test_gc_without_upload_directory_moves_nothing(static_directory):
+    write_old_file(static_directory / "catalog/doors/door-1/description.docx")
+
+    report = asyncio.run(
+        FakeStaticGCService(FakeUnitOfWork(), {"lishtva.webp"}).collect(
+            grace_period=0
+        )
+    )
+
+    assert report.scanned_files == 0
+    assert (static_directory / "catalog/doors/door-1/description.docx").exists()